@@ -9,9 +9,12 @@ import json
 from pathlib import Path
 
 from hermes_trading.backtest.policy_analysis import (
+    ExitPolicy,
+    enumerate_scale_out_policies,
     load_trade_observations,
     parse_exit_policy,
-    summarize_exit_policy,
+    summarize_exit_policies,
+    target_lattice,
 )
 
 
@@ -28,38 +31,56 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--policy", action="append", default=[])
     parser.add_argument("--fixed-take-max", type=float)
     parser.add_argument("--fixed-take-step", type=float, default=0.25)
+    parser.add_argument(
+        "--scale-out-max-legs",
+        type=int,
+        help=(
+            "Also sweep every scale-out with up to this many target legs on the "
+            "--fixed-take-step lattice up to --fixed-take-max."
+        ),
+    )
+    parser.add_argument("--scale-out-fraction-step", type=float, default=0.25)
+    parser.add_argument("--top", type=int, help="Only list the N best policies by total R.")
     parser.add_argument("--output-dir")
     parser.add_argument("--no-save", action="store_true")
     return parser.parse_args()
 
 
-def _build_policy_specs(args: argparse.Namespace) -> list[str]:
+def _build_policies(args: argparse.Namespace) -> list[ExitPolicy]:
     specs = ["hold"]
     if args.policy:
         specs.extend(args.policy)
     else:
         specs.extend(DEFAULT_POLICIES)
 
+    policies = [parse_exit_policy(spec) for spec in specs]
     if args.fixed_take_max is not None:
         if args.fixed_take_max <= 0:
             raise ValueError("--fixed-take-max must be positive.")
         if args.fixed_take_step <= 0:
             raise ValueError("--fixed-take-step must be positive.")
 
-        current = args.fixed_take_step
-        while current <= args.fixed_take_max + 1e-9:
-            specs.append(f"fixed:{round(current, 10)}")
-            current += args.fixed_take_step
+        targets = target_lattice(args.fixed_take_step, args.fixed_take_max)
+        policies.extend(parse_exit_policy(f"fixed:{target}") for target in targets)
+        if args.scale_out_max_legs is not None:
+            policies.extend(
+                enumerate_scale_out_policies(
+                    targets,
+                    fraction_step=args.scale_out_fraction_step,
+                    max_legs=args.scale_out_max_legs,
+                )
+            )
+    elif args.scale_out_max_legs is not None:
+        raise ValueError("--scale-out-max-legs requires --fixed-take-max.")
 
-    deduped_specs: list[str] = []
+    deduped_policies: list[ExitPolicy] = []
     seen: set[str] = set()
-    for spec in specs:
-        policy_name = parse_exit_policy(spec).name
-        if policy_name in seen:
+    for policy in policies:
+        if policy.name in seen:
             continue
-        seen.add(policy_name)
-        deduped_specs.append(spec)
-    return deduped_specs
+        seen.add(policy.name)
+        deduped_policies.append(policy)
+    return deduped_policies
 
 
 def _render_markdown(
@@ -118,10 +139,19 @@ def main() -> None:
     output_dir = Path(args.output_dir) if args.output_dir else trades_path.parent
 
     trades = load_trade_observations(trades_path)
-    policies = [parse_exit_policy(spec) for spec in _build_policy_specs(args)]
-    summaries = [asdict(summarize_exit_policy(trades, policy)) for policy in policies]
+    summaries = [
+        asdict(summary)
+        for summary in summarize_exit_policies(trades, _build_policies(args))
+    ]
 
-    markdown = _render_markdown(trades_path, summaries)
+    listed_summaries = summaries
+    if args.top is not None:
+        listed_summaries = sorted(
+            summaries,
+            key=lambda item: item["total_pnl_r"],
+            reverse=True,
+        )[: args.top]
+    markdown = _render_markdown(trades_path, listed_summaries)
     print(markdown)
 
     if args.no_save:
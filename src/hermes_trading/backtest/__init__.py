@@ -1,6 +1,13 @@
 """Backtest utilities for historical strategy evaluation."""
 
-from .data_loader import create_connector, fetch_historical_candles
+from .candle_cache import CandleCache, SQLiteCandleCache
+from .data_loader import (
+    create_connector,
+    fetch_historical_candles,
+    fetch_historical_series,
+    fetch_historical_series_batch,
+)
+from .first_passage import FirstPassageIndex
 from .models import (
     BacktestConfig,
     BacktestResult,
@@ -29,6 +36,9 @@ __all__ = [
     "BacktestConfig",
     "BacktestResult",
     "BacktestSummary",
+    "CandleCache",
+    "FirstPassageIndex",
+    "SQLiteCandleCache",
     "SignalEvent",
     "StrategyConfig",
     "TradeRecord",
@@ -37,6 +47,8 @@ __all__ = [
     "build_summary",
     "create_connector",
     "fetch_historical_candles",
+    "fetch_historical_series",
+    "fetch_historical_series_batch",
     "load_saved_signal_records",
     "merge_saved_signal_records",
     "render_summary_text",
@@ -0,0 +1,80 @@
+"""Fixed-record binary candle archive that can be memory-mapped.
+
+Layout: a 32-byte header (magic, format version, record size) followed by
+little-endian ``RECORD_DTYPE`` records sorted by strictly increasing
+timestamp. Readers map the file with ``np.memmap`` and slice the columns
+without copying, so parallel workers share the OS page cache.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from ..candles import PRICE_COLUMNS
+
+ARCHIVE_MAGIC = b"HRMSCNDL"
+ARCHIVE_VERSION = 1
+RECORD_DTYPE = np.dtype(
+    [("timestamp", "<i8")] + [(name, "<f8") for name in PRICE_COLUMNS]
+)
+_HEADER = struct.Struct("<8sII16x")
+HEADER_SIZE = _HEADER.size
+
+
+def write_archive(
+    path: str | Path,
+    timestamp: np.ndarray,
+    columns: dict[str, np.ndarray],
+) -> None:
+    """Atomically write candles to ``path``; timestamps must strictly increase."""
+
+    timestamp = np.asarray(timestamp, dtype=np.int64)
+    if timestamp.ndim != 1:
+        raise ValueError("timestamp must be one-dimensional")
+    if np.any(timestamp[1:] <= timestamp[:-1]):
+        raise ValueError("archive timestamps must be strictly increasing")
+
+    records = np.empty(timestamp.shape[0], dtype=RECORD_DTYPE)
+    records["timestamp"] = timestamp
+    for name in PRICE_COLUMNS:
+        column = np.asarray(columns[name], dtype=np.float64)
+        if column.shape != timestamp.shape:
+            raise ValueError(f"column {name} does not match timestamp length")
+        records[name] = column
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, RECORD_DTYPE.itemsize))
+        records.tofile(handle)
+    # replacing keeps the old inode alive for readers that still map it
+    os.replace(tmp_path, path)
+
+
+def open_archive(path: str | Path) -> np.ndarray:
+    """Map an archive read-only and return its structured record array."""
+
+    path = Path(path)
+    with path.open("rb") as handle:
+        header = handle.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        raise ValueError(f"{path} is not a candle archive: truncated header")
+    magic, version, record_size = _HEADER.unpack(header)
+    if magic != ARCHIVE_MAGIC:
+        raise ValueError(f"{path} is not a candle archive")
+    if version != ARCHIVE_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} uses unsupported archive version {version}")
+
+    payload_size = path.stat().st_size - HEADER_SIZE
+    if payload_size % RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a candle archive: partial record")
+    count = payload_size // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+
@@ -0,0 +1,217 @@
+"""On-disk OHLCV cache used by the historical data loader."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..candles import PRICE_COLUMNS, CandleSeries
+from .candle_archive import open_archive, write_archive
+
+if TYPE_CHECKING:
+    from ..realtime import SQLiteStorage
+
+Range = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class CachedCandles:
+    """Columnar OHLCV rows held on disk plus the ranges known to be complete."""
+
+    timestamp: np.ndarray
+    columns: dict[str, np.ndarray]
+    complete_ranges: tuple[Range, ...]
+
+    @classmethod
+    def empty(cls) -> CachedCandles:
+        return cls(
+            timestamp=np.empty(0, dtype=np.int64),
+            columns={name: np.empty(0) for name in PRICE_COLUMNS},
+            complete_ranges=(),
+        )
+
+    def __len__(self) -> int:
+        return int(self.timestamp.shape[0])
+
+    def series_between(
+        self,
+        start_ms: int,
+        end_ms: int,
+        *,
+        symbol: str | None = None,
+        timeframe: str | None = None,
+    ) -> CandleSeries:
+        """Return cached candles with ``start_ms <= timestamp < end_ms``."""
+
+        left = int(np.searchsorted(self.timestamp, start_ms, side="left"))
+        right = int(np.searchsorted(self.timestamp, end_ms, side="left"))
+        return CandleSeries(
+            timestamp=self.timestamp[left:right],
+            **{name: self.columns[name][left:right] for name in PRICE_COLUMNS},
+            symbol=symbol,
+            timeframe=timeframe,
+        )
+
+
+class CandleCache:
+    """Per exchange/symbol/timeframe candle store under a cache directory.
+
+    Candles are kept in a memory-mapped ``.candles`` archive next to a JSON
+    sidecar listing the ``[start_ms, end_ms)`` ranges that were fully
+    downloaded, so a later run only fetches what is missing.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def load(self, exchange: str, symbol: str, timeframe: str) -> CachedCandles:
+        data_path, ranges_path = self._paths(exchange, symbol, timeframe)
+        if not data_path.exists() or not ranges_path.exists():
+            return CachedCandles.empty()
+
+        records = open_archive(data_path)
+        ranges = json.loads(ranges_path.read_text(encoding="utf-8"))
+        return CachedCandles(
+            timestamp=records["timestamp"],
+            columns={name: records[name] for name in PRICE_COLUMNS},
+            complete_ranges=tuple((int(start), int(end)) for start, end in ranges["complete_ranges"]),
+        )
+
+    def store(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        cached: CachedCandles,
+        rows: list[tuple[int, float, float, float, float, float]],
+        complete_ranges: list[Range],
+    ) -> CachedCandles:
+        """Merge ``rows`` into ``cached``, persist the result and return it."""
+
+        updated = merge_cached_rows(cached, rows, complete_ranges)
+        data_path, ranges_path = self._paths(exchange, symbol, timeframe)
+        write_archive(data_path, updated.timestamp, updated.columns)
+
+        tmp_ranges_path = ranges_path.with_name(ranges_path.name + ".tmp")
+        tmp_ranges_path.write_text(
+            json.dumps({"complete_ranges": [list(item) for item in updated.complete_ranges]}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_ranges_path, ranges_path)
+        return updated
+
+    def _paths(self, exchange: str, symbol: str, timeframe: str) -> tuple[Path, Path]:
+        directory = self.root / _safe_name(exchange.lower()) / _safe_name(symbol)
+        stem = _safe_name(timeframe)
+        return directory / f"{stem}.candles", directory / f"{stem}.json"
+
+
+class SQLiteCandleCache:
+    """Candle cache backed by the realtime bot's SQLite database.
+
+    Drop-in for ``CandleCache`` in the data loader, so the live bot's candles
+    and backtest downloads share one indexed store. The database holds a
+    single exchange's candles; ``exchange`` is accepted for interface parity.
+    """
+
+    def __init__(self, storage: SQLiteStorage | str | Path) -> None:
+        # imported here so the backtest package does not load the live bot module
+        from ..realtime import SQLiteStorage
+
+        if not isinstance(storage, SQLiteStorage):
+            storage = SQLiteStorage(Path(storage))
+        self.storage = storage
+
+    def load(self, exchange: str, symbol: str, timeframe: str) -> CachedCandles:
+        complete_ranges = self.storage.complete_ranges(symbol, timeframe)
+        if not complete_ranges:
+            # candles the live bot stored are not known to be gap-free
+            return CachedCandles.empty()
+        start_ms = complete_ranges[0][0]
+        end_ms = complete_ranges[-1][1]
+        series = self.storage.fetch_series_between(symbol, timeframe, start_ms, end_ms)
+        return CachedCandles(
+            timestamp=series.timestamp,
+            columns={name: getattr(series, name) for name in PRICE_COLUMNS},
+            complete_ranges=complete_ranges,
+        )
+
+    def store(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        cached: CachedCandles,
+        rows: list[tuple[int, float, float, float, float, float]],
+        complete_ranges: list[Range],
+    ) -> CachedCandles:
+        updated = merge_cached_rows(cached, rows, complete_ranges)
+        with self.storage.transaction():
+            self.storage.upsert_ohlcv_rows(symbol, timeframe, rows)
+            self.storage.replace_complete_ranges(symbol, timeframe, updated.complete_ranges)
+        return updated
+
+
+def merge_cached_rows(
+    cached: CachedCandles,
+    rows: list[tuple[int, float, float, float, float, float]],
+    complete_ranges: list[Range],
+) -> CachedCandles:
+    """Combine cached columns with freshly fetched rows; fresh rows win."""
+
+    ranges = merge_ranges([*cached.complete_ranges, *complete_ranges])
+    if not rows:
+        return CachedCandles(cached.timestamp, cached.columns, ranges)
+
+    fresh = np.asarray(rows, dtype=np.float64).reshape(-1, 6)
+    fresh_timestamp = np.asarray([row[0] for row in rows], dtype=np.int64)
+    timestamp = np.concatenate([fresh_timestamp, cached.timestamp])
+    # np.unique keeps the first occurrence, so fetched rows override the cache
+    timestamp, keep = np.unique(timestamp, return_index=True)
+    columns = {
+        name: np.concatenate([fresh[:, offset], cached.columns[name]])[keep]
+        for offset, name in enumerate(PRICE_COLUMNS, start=1)
+    }
+    return CachedCandles(timestamp, columns, ranges)
+
+
+def merge_ranges(ranges: list[Range]) -> tuple[Range, ...]:
+    """Sort and coalesce overlapping or touching ``[start, end)`` ranges."""
+
+    merged: list[Range] = []
+    for start, end in sorted(item for item in ranges if item[1] > item[0]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return tuple(merged)
+
+
+def missing_ranges(start_ms: int, end_ms: int, complete_ranges: tuple[Range, ...]) -> list[Range]:
+    """Return the parts of ``[start_ms, end_ms)`` not covered by ``complete_ranges``."""
+
+    gaps: list[Range] = []
+    cursor = start_ms
+    for start, end in complete_ranges:
+        if end <= cursor:
+            continue
+        if start >= end_ms:
+            break
+        if start > cursor:
+            gaps.append((cursor, start))
+        cursor = max(cursor, end)
+        if cursor >= end_ms:
+            break
+    if cursor < end_ms:
+        gaps.append((cursor, end_ms))
+    return gaps
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", value)
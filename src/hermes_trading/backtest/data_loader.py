@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import threading
+import time
+from typing import Sequence
+
 import ccxt
+import numpy as np
 
-from ..candles import Candle
+from ..candles import Candle, CandleSeries
 from ..connectors import BinanceConnector, BingXConnector
-from ..time_utils import madrid_datetime_from_timestamp_ms
+from .candle_cache import CachedCandles, CandleCache, SQLiteCandleCache, missing_ranges
 
 
 def create_connector(exchange: str):
@@ -55,31 +61,76 @@ def timeframe_to_milliseconds(timeframe: str) -> int:
     return value * units[unit]
 
 
-def fetch_historical_candles(
+class RateBudget:
+    """Spaces requests to one exchange at least ``interval_ms`` apart across threads."""
+
+    def __init__(self, interval_ms: float) -> None:
+        self._interval_s = max(float(interval_ms), 0.0) / 1000.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval_s
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_RATE_BUDGETS: dict[str, RateBudget] = {}
+_RATE_BUDGETS_LOCK = threading.Lock()
+
+
+def rate_budget_for(connector) -> RateBudget:
+    """Return the request budget shared by every fetch against this exchange."""
+
+    exchange = connector.client.id
+    with _RATE_BUDGETS_LOCK:
+        budget = _RATE_BUDGETS.get(exchange)
+        if budget is None:
+            budget = RateBudget(getattr(connector.client, "rateLimit", 0) or 0)
+            _RATE_BUDGETS[exchange] = budget
+        return budget
+
+
+def plan_page_windows(
+    start_ms: int,
+    end_ms: int,
+    timeframe: str,
+    fetch_limit: int,
+) -> list[tuple[int, int]]:
+    """Split ``[start_ms, end_ms)`` into independent windows of one page each."""
+
+    if fetch_limit <= 0:
+        raise ValueError("fetch_limit must be positive")
+    span_ms = timeframe_to_milliseconds(timeframe) * fetch_limit
+    return [
+        (window_start, min(window_start + span_ms, end_ms))
+        for window_start in range(start_ms, end_ms, span_ms)
+    ]
+
+
+def _fetch_ohlcv_rows(
     connector,
     symbol: str,
     timeframe: str,
-    date_from: str,
-    date_to: str,
+    start_ms: int,
+    end_ms: int,
     *,
-    fetch_limit: int = 1000,
-) -> list[Candle]:
-    """Load candles for the requested range using the exchange connector."""
-
-    start_dt = parse_datetime_value(date_from, is_end=False)
-    end_dt = parse_datetime_value(date_to, is_end=True)
-    if end_dt <= start_dt:
-        raise ValueError("date_to must be greater than date_from")
+    fetch_limit: int,
+    budget: RateBudget | None = None,
+) -> list[tuple[int, float, float, float, float, float]]:
+    """Page through ``fetch_ohlcv`` and return unique rows inside ``[start_ms, end_ms)``."""
 
-    start_ms = int(start_dt.timestamp() * 1000)
-    end_ms = int(end_dt.timestamp() * 1000)
     step_ms = timeframe_to_milliseconds(timeframe)
-
     seen_timestamps: set[int] = set()
-    candles: list[Candle] = []
+    rows: list[tuple[int, float, float, float, float, float]] = []
     since = start_ms
 
     while since < end_ms:
+        if budget is not None:
+            budget.acquire()
         try:
             batch = connector.client.fetch_ohlcv(
                 symbol,
@@ -103,17 +154,14 @@ def fetch_historical_candles(
                 continue
 
             seen_timestamps.add(ts)
-            candles.append(
-                Candle(
-                    timestamp=int(ts),
-                    datetime=madrid_datetime_from_timestamp_ms(int(ts)),
-                    open=float(open_),
-                    high=float(high),
-                    low=float(low),
-                    close=float(close),
-                    volume=float(volume),
-                    symbol=symbol,
-                    timeframe=timeframe,
+            rows.append(
+                (
+                    int(ts),
+                    float(open_),
+                    float(high),
+                    float(low),
+                    float(close),
+                    float(volume),
                 )
             )
 
@@ -122,5 +170,262 @@ def fetch_historical_candles(
             break
         since = next_since
 
-    candles.sort(key=lambda candle: candle.timestamp)
-    return candles
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def _parse_range_ms(date_from: str, date_to: str) -> tuple[int, int]:
+    start_dt = parse_datetime_value(date_from, is_end=False)
+    end_dt = parse_datetime_value(date_to, is_end=True)
+    if end_dt <= start_dt:
+        raise ValueError("date_to must be greater than date_from")
+    return int(start_dt.timestamp() * 1000), int(end_dt.timestamp() * 1000)
+
+
+def _cached_ohlcv_series(
+    connector,
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    end_ms: int,
+    *,
+    fetch_limit: int,
+    cache: CandleCache | SQLiteCandleCache,
+    now_ms: int | None = None,
+) -> CandleSeries:
+    """Serve ``[start_ms, end_ms)`` from ``cache``, downloading only the gaps.
+
+    Only candles that have already closed are persisted, and a fetched gap is
+    recorded as complete up to the first candle that may still change.
+    """
+
+    exchange = connector.client.id
+    cached = cache.load(exchange, symbol, timeframe)
+    gaps = missing_ranges(start_ms, end_ms, cached.complete_ranges)
+    fetched = [
+        row
+        for gap_start, gap_end in gaps
+        for row in _fetch_ohlcv_rows(
+            connector,
+            symbol,
+            timeframe,
+            gap_start,
+            gap_end,
+            fetch_limit=fetch_limit,
+        )
+    ]
+    return _store_fetched_series(
+        cache,
+        exchange,
+        symbol,
+        timeframe,
+        start_ms,
+        end_ms,
+        cached,
+        gaps,
+        fetched,
+        now_ms=now_ms,
+    )
+
+
+def _store_fetched_series(
+    cache: CandleCache | SQLiteCandleCache,
+    exchange: str,
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    end_ms: int,
+    cached: CachedCandles,
+    gaps: list[tuple[int, int]],
+    fetched: list[tuple[int, float, float, float, float, float]],
+    *,
+    now_ms: int | None = None,
+) -> CandleSeries:
+    step_ms = timeframe_to_milliseconds(timeframe)
+    now = now_ms if now_ms is not None else int(time.time() * 1000)
+    closed_before = now - step_ms + 1
+
+    completed = [
+        (gap_start, min(gap_end, closed_before))
+        for gap_start, gap_end in gaps
+        if min(gap_end, closed_before) > gap_start
+    ]
+    if fetched or completed:
+        cached = cache.store(
+            exchange,
+            symbol,
+            timeframe,
+            cached,
+            [row for row in fetched if row[0] < closed_before],
+            completed,
+        )
+
+    series = cached.series_between(start_ms, end_ms, symbol=symbol, timeframe=timeframe)
+    unclosed = [row for row in fetched if row[0] >= closed_before]
+    if not unclosed:
+        return series
+
+    # candles still forming are returned but never written to the cache
+    forming = CandleSeries.from_ohlcv(unclosed, symbol=symbol, timeframe=timeframe)
+    return CandleSeries(
+        timestamp=np.concatenate([series.timestamp, forming.timestamp]),
+        open=np.concatenate([series.open, forming.open]),
+        high=np.concatenate([series.high, forming.high]),
+        low=np.concatenate([series.low, forming.low]),
+        close=np.concatenate([series.close, forming.close]),
+        volume=np.concatenate([series.volume, forming.volume]),
+        symbol=symbol,
+        timeframe=timeframe,
+    )
+
+
+def fetch_historical_series_batch(
+    connector,
+    series: Sequence[tuple[str, str]],
+    date_from: str,
+    date_to: str,
+    *,
+    fetch_limit: int = 1000,
+    cache: CandleCache | SQLiteCandleCache | None = None,
+    workers: int = 4,
+    now_ms: int | None = None,
+) -> dict[tuple[str, str], CandleSeries]:
+    """Load many ``(symbol, timeframe)`` series with concurrent page requests.
+
+    Every missing range is split into one-page windows that run on a bounded
+    thread pool. Requests share the exchange's ``RateBudget``, so throughput is
+    set by the rate limit rather than by the number of series. Windows are
+    disjoint and reassembled in order, giving the same candles as
+    ``fetch_historical_series``.
+    """
+
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+
+    start_ms, end_ms = _parse_range_ms(date_from, date_to)
+    exchange = connector.client.id
+    budget = rate_budget_for(connector)
+
+    plans: dict[tuple[str, str], tuple[CachedCandles | None, list[tuple[int, int]]]] = {}
+    windows: list[tuple[tuple[str, str], int, int]] = []
+    for key in dict.fromkeys((str(symbol), str(timeframe)) for symbol, timeframe in series):
+        symbol, timeframe = key
+        cached = cache.load(exchange, symbol, timeframe) if cache is not None else None
+        gaps = (
+            missing_ranges(start_ms, end_ms, cached.complete_ranges)
+            if cached is not None
+            else [(start_ms, end_ms)]
+        )
+        plans[key] = (cached, gaps)
+        for gap_start, gap_end in gaps:
+            windows.extend(
+                (key, window_start, window_end)
+                for window_start, window_end in plan_page_windows(
+                    gap_start,
+                    gap_end,
+                    timeframe,
+                    fetch_limit,
+                )
+            )
+
+    def fetch_window(window: tuple[tuple[str, str], int, int]):
+        (symbol, timeframe), window_start, window_end = window
+        return _fetch_ohlcv_rows(
+            connector,
+            symbol,
+            timeframe,
+            window_start,
+            window_end,
+            fetch_limit=fetch_limit,
+            budget=budget,
+        )
+
+    fetched: dict[tuple[str, str], list[tuple[int, float, float, float, float, float]]] = {
+        key: [] for key in plans
+    }
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (key, _, _), rows in zip(windows, pool.map(fetch_window, windows)):
+            fetched[key].extend(rows)
+
+    loaded: dict[tuple[str, str], CandleSeries] = {}
+    for key, (cached, gaps) in plans.items():
+        symbol, timeframe = key
+        if cache is None or cached is None:
+            loaded[key] = CandleSeries.from_ohlcv(fetched[key], symbol=symbol, timeframe=timeframe)
+            continue
+        loaded[key] = _store_fetched_series(
+            cache,
+            exchange,
+            symbol,
+            timeframe,
+            start_ms,
+            end_ms,
+            cached,
+            gaps,
+            fetched[key],
+            now_ms=now_ms,
+        )
+    return loaded
+
+
+def fetch_historical_series(
+    connector,
+    symbol: str,
+    timeframe: str,
+    date_from: str,
+    date_to: str,
+    *,
+    fetch_limit: int = 1000,
+    cache: CandleCache | SQLiteCandleCache | None = None,
+) -> CandleSeries:
+    """Load candles for the requested range as a columnar ``CandleSeries``.
+
+    With a ``cache`` the range is served from disk where possible and only the
+    missing parts are requested from the exchange. A ``SQLiteCandleCache``
+    makes the realtime bot's database the local source of truth.
+    """
+
+    start_ms, end_ms = _parse_range_ms(date_from, date_to)
+    if cache is not None:
+        return _cached_ohlcv_series(
+            connector,
+            symbol,
+            timeframe,
+            start_ms,
+            end_ms,
+            fetch_limit=fetch_limit,
+            cache=cache,
+        )
+
+    rows = _fetch_ohlcv_rows(
+        connector,
+        symbol,
+        timeframe,
+        start_ms,
+        end_ms,
+        fetch_limit=fetch_limit,
+    )
+    return CandleSeries.from_ohlcv(rows, symbol=symbol, timeframe=timeframe)
+
+
+def fetch_historical_candles(
+    connector,
+    symbol: str,
+    timeframe: str,
+    date_from: str,
+    date_to: str,
+    *,
+    fetch_limit: int = 1000,
+    cache: CandleCache | SQLiteCandleCache | None = None,
+) -> list[Candle]:
+    """Load candles for the requested range using the exchange connector."""
+
+    return fetch_historical_series(
+        connector,
+        symbol,
+        timeframe,
+        date_from,
+        date_to,
+        fetch_limit=fetch_limit,
+        cache=cache,
+    ).to_candles()
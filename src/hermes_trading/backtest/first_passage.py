@@ -0,0 +1,122 @@
+"""First-passage queries over candle highs and lows.
+
+Trade simulators need "the first bar at or after ``i`` whose high reaches
+``p``" (or whose low falls to ``p``). ``FirstPassageIndex`` keeps a max tree
+over highs and a min tree over lows, so those searches and range extremes
+cost O(log n) instead of a bar-by-bar scan to the exit.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from ..candles import Candle, CandleSeries
+
+
+class FirstPassageIndex:
+    """Segment trees of candle highs (max) and lows (min).
+
+    Searches return ``len(index)`` when no bar at or after ``start`` matches.
+    """
+
+    def __init__(self, high: np.ndarray, low: np.ndarray) -> None:
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        if high.ndim != 1 or high.shape != low.shape:
+            raise ValueError("high and low must be one-dimensional and of equal length")
+        self._length = int(high.shape[0])
+        size = 1
+        while size < self._length:
+            size *= 2
+        self._size = size
+        self._high = _build_tree(high, size, np.maximum, -np.inf)
+        self._low = _build_tree(low, size, np.minimum, np.inf)
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Candle]) -> FirstPassageIndex:
+        if isinstance(candles, CandleSeries):
+            return cls(candles.high, candles.low)
+        return cls(
+            np.asarray([candle.high for candle in candles], dtype=np.float64),
+            np.asarray([candle.low for candle in candles], dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return self._length
+
+    def first_high_at_least(self, start: int, price: float) -> int:
+        """First index ``>= start`` with ``high >= price``."""
+
+        tree = self._high
+        node = self._first_node(start, lambda value: value >= price, tree)
+        if node is None:
+            return self._length
+        while node < self._size:
+            node *= 2
+            if not tree[node] >= price:
+                node += 1
+        return node - self._size
+
+    def first_low_at_most(self, start: int, price: float) -> int:
+        """First index ``>= start`` with ``low <= price``."""
+
+        tree = self._low
+        node = self._first_node(start, lambda value: value <= price, tree)
+        if node is None:
+            return self._length
+        while node < self._size:
+            node *= 2
+            if not tree[node] <= price:
+                node += 1
+        return node - self._size
+
+    def max_high(self, start: int, stop: int) -> float:
+        """Highest high over ``[start, stop)``; ``-inf`` for an empty range."""
+
+        return _range_reduce(self._high, self._size, start, stop, max, -np.inf)
+
+    def min_low(self, start: int, stop: int) -> float:
+        """Lowest low over ``[start, stop)``; ``inf`` for an empty range."""
+
+        return _range_reduce(self._low, self._size, start, stop, min, np.inf)
+
+    def _first_node(self, start: int, matches, tree: np.ndarray) -> int | None:
+        # walk right from the leaf, climbing past subtrees that cannot match
+        if start >= self._length:
+            return None
+        node = max(start, 0) + self._size
+        while not matches(tree[node]):
+            while node & 1:
+                node //= 2
+            if node == 0:
+                return None
+            node += 1
+        return node
+
+
+def _build_tree(values: np.ndarray, size: int, reduce, pad: float) -> np.ndarray:
+    tree = np.full(2 * size, pad, dtype=np.float64)
+    tree[size:size + values.shape[0]] = values
+    width = size
+    while width > 1:
+        tree[width // 2:width] = reduce(tree[width:2 * width:2], tree[width + 1:2 * width:2])
+        width //= 2
+    return tree
+
+
+def _range_reduce(tree: np.ndarray, size: int, start: int, stop: int, reduce, empty: float) -> float:
+    result = empty
+    left = max(start, 0) + size
+    right = stop + size
+    while left < right:
+        if left & 1:
+            result = reduce(result, float(tree[left]))
+            left += 1
+        if right & 1:
+            right -= 1
+            result = reduce(result, float(tree[right]))
+        left //= 2
+        right //= 2
+    return result
@@ -50,6 +50,7 @@ class BacktestConfig:
     output_dir: Path = Path("backtest_results")
     export_trades: bool = True
     export_summary: bool = True
+    cache_dir: Path | None = None
 
 
 @dataclass(frozen=True)
@@ -3,8 +3,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import combinations
 from pathlib import Path
 import json
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+# policies x trades cells evaluated at once; bounds memory on large grids
+DEFAULT_EVALUATION_CELLS = 1 << 22
+_TARGET_TOLERANCE_R = 1e-9
 
 
 @dataclass(frozen=True)
@@ -46,6 +54,45 @@ class ExitPolicySummary:
     profit_factor: float | None
 
 
+@dataclass(frozen=True)
+class PolicyMatrix:
+    """Exit policies as padded ``(policies, legs)`` arrays.
+
+    Padding legs have fraction 0; ``NaN`` targets follow the actual exit.
+    """
+
+    names: tuple[str, ...]
+    fractions: np.ndarray
+    targets: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_policies(cls, policies: Iterable[ExitPolicy]) -> PolicyMatrix:
+        policies = list(policies)
+        leg_count = max((len(policy.legs) for policy in policies), default=1)
+        fractions = np.zeros((len(policies), leg_count), dtype=np.float64)
+        targets = np.full((len(policies), leg_count), np.nan, dtype=np.float64)
+        for row, policy in enumerate(policies):
+            for column, leg in enumerate(policy.legs):
+                fractions[row, column] = leg.fraction
+                if leg.take_profit_r is not None:
+                    targets[row, column] = leg.take_profit_r
+        return cls(
+            names=tuple(policy.name for policy in policies),
+            fractions=fractions,
+            targets=targets,
+        )
+
+    def __getitem__(self, rows: slice) -> PolicyMatrix:
+        return PolicyMatrix(
+            names=self.names[rows],
+            fractions=self.fractions[rows],
+            targets=self.targets[rows],
+        )
+
+
 def load_trade_observations(path: Path) -> list[TradeExitObservation]:
     """Load the fields needed for exit-policy analysis from a trades export."""
 
@@ -119,22 +166,157 @@ def evaluate_policy_pnl(trade: TradeExitObservation, policy: ExitPolicy) -> floa
     return total_pnl_r
 
 
+def observation_arrays(
+    trades: Sequence[TradeExitObservation],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(pnl_r, best_take_step_r)`` columns of the trades."""
+
+    pnl_r = np.fromiter((trade.pnl_r for trade in trades), dtype=np.float64, count=len(trades))
+    best_take_step_r = np.fromiter(
+        (trade.best_take_step_r for trade in trades),
+        dtype=np.float64,
+        count=len(trades),
+    )
+    return pnl_r, best_take_step_r
+
+
+def evaluate_policy_matrix(
+    pnl_r: np.ndarray,
+    best_take_step_r: np.ndarray,
+    policies: PolicyMatrix,
+) -> np.ndarray:
+    """Per-trade PnL of every policy, shaped ``(policies, trades)``.
+
+    Same rule as ``evaluate_policy_pnl``: a leg closes at its target when the
+    trade's best step reached it and otherwise follows the actual exit.
+    """
+
+    targets = policies.targets[:, :, np.newaxis]
+    # NaN targets never compare true, so actual-exit legs keep pnl_r
+    hit = best_take_step_r[np.newaxis, np.newaxis, :] >= targets - _TARGET_TOLERANCE_R
+    leg_pnl_r = np.where(hit, targets, pnl_r[np.newaxis, np.newaxis, :])
+    return np.einsum("pl,plt->pt", policies.fractions, leg_pnl_r)
+
+
+def summarize_exit_policies(
+    trades: Sequence[TradeExitObservation],
+    policies: Iterable[ExitPolicy] | PolicyMatrix,
+    *,
+    max_cells: int = DEFAULT_EVALUATION_CELLS,
+) -> list[ExitPolicySummary]:
+    """Aggregate metrics for many policies, evaluated in broadcast chunks."""
+
+    if not isinstance(policies, PolicyMatrix):
+        policies = PolicyMatrix.from_policies(policies)
+    pnl_r, best_take_step_r = observation_arrays(trades)
+    total_trades = len(trades)
+    chunk_size = max(1, max_cells // max(total_trades * policies.fractions.shape[1], 1))
+
+    summaries: list[ExitPolicySummary] = []
+    for start in range(0, len(policies), chunk_size):
+        chunk = policies[start:start + chunk_size]
+        policy_pnls = evaluate_policy_matrix(pnl_r, best_take_step_r, chunk)
+        wins = policy_pnls > 0
+        losses = policy_pnls < 0
+        win_trades = wins.sum(axis=1)
+        loss_trades = losses.sum(axis=1)
+        total_pnl_r = policy_pnls.sum(axis=1)
+        positive_pnl = np.where(wins, policy_pnls, 0.0).sum(axis=1)
+        negative_pnl = np.where(losses, policy_pnls, 0.0).sum(axis=1)
+        for row, name in enumerate(chunk.names):
+            summaries.append(
+                _policy_summary(
+                    name,
+                    total_trades=total_trades,
+                    win_trades=int(win_trades[row]),
+                    loss_trades=int(loss_trades[row]),
+                    total_pnl_r=float(total_pnl_r[row]),
+                    positive_pnl=float(positive_pnl[row]),
+                    negative_pnl=float(negative_pnl[row]),
+                )
+            )
+    return summaries
+
+
 def summarize_exit_policy(
     trades: list[TradeExitObservation],
     policy: ExitPolicy,
 ) -> ExitPolicySummary:
     """Aggregate policy metrics across all trades."""
 
-    policy_pnls = [evaluate_policy_pnl(trade, policy) for trade in trades]
-    total_trades = len(policy_pnls)
-    win_trades = sum(1 for pnl_r in policy_pnls if pnl_r > 0)
-    loss_trades = sum(1 for pnl_r in policy_pnls if pnl_r < 0)
-    breakeven_trades = total_trades - win_trades - loss_trades
-    total_pnl_r = sum(policy_pnls)
-    average_pnl_r = total_pnl_r / total_trades if total_trades else 0.0
-
-    positive_pnl = sum(pnl_r for pnl_r in policy_pnls if pnl_r > 0)
-    negative_pnl = sum(pnl_r for pnl_r in policy_pnls if pnl_r < 0)
+    return summarize_exit_policies(trades, [policy])[0]
+
+
+def target_lattice(step_r: float, max_target_r: float) -> list[float]:
+    """Targets ``step_r, 2 * step_r, ...`` up to ``max_target_r`` inclusive."""
+
+    if step_r <= 0 or max_target_r <= 0:
+        raise ValueError("target step and maximum must be positive")
+    count = int(max_target_r / step_r + 1e-9)
+    return [round(step_r * index, 10) for index in range(1, count + 1)]
+
+
+def enumerate_scale_out_policies(
+    targets: Sequence[float],
+    *,
+    fraction_step: float = 0.25,
+    max_legs: int = 3,
+) -> Iterator[ExitPolicy]:
+    """Yield every scale-out with 1..``max_legs`` target legs.
+
+    Targets are strictly increasing picks from ``targets``; fractions are
+    positive multiples of ``fraction_step``. Any unassigned remainder follows
+    the actual exit, as in ``parse_exit_policy``.
+    """
+
+    units = int(round(1.0 / fraction_step))
+    if units < 1 or abs(units * fraction_step - 1.0) > 1e-9:
+        raise ValueError("fraction_step must divide 1.0")
+    if max_legs < 1:
+        raise ValueError("max_legs must be at least 1")
+    targets = sorted(set(float(target) for target in targets))
+    if any(target <= 0 for target in targets):
+        raise ValueError("scale-out targets must be positive")
+
+    for leg_count in range(1, max_legs + 1):
+        splits = [
+            split
+            for total in range(leg_count, units + 1)
+            for split in _compositions(total, leg_count)
+        ]
+        for picked_targets in combinations(targets, leg_count):
+            for split in splits:
+                legs = [
+                    ExitLeg(round(part * fraction_step, 10), target)
+                    for part, target in zip(split, picked_targets)
+                ]
+                remainder = units - sum(split)
+                if remainder:
+                    legs.append(ExitLeg(round(remainder * fraction_step, 10), None))
+                policy_legs = tuple(legs)
+                yield ExitPolicy(name=_format_policy_name(policy_legs), legs=policy_legs)
+
+
+def _compositions(total: int, parts: int) -> Iterator[tuple[int, ...]]:
+    # ordered splits of ``total`` into ``parts`` positive integers
+    if parts == 1:
+        yield (total,)
+        return
+    for first in range(1, total - parts + 2):
+        for rest in _compositions(total - first, parts - 1):
+            yield (first, *rest)
+
+
+def _policy_summary(
+    name: str,
+    *,
+    total_trades: int,
+    win_trades: int,
+    loss_trades: int,
+    total_pnl_r: float,
+    positive_pnl: float,
+    negative_pnl: float,
+) -> ExitPolicySummary:
     profit_factor = None
     if negative_pnl < 0:
         profit_factor = positive_pnl / abs(negative_pnl)
@@ -142,14 +324,14 @@ def summarize_exit_policy(
         profit_factor = float("inf")
 
     return ExitPolicySummary(
-        policy_name=policy.name,
+        policy_name=name,
         total_trades=total_trades,
         win_trades=win_trades,
         loss_trades=loss_trades,
-        breakeven_trades=breakeven_trades,
+        breakeven_trades=total_trades - win_trades - loss_trades,
         win_rate=(win_trades / total_trades) * 100 if total_trades else 0.0,
         total_pnl_r=total_pnl_r,
-        average_pnl_r=average_pnl_r,
+        average_pnl_r=total_pnl_r / total_trades if total_trades else 0.0,
         profit_factor=profit_factor,
     )
 
@@ -3,8 +3,8 @@
 from __future__ import annotations
 
 from .models import SignalEvent, StrategyConfig
-from ..candles import CandleBatch
-from ..signal_filters import filtered_latest_matches
+from ..signal_filters import series_detections
+from ..signals import SignalMatch
 
 
 def build_signal_events(
@@ -22,40 +22,46 @@ def build_signal_events(
     seen: set[tuple[str, str, str, int, str, str]] = set()
     events: list[SignalEvent] = []
 
-    for idx in range(3, len(candles)):
-        batch = CandleBatch(candles[idx - 3: idx + 1])
-        for filtered in filtered_latest_matches(
-            batch,
-            patterns=strategy.patterns,
-            directions=strategy.direction_filter,
-            min_metric_increase_pct=strategy.min_metric_increase_pct,
-        ):
-            match = filtered.match
-            event_symbol = match.candle.symbol or symbol or ""
-            event_timeframe = match.candle.timeframe or timeframe or ""
-            key = (
-                event_symbol,
-                event_timeframe,
-                match.pattern,
-                match.candle.timestamp,
-                match.direction,
-                match.candle.datetime,
+    for detection in series_detections(
+        candles,
+        patterns=strategy.patterns,
+        directions=strategy.direction_filter,
+        min_metric_increase_pct=strategy.min_metric_increase_pct,
+    ):
+        filtered = detection.filtered_signal(
+            SignalMatch(
+                pattern=detection.pattern,
+                direction=detection.direction,
+                candle=candles[detection.index],
+                level=None,
             )
-            if key in seen:
-                continue
-
-            seen.add(key)
-            events.append(
-                SignalEvent(
-                    symbol=event_symbol,
-                    timeframe=event_timeframe,
-                    pattern=match.pattern,
-                    direction=match.direction,
-                    signal_candle=match.candle,
-                    volatility_increase_pct=filtered.volatility_increase_pct,
-                    volume_increase_pct=filtered.volume_increase_pct,
-                )
+        )
+        match = filtered.match
+        event_symbol = match.candle.symbol or symbol or ""
+        event_timeframe = match.candle.timeframe or timeframe or ""
+        key = (
+            event_symbol,
+            event_timeframe,
+            match.pattern,
+            match.candle.timestamp,
+            match.direction,
+            match.candle.datetime,
+        )
+        if key in seen:
+            continue
+
+        seen.add(key)
+        events.append(
+            SignalEvent(
+                symbol=event_symbol,
+                timeframe=event_timeframe,
+                pattern=match.pattern,
+                direction=match.direction,
+                signal_candle=match.candle,
+                volatility_increase_pct=filtered.volatility_increase_pct,
+                volume_increase_pct=filtered.volume_increase_pct,
             )
+        )
 
     events.sort(key=lambda event: event.signal_candle.timestamp)
     return events
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import math
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from dataclasses import dataclass, field
 
+from .first_passage import FirstPassageIndex
 from .models import SignalEvent, StrategyConfig, TradeRecord
-from ..candles import Candle
+from ..candles import Candle, CandleSeries
 from ..trading import calculate_risk_distance
 
+# R-step searches start this far below the next step to absorb float rounding
+_STEP_MARGIN_R = 1e-6
+
 
 @dataclass
 class _TradeState:
@@ -307,12 +312,91 @@ def _update_trade_state(
     return None
 
 
+def _next_active_index(
+    state: _TradeState,
+    passage: FirstPassageIndex,
+    start: int,
+    strategy: StrategyConfig,
+) -> int:
+    """First bar ``>= start`` that may stop, take or reach a new R step."""
+
+    # a small margin keeps the step search conservative against rounding
+    next_step_abs = (state.best_take_step_r + strategy.take_step_r - _STEP_MARGIN_R) * state.risk_per_unit
+    if state.event.direction == "long":
+        searches = [
+            (passage.first_low_at_most, state.stop_price),
+            (passage.first_high_at_least, state.entry_price + next_step_abs),
+        ]
+        if state.take_profit_price is not None:
+            searches.append((passage.first_high_at_least, state.take_profit_price))
+    else:
+        searches = [
+            (passage.first_high_at_least, state.stop_price),
+            (passage.first_low_at_most, state.entry_price - next_step_abs),
+        ]
+        if state.take_profit_price is not None:
+            searches.append((passage.first_low_at_most, state.take_profit_price))
+
+    active_index = len(passage)
+    for search, price in searches:
+        active_index = min(active_index, search(start, price))
+        if active_index == start:
+            break
+    return active_index
+
+
+def _skip_quiet_bars(
+    state: _TradeState,
+    passage: FirstPassageIndex,
+    start: int,
+    stop: int,
+) -> None:
+    """Apply bars ``[start, stop)`` that neither exit nor reach a new R step."""
+
+    highest = passage.max_high(start, stop)
+    lowest = passage.min_low(start, stop)
+    if state.event.direction == "long":
+        state.mfe_abs = max(state.mfe_abs, max(highest - state.entry_price, 0.0))
+        state.mae_abs = max(state.mae_abs, max(state.entry_price - lowest, 0.0))
+        state.best_price_reached = max(state.best_price_reached, highest)
+        state.worst_price_reached = min(state.worst_price_reached, lowest)
+    else:
+        state.mfe_abs = max(state.mfe_abs, max(state.entry_price - lowest, 0.0))
+        state.mae_abs = max(state.mae_abs, max(highest - state.entry_price, 0.0))
+        state.best_price_reached = min(state.best_price_reached, lowest)
+        state.worst_price_reached = max(state.worst_price_reached, highest)
+
+
+def _register_skipped_signals(
+    state: _TradeState,
+    strategy: StrategyConfig,
+    events_by_timestamp: dict[int, list[SignalEvent]],
+    event_timestamps: list[int],
+    skipped_timestamps: list[int],
+) -> None:
+    # every signal on a skipped bar is internal to the open trade
+    first = bisect_left(event_timestamps, skipped_timestamps[0])
+    last = bisect_right(event_timestamps, skipped_timestamps[-1])
+    for timestamp in event_timestamps[first:last]:
+        position = bisect_left(skipped_timestamps, timestamp)
+        if skipped_timestamps[position] != timestamp:
+            continue
+        for event in events_by_timestamp[timestamp]:
+            if event.direction in strategy.direction_filter:
+                _register_internal_signal(state, event)
+
+
 def simulate_candles(
     candles: list[Candle],
     signal_events: list[SignalEvent],
     strategy: StrategyConfig,
 ) -> list[TradeRecord]:
-    """Simulate trades for a single symbol/timeframe candle stream."""
+    """Simulate trades for a single symbol/timeframe candle stream.
+
+    Without an open trade the loop jumps between bars carrying signals; while
+    a trade is open, bars that cannot close it or reach a new R step are
+    skipped in bulk using a ``FirstPassageIndex`` over the candles.
+    """
 
     if not candles:
         return []
@@ -320,11 +404,46 @@ def simulate_candles(
     events_by_timestamp: dict[int, list[SignalEvent]] = defaultdict(list)
     for event in sorted(signal_events, key=lambda current: current.signal_candle.timestamp):
         events_by_timestamp[event.signal_candle.timestamp].append(event)
+    event_timestamps = sorted(events_by_timestamp)
 
+    passage = FirstPassageIndex.from_candles(candles)
+    timestamps = (
+        candles.timestamp.tolist()
+        if isinstance(candles, CandleSeries)
+        else [candle.timestamp for candle in candles]
+    )
+    # bars carrying signals, the only ones that matter while no trade is open
+    event_indices = [
+        position
+        for position in (bisect_left(timestamps, timestamp) for timestamp in event_timestamps)
+        if position < len(timestamps) and timestamps[position] in events_by_timestamp
+    ]
     trades: list[TradeRecord] = []
     open_trade: _TradeState | None = None
 
-    for candle_index, candle in enumerate(candles):
+    candle_index = 0
+    while candle_index < len(candles):
+        if open_trade is None:
+            next_event = bisect_left(event_indices, candle_index)
+            if next_event == len(event_indices):
+                break
+            candle_index = event_indices[next_event]
+        elif candle_index >= open_trade.entry_index:
+            active_index = _next_active_index(open_trade, passage, candle_index, strategy)
+            if active_index > candle_index:
+                _skip_quiet_bars(open_trade, passage, candle_index, active_index)
+                if strategy.track_internal_signals:
+                    _register_skipped_signals(
+                        open_trade,
+                        strategy,
+                        events_by_timestamp,
+                        event_timestamps,
+                        timestamps[candle_index:active_index],
+                    )
+                candle_index = active_index
+                continue
+
+        candle = candles[candle_index]
         if open_trade is not None and candle_index >= open_trade.entry_index:
             finished_trade = _update_trade_state(open_trade, candle, candle_index, strategy)
             if finished_trade is not None:
@@ -354,6 +473,7 @@ def simulate_candles(
             )
             if open_trade is not None and strategy.one_trade_per_symbol_timeframe:
                 break
+        candle_index += 1
 
     if open_trade is not None:
         last_index = len(candles) - 1
@@ -0,0 +1,124 @@
+"""Bounded buffer of recent closed candles that survives between scans."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from .candles import Candle
+from .time_utils import madrid_datetime_from_timestamp_ms, timeframe_to_milliseconds
+
+OhlcvRow = tuple[int, float, float, float, float, float]
+
+
+class CandleRingBuffer:
+    """The latest ``capacity`` closed candles of one series, oldest first.
+
+    Rows must continue the buffer one timeframe step at a time; ``extend``
+    reports a gap so the caller can refill the series from the exchange.
+    """
+
+    def __init__(self, timeframe: str, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.timeframe = timeframe
+        self.capacity = capacity
+        self._timeframe_ms = timeframe_to_milliseconds(timeframe)
+        self._rows: deque[OhlcvRow] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def last_timestamp(self) -> int | None:
+        return self._rows[-1][0] if self._rows else None
+
+    def covers(self, now_ms: int) -> bool:
+        """Whether the candles closed since the buffer's last one still fit in it."""
+
+        last_timestamp = self.last_timestamp
+        if last_timestamp is None or len(self._rows) < self.capacity:
+            return False
+        return last_timestamp >= now_ms - self.capacity * self._timeframe_ms
+
+    def extend(self, rows: Iterable[Sequence[float]]) -> bool:
+        """Append rows newer than the buffer; return ``False`` on a gap.
+
+        Rows already held are skipped. On a gap the buffer restarts from the
+        given rows, which then no longer cover the full capacity.
+        """
+
+        fresh = [
+            (int(row[0]), *(float(value) for value in row[1:6]))
+            for row in rows
+            if self.last_timestamp is None or int(row[0]) > self.last_timestamp
+        ]
+        expected = self.last_timestamp
+        continuous = True
+        for row in fresh:
+            if expected is not None and row[0] != expected + self._timeframe_ms:
+                continuous = False
+                break
+            expected = row[0]
+        if not continuous:
+            self._rows.clear()
+        self._rows.extend(fresh)
+        return continuous
+
+    def candles(self, symbol: str | None = None) -> list[Candle]:
+        return [
+            Candle(
+                timestamp=timestamp,
+                datetime=madrid_datetime_from_timestamp_ms(timestamp),
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+                symbol=symbol,
+                timeframe=self.timeframe,
+            )
+            for timestamp, open_, high, low, close, volume in self._rows
+        ]
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "timeframe": self.timeframe,
+            "capacity": self.capacity,
+            "rows": [list(row) for row in self._rows],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, object]) -> CandleRingBuffer:
+        buffer = cls(str(payload["timeframe"]), int(payload["capacity"]))
+        buffer.extend(payload["rows"])
+        return buffer
+
+
+def load_candle_buffers(path: str | Path) -> dict[str, CandleRingBuffer]:
+    """Read buffers saved by ``save_candle_buffers``; a missing file is empty."""
+
+    path = Path(path)
+    if not path.exists():
+        return {}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        key: CandleRingBuffer.from_dict(item)
+        for key, item in payload.get("buffers", {}).items()
+    }
+
+
+def save_candle_buffers(path: str | Path, buffers: dict[str, CandleRingBuffer]) -> None:
+    """Atomically persist buffers keyed by an exchange/symbol/timeframe string."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"buffers": {key: buffer.to_dict() for key, buffer in buffers.items()}}),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field, replace
 from typing import List
 
+import numpy as np
+
+from .time_utils import madrid_datetime_from_timestamp_ms
+
 
 @dataclass
 class Candle:
@@ -28,3 +33,194 @@ class CandleBatch:
     # def __post_init__(self) -> None:
         # if len(self.candles) != 10:
         #     raise ValueError("CandleBatch must contain exactly 10 candles")
+
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True, eq=False)
+class CandleSeries(Sequence):
+    """Columnar OHLCV candles backed by NumPy arrays.
+
+    Slicing returns a new series sharing the same buffers. Integer indexing and
+    iteration build detached ``Candle`` snapshots, so code written for
+    ``list[Candle]`` keeps working while hot paths read the arrays directly.
+    ``datetime`` is optional: when absent, candle datetimes are rendered in
+    Europe/Madrid on access, matching ``fetch_historical_candles``.
+    """
+
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    symbol: str | None = None
+    timeframe: str | None = None
+    datetime: np.ndarray | None = None
+    # rendered datetimes keyed by timestamp, shared by every slice of a series
+    _datetime_cache: dict[int, str] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        timestamp = np.asarray(self.timestamp, dtype=np.int64)
+        if timestamp.ndim != 1:
+            raise ValueError("candle columns must be one-dimensional")
+        object.__setattr__(self, "timestamp", timestamp)
+        for name in PRICE_COLUMNS:
+            column = np.asarray(getattr(self, name), dtype=np.float64)
+            if column.shape != timestamp.shape:
+                raise ValueError(f"column {name} does not match timestamp length")
+            object.__setattr__(self, name, column)
+        if self.datetime is not None:
+            datetimes = np.asarray(self.datetime, dtype=object)
+            if datetimes.shape != timestamp.shape:
+                raise ValueError("column datetime does not match timestamp length")
+            object.__setattr__(self, "datetime", datetimes)
+
+    @classmethod
+    def empty(
+        cls,
+        *,
+        symbol: str | None = None,
+        timeframe: str | None = None,
+    ) -> CandleSeries:
+        return cls(
+            timestamp=np.empty(0, dtype=np.int64),
+            open=np.empty(0),
+            high=np.empty(0),
+            low=np.empty(0),
+            close=np.empty(0),
+            volume=np.empty(0),
+            symbol=symbol,
+            timeframe=timeframe,
+        )
+
+    @classmethod
+    def from_candles(
+        cls,
+        candles: Iterable[Candle],
+        *,
+        symbol: str | None = None,
+        timeframe: str | None = None,
+    ) -> CandleSeries:
+        """Build a series from candle objects, keeping their datetime strings."""
+
+        if isinstance(candles, CandleSeries):
+            return candles
+
+        items = list(candles)
+        if not items:
+            return cls.empty(symbol=symbol, timeframe=timeframe)
+
+        return cls(
+            timestamp=np.fromiter((c.timestamp for c in items), dtype=np.int64, count=len(items)),
+            open=np.fromiter((c.open for c in items), dtype=np.float64, count=len(items)),
+            high=np.fromiter((c.high for c in items), dtype=np.float64, count=len(items)),
+            low=np.fromiter((c.low for c in items), dtype=np.float64, count=len(items)),
+            close=np.fromiter((c.close for c in items), dtype=np.float64, count=len(items)),
+            volume=np.fromiter((c.volume for c in items), dtype=np.float64, count=len(items)),
+            symbol=symbol if symbol is not None else items[0].symbol,
+            timeframe=timeframe if timeframe is not None else items[0].timeframe,
+            datetime=np.array([c.datetime for c in items], dtype=object),
+        )
+
+    @classmethod
+    def from_ohlcv(
+        cls,
+        rows: Sequence[Sequence[float]],
+        *,
+        symbol: str | None = None,
+        timeframe: str | None = None,
+    ) -> CandleSeries:
+        """Build a series from exchange OHLCV rows ``[ts, o, h, l, c, v, ...]``."""
+
+        if len(rows) == 0:
+            return cls.empty(symbol=symbol, timeframe=timeframe)
+
+        matrix = np.asarray([row[:6] for row in rows], dtype=np.float64)
+        return cls(
+            timestamp=np.asarray([row[0] for row in rows], dtype=np.int64),
+            open=matrix[:, 1],
+            high=matrix[:, 2],
+            low=matrix[:, 3],
+            close=matrix[:, 4],
+            volume=matrix[:, 5],
+            symbol=symbol,
+            timeframe=timeframe,
+        )
+
+    def __len__(self) -> int:
+        return int(self.timestamp.shape[0])
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, (int, np.integer)):
+            position = int(index)
+            if position < 0:
+                position += len(self)
+            if position < 0 or position >= len(self):
+                raise IndexError("candle index out of range")
+            return self._candle_at(position)
+        return self.take(index)
+
+    def __iter__(self) -> Iterator[Candle]:
+        for position in range(len(self)):
+            yield self._candle_at(position)
+
+    def __repr__(self) -> str:
+        return (
+            f"CandleSeries(symbol={self.symbol!r}, timeframe={self.timeframe!r}, "
+            f"length={len(self)})"
+        )
+
+    def take(self, index) -> CandleSeries:
+        """Select rows by slice (zero-copy), boolean mask or index array."""
+
+        return replace(
+            self,
+            timestamp=self.timestamp[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+            datetime=self.datetime[index] if self.datetime is not None else None,
+        )
+
+    def datetime_at(self, position: int) -> str:
+        if self.datetime is not None:
+            return str(self.datetime[position])
+        timestamp = int(self.timestamp[position])
+        rendered = self._datetime_cache.get(timestamp)
+        if rendered is None:
+            rendered = madrid_datetime_from_timestamp_ms(timestamp)
+            self._datetime_cache[timestamp] = rendered
+        return rendered
+
+    def to_candles(self) -> list[Candle]:
+        return list(self)
+
+    def _candle_at(self, position: int) -> Candle:
+        return Candle(
+            timestamp=int(self.timestamp[position]),
+            datetime=self.datetime_at(position),
+            open=float(self.open[position]),
+            high=float(self.high[position]),
+            low=float(self.low[position]),
+            close=float(self.close[position]),
+            volume=float(self.volume[position]),
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+        )
+
+
+def as_candle_series(
+    candles: Sequence[Candle],
+    *,
+    symbol: str | None = None,
+    timeframe: str | None = None,
+) -> CandleSeries:
+    """Return ``candles`` as a series without copying when it already is one."""
+
+    if isinstance(candles, CandleSeries):
+        return candles
+    return CandleSeries.from_candles(candles, symbol=symbol, timeframe=timeframe)
@@ -1,12 +1,16 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 import numpy as np
-import pandas as pd
 
-from .candles import Candle
+from .candles import Candle, CandleSeries
 
 DAILY_EXTREME_WEIGHT = 1.0
 DEFAULT_LEVEL_WEIGHT = 0.5
+DAY_MS = 86_400_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 @dataclass
 class Level:
@@ -42,103 +46,411 @@ class LiquidityLevels:
         self.cluster_ticks = cluster_ticks
         self.touch_ticks = touch_ticks
         self.levels: List[Level] = []
+        self._index: Optional[_LevelIndex] = None
+        self._reset_stream()
 
     # ---------- Публичные API ----------
 
-    def build(self, candles: List[Candle]) -> None:
-        if not candles:
+    def build(self, candles: Sequence[Candle]) -> None:
+        if len(candles) == 0:
             self.levels = []
+            self._reset_stream()
             return
 
-        df = _candles_to_df(candles)
-        H, L = df["High"].to_numpy(), df["Low"].to_numpy()
-        day_index = df.index.normalize()
-        daily_highs = df["High"].groupby(day_index).transform("max").to_numpy()
-        daily_lows = df["Low"].groupby(day_index).transform("min").to_numpy()
-        n = len(df)
+        T = _timestamps_ms(candles)
+        H, L = _price_column(candles, "high"), _price_column(candles, "low")
+        day_index = T // DAY_MS
+        daily_highs, daily_lows = _daily_extremes(day_index, H, L)
         w = self.window
         fwd = self.confirm_forward
 
-        highs_idx, lows_idx = [], []
-
-        # идём так, чтобы и back, и forward окна были внутри массива
-        for i in range(w, n - fwd):
-            # строгий локальный максимум: выше ближайших соседей,
-            # выше макс. из последних w свечей (до i),
-            # и не ниже макс. в ближайшие fwd свечей (после i) — чтобы пик устоял
-            if _is_local_max_causal(H, i, w, fwd):
-                highs_idx.append(i)
-            if _is_local_min_causal(L, i, w, fwd):
-                lows_idx.append(i)
+        # и back, и forward окна должны быть внутри массива: i в [w, n - fwd)
+        highs_idx = _causal_extrema(H, w, fwd, np.greater, np.max)
+        lows_idx = _causal_extrema(L, w, fwd, np.less, np.min)
 
         levels: List[Level] = []
 
-        for i in highs_idx:
-            ts_ms      = int(df.index[i].timestamp() * 1000)
-            conf_ts_ms = int(df.index[i + fwd].timestamp() * 1000)
-            price = _round_to_tick(H[i], self.tick_size)
-            weight = DAILY_EXTREME_WEIGHT if H[i] == daily_highs[i] else DEFAULT_LEVEL_WEIGHT
-            levels.append(Level(
-                price=price, type="high",
-                timestamp=ts_ms, datetime=df.index[i].isoformat(),
-                weight=weight,
-                confirmed_timestamp=conf_ts_ms, confirmed_datetime=df.index[i + fwd].isoformat(),
-            ))
-
-        for i in lows_idx:
-            ts_ms      = int(df.index[i].timestamp() * 1000)
-            conf_ts_ms = int(df.index[i + fwd].timestamp() * 1000)
-            price = _round_to_tick(L[i], self.tick_size)
-            weight = DAILY_EXTREME_WEIGHT if L[i] == daily_lows[i] else DEFAULT_LEVEL_WEIGHT
-            levels.append(Level(
-                price=price, type="low",
-                timestamp=ts_ms, datetime=df.index[i].isoformat(),
-                weight=weight,
-                confirmed_timestamp=conf_ts_ms, confirmed_datetime=df.index[i + fwd].isoformat(),
-            ))
+        for type_, idx, prices, daily in (
+            ("high", highs_idx, H, daily_highs),
+            ("low", lows_idx, L, daily_lows),
+        ):
+            weights = np.where(prices[idx] == daily[idx], DAILY_EXTREME_WEIGHT, DEFAULT_LEVEL_WEIGHT)
+            for price, ts_ms, conf_ts_ms, dt, conf_dt, weight in zip(
+                prices[idx].tolist(),
+                T[idx].tolist(),
+                T[idx + fwd].tolist(),
+                _utc_isoformat_array(T[idx]),
+                _utc_isoformat_array(T[idx + fwd]),
+                weights.tolist(),
+            ):
+                levels.append(Level(
+                    price=_round_to_tick(price, self.tick_size), type=type_,
+                    timestamp=ts_ms, datetime=dt,
+                    weight=weight,
+                    confirmed_timestamp=conf_ts_ms, confirmed_datetime=conf_dt,
+                ))
 
         levels.sort(key=lambda x: x.timestamp)
         self.levels = _cluster_levels(levels, self.tick_size, self.cluster_ticks)
+        self._restart_stream(candles, T, H, L)
+
+    def update(self, candle: Candle) -> List[Level]:
+        """
+        Инкрементальный вариант build(): добавляет одну закрытую свечу и
+        возвращает уровни, которые она подтвердила. Результат совпадает с
+        build() по всем свечам, переданным до этого, но работа на свечу не
+        зависит от длины истории.
+        """
+        added: List[Level] = []
+        for lvl in self._advance(candle):
+            if self.levels and _same_cluster(self.levels[-1], lvl, self.tick_size, self.cluster_ticks):
+                continue
+            self.levels.append(lvl)
+            added.append(lvl)
+            # дневной экстремум текущего дня ещё может быть перебит
+            if lvl.weight == DAILY_EXTREME_WEIGHT and lvl.timestamp // DAY_MS == self._current_day:
+                if lvl.type == "high":
+                    self._daily_high_levels.append(lvl)
+                else:
+                    self._daily_low_levels.append(lvl)
+        return added
+
+    def evict_before(self, timestamp_ms: int) -> List[Level]:
+        """
+        Забывает уровни, свеча которых раньше timestamp_ms, и возвращает их.
+        Уровни упорядочены по времени, поэтому снимается префикс списка:
+        резидентный бот так держит только уровни своего окна истории.
+        """
+        count = bisect_left(self.levels, timestamp_ms, key=lambda l: l.timestamp)
+        if count == 0:
+            return []
+        evicted = self.levels[:count]
+        self._level_index().forget(count)
+        del self.levels[:count]
+        return evicted
 
     def active_levels(self, timestamp_ms: int) -> List[Level]:
         """Активные уровни, подтверждённые строго ДО указанного времени."""
-        return [l for l in self.levels if l.active and l.confirmed_timestamp < timestamp_ms]
+        index = self._level_index()
+        index.admit(timestamp_ms)
+        return index.collect(
+            index.all_seqs(),
+            lambda l: l.active and l.confirmed_timestamp < timestamp_ms,
+        )
 
-    def prune(self, candle: Candle) -> None:
+    def touched_levels(self, candle: Candle, min_weight: float = 0.0) -> List[Level]:
+        """
+        Активные уровни, подтверждённые и появившиеся до свечи, цена которых
+        лежит внутри [low, high] свечи. Порядок — как в self.levels.
+        """
+        ts = candle.timestamp
+        index = self._level_index()
+        index.admit(ts)
+        return index.collect(
+            index.seqs_between(candle.low, candle.high),
+            lambda l: (
+                l.active
+                and l.confirmed_timestamp < ts
+                and l.timestamp < ts
+                and l.weight >= min_weight
+                and candle.low <= l.price <= candle.high
+            ),
+        )
+
+    def prune(self, candle: Candle) -> List[Level]:
         """
         Снимаем уровни свечой только если уровень уже был подтверждён к моменту свечи.
+        Возвращает уровни, которые эта свеча деактивировала.
         """
         hi = _round_to_tick(candle.high, self.tick_size)
         lo = _round_to_tick(candle.low, self.tick_size)
         ts = candle.timestamp
+        tol = _ticks_to_abs(self.tick_size, self.touch_ticks)
 
-        for lvl in self.levels:
+        def pierced(lvl: Level) -> bool:
             # уровень должен быть подтверждён до текущей свечи
             if not lvl.active or lvl.confirmed_timestamp >= ts:
-                continue
-
-            tol = _ticks_to_abs(self.tick_size, self.touch_ticks)
-
+                return False
             if lvl.type == "high":
                 # прокол вверх
-                if hi >= lvl.price - tol and lo <= lvl.price + tol:
-                    lvl.active = False
-            else:  # "low"
-                # прокол вниз
-                if lo <= lvl.price + tol and hi >= lvl.price - tol:
-                    lvl.active = False
+                return hi >= lvl.price - tol and lo <= lvl.price + tol
+            # прокол вниз
+            return lo <= lvl.price + tol and hi >= lvl.price - tol
+
+        index = self._level_index()
+        index.admit(ts)
+        # запас в tol на округление, точная проверка — в pierced()
+        seqs = [
+            seq for seq in sorted(index.seqs_between(lo - 2 * tol, hi + 2 * tol))
+            if pierced(index.level(seq))
+        ]
+        index.discard(seqs)
+        deactivated = [index.level(seq) for seq in seqs]
+        for lvl in deactivated:
+            lvl.active = False
+        return deactivated
+
+    def _level_index(self) -> "_LevelIndex":
+        if self._index is None or self._index.levels is not self.levels:
+            self._index = _LevelIndex(self.levels)
+        return self._index
+
+    # ---------- Инкрементальное состояние ----------
+
+    def _reset_stream(self) -> None:
+        fwd = self.confirm_forward
+        self._seen = 0
+        # свечи i-1 .. i+fwd вокруг кандидата i: (timestamp, high, low)
+        self._tail: Deque[Tuple[int, float, float]] = deque(maxlen=fwd + 2)
+        # монотонные деки (index, value): окно назад [i-w, i-1] и вперёд [i+1, i+fwd]
+        self._back_highs: Deque[Tuple[int, float]] = deque()
+        self._back_lows: Deque[Tuple[int, float]] = deque()
+        self._forward_highs: Deque[Tuple[int, float]] = deque()
+        self._forward_lows: Deque[Tuple[int, float]] = deque()
+        # бегущие дневные экстремумы (UTC-день -> значение)
+        self._day_highs: Dict[int, float] = {}
+        self._day_lows: Dict[int, float] = {}
+        self._current_day: Optional[int] = None
+        # уровни текущего дня с весом дневного экстремума
+        self._daily_high_levels: List[Level] = []
+        self._daily_low_levels: List[Level] = []
+
+    def _restart_stream(
+        self,
+        candles: Sequence[Candle],
+        timestamps: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+    ) -> None:
+        """Ставит инкрементальное состояние сразу после последней свечи build()."""
+        self._reset_stream()
+        n = len(candles)
+        start = max(0, n - (self.window + self.confirm_forward + 2))
+        self._seen = start
+        for k in range(start, n):
+            # кандидаты уже посчитаны в build(), здесь только заполняем окна
+            self._advance(candles[k])
+
+        # дневные экстремумы считаем по всей истории, а не только по хвосту
+        days = timestamps // DAY_MS
+        for day in self._day_highs:
+            in_day = days == day
+            self._day_highs[day] = float(highs[in_day].max())
+            self._day_lows[day] = float(lows[in_day].min())
+        self._daily_high_levels = [
+            lvl for lvl in self.levels
+            if lvl.type == "high" and lvl.weight == DAILY_EXTREME_WEIGHT
+            and lvl.timestamp // DAY_MS == self._current_day
+        ]
+        self._daily_low_levels = [
+            lvl for lvl in self.levels
+            if lvl.type == "low" and lvl.weight == DAILY_EXTREME_WEIGHT
+            and lvl.timestamp // DAY_MS == self._current_day
+        ]
+
+    def _advance(self, candle: Candle) -> List[Level]:
+        """Сдвигает окна на свечу и возвращает уровни-кандидаты до кластеризации."""
+        w = self.window
+        fwd = self.confirm_forward
+        k = self._seen
+        self._seen += 1
+
+        self._track_daily_extremes(candle)
+        self._tail.append((candle.timestamp, candle.high, candle.low))
+        _push_max(self._forward_highs, k, candle.high, k - fwd + 1)
+        _push_min(self._forward_lows, k, candle.low, k - fwd + 1)
+
+        if len(self._tail) < fwd + 2:
+            return []
+
+        # свеча i-1 входит в окно назад кандидата i = k - fwd
+        i = k - fwd
+        _, prev_high, prev_low = self._tail[0]
+        _push_max(self._back_highs, i - 1, prev_high, i - w)
+        _push_min(self._back_lows, i - 1, prev_low, i - w)
+        if i < w:
+            return []
+
+        ts, high, low = self._tail[1]
+        _, next_high, next_low = self._tail[2]
+        day = ts // DAY_MS
+        candidates: List[Level] = []
+
+        if high > next_high and high > self._back_highs[0][1] and high >= self._forward_highs[0][1]:
+            weight = DAILY_EXTREME_WEIGHT if high == self._day_highs[day] else DEFAULT_LEVEL_WEIGHT
+            candidates.append(self._stream_level("high", high, ts, candle.timestamp, weight))
+        if low < next_low and low < self._back_lows[0][1] and low <= self._forward_lows[0][1]:
+            weight = DAILY_EXTREME_WEIGHT if low == self._day_lows[day] else DEFAULT_LEVEL_WEIGHT
+            candidates.append(self._stream_level("low", low, ts, candle.timestamp, weight))
+        return candidates
+
+    def _track_daily_extremes(self, candle: Candle) -> None:
+        day = candle.timestamp // DAY_MS
+        if day != self._current_day:
+            self._current_day = day
+            self._daily_high_levels = []
+            self._daily_low_levels = []
+            # старше самой ранней свечи в хвосте дни уже не нужны
+            oldest_day = self._tail[0][0] // DAY_MS if self._tail else day
+            for stale in [d for d in self._day_highs if d < oldest_day]:
+                del self._day_highs[stale]
+                del self._day_lows[stale]
+            self._day_highs[day] = candle.high
+            self._day_lows[day] = candle.low
+            return
+
+        if candle.high > self._day_highs[day]:
+            self._day_highs[day] = candle.high
+            # прежний дневной максимум больше не экстремум дня
+            for lvl in self._daily_high_levels:
+                lvl.weight = DEFAULT_LEVEL_WEIGHT
+            self._daily_high_levels = []
+        if candle.low < self._day_lows[day]:
+            self._day_lows[day] = candle.low
+            for lvl in self._daily_low_levels:
+                lvl.weight = DEFAULT_LEVEL_WEIGHT
+            self._daily_low_levels = []
+
+    def _stream_level(
+        self,
+        type_: str,
+        price: float,
+        ts_ms: int,
+        conf_ts_ms: int,
+        weight: float,
+    ) -> Level:
+        return Level(
+            price=_round_to_tick(price, self.tick_size), type=type_,
+            timestamp=ts_ms, datetime=_utc_isoformat(ts_ms),
+            weight=weight,
+            confirmed_timestamp=conf_ts_ms, confirmed_datetime=_utc_isoformat(conf_ts_ms),
+        )
+
+class _LevelIndex:
+    """
+    Индекс уровней по цене: отсортированные (price, seq) по каждому типу и
+    курсор по времени подтверждения. В индекс попадают только уровни,
+    подтверждённые до последнего запрошенного времени; снятые уровни удаляются.
+    seq — порядковый номер уровня: позиция в levels плюс число забытых
+    (forget) уровней, поэтому номера не сдвигаются при удалении префикса.
+    """
+    def __init__(self, levels: List[Level]) -> None:
+        self.levels = levels
+        self._base = 0
+        self._size = 0
+        self._pending: List[Tuple[int, int]] = []  # (confirmed_timestamp, seq)
+        self._cursor = 0
+        self._prices: Dict[str, List[Tuple[float, int]]] = {}
+
+    def admit(self, timestamp_ms: int) -> None:
+        self._sync()
+        pending = self._pending
+        while self._cursor < len(pending) and pending[self._cursor][0] < timestamp_ms:
+            seq = pending[self._cursor][1]
+            self._cursor += 1
+            lvl = self.level(seq)
+            if lvl.active:
+                insort(self._prices.setdefault(lvl.type, []), (lvl.price, seq))
+
+    def seqs_between(self, lo: float, hi: float) -> List[int]:
+        seqs: List[int] = []
+        for prices in self._prices.values():
+            start = bisect_left(prices, (lo, -1))
+            stop = bisect_right(prices, (hi, self._base + len(self.levels)))
+            seqs.extend(seq for _, seq in prices[start:stop])
+        return seqs
+
+    def all_seqs(self) -> List[int]:
+        return [seq for prices in self._prices.values() for _, seq in prices]
+
+    def collect(self, seqs: List[int], keep) -> List[Level]:
+        seqs.sort()
+        return [self.level(seq) for seq in seqs if keep(self.level(seq))]
+
+    def level(self, seq: int) -> Level:
+        return self.levels[seq - self._base]
+
+    def discard(self, seqs: Sequence[int]) -> None:
+        for seq in seqs:
+            lvl = self.level(seq)
+            prices = self._prices.get(lvl.type, [])
+            pos = bisect_left(prices, (lvl.price, seq))
+            if pos < len(prices) and prices[pos][1] == seq:
+                del prices[pos]
+
+    def forget(self, count: int) -> None:
+        """Убирает из индекса первые count уровней перед их удалением из levels."""
+        self._sync()
+        stop = self._base + count
+        self.discard(range(self._base, stop))
+        self._pending = [item for item in self._pending[self._cursor:] if item[1] >= stop]
+        self._cursor = 0
+        self._base = stop
+        self._size -= count
+
+    def _sync(self) -> None:
+        # новые уровни дописываются в конец levels (update)
+        if len(self.levels) == self._size:
+            return
+        added = [
+            (self.levels[pos].confirmed_timestamp, self._base + pos)
+            for pos in range(self._size, len(self.levels))
+        ]
+        self._size = len(self.levels)
+        rest = self._pending[self._cursor:]
+        if rest and added[0] < rest[-1] or any(a > b for a, b in zip(added, added[1:])):
+            self._pending = sorted(rest + added)
+        else:
+            self._pending = rest + added
+        self._cursor = 0
 
 # ---------- Вспомогательные функции ----------
 
-def _candles_to_df(candles: List[Candle]) -> pd.DataFrame:
-    data = {
-        "Open":  [c.open for c in candles],
-        "High":  [c.high for c in candles],
-        "Low":   [c.low for c in candles],
-        "Close": [c.close for c in candles],
-    }
-    index = pd.to_datetime([c.timestamp for c in candles], unit="ms", utc=True)
-    return pd.DataFrame(data, index=index)
+def _timestamps_ms(candles: Sequence[Candle]) -> np.ndarray:
+    if isinstance(candles, CandleSeries):
+        return candles.timestamp
+    return np.fromiter((c.timestamp for c in candles), dtype=np.int64, count=len(candles))
+
+def _price_column(candles: Sequence[Candle], name: str) -> np.ndarray:
+    if isinstance(candles, CandleSeries):
+        return getattr(candles, name)
+    return np.fromiter((getattr(c, name) for c in candles), dtype=np.float64, count=len(candles))
+
+def _daily_extremes(day_index: np.ndarray, highs: np.ndarray, lows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Максимум High и минимум Low UTC-дня каждой свечи."""
+    days, inverse = np.unique(day_index, return_inverse=True)
+    if np.all(day_index[1:] >= day_index[:-1]):
+        # свечи по порядку: дни идут подряд, хватает reduceat
+        starts = np.flatnonzero(np.r_[True, day_index[1:] != day_index[:-1]])
+        return np.maximum.reduceat(highs, starts)[inverse], np.minimum.reduceat(lows, starts)[inverse]
+    day_highs = np.full(len(days), -np.inf)
+    day_lows = np.full(len(days), np.inf)
+    np.maximum.at(day_highs, inverse, highs)
+    np.minimum.at(day_lows, inverse, lows)
+    return day_highs[inverse], day_lows[inverse]
+
+def _causal_extrema(arr: np.ndarray, back_w: int, fwd_w: int, beyond, extreme) -> np.ndarray:
+    """
+    Индексы строгих локальных экстремумов (векторная версия проверки по каждой свече):
+    - строго "за" ближайшими соседями (без плато),
+    - строго "за" экстремумом последних back_w свечей до i,
+    - не хуже экстремума ближайших fwd_w свечей после i.
+    """
+    n = len(arr)
+    if n - fwd_w <= back_w:
+        return np.empty(0, dtype=np.int64)
+    idx = np.arange(back_w, n - fwd_w)
+    # окно j покрывает [j, j + size)
+    back = extreme(np.lib.stride_tricks.sliding_window_view(arr, back_w), axis=1)
+    forward = extreme(np.lib.stride_tricks.sliding_window_view(arr, fwd_w), axis=1)
+    value = arr[idx]
+    mask = (
+        beyond(value, arr[idx - 1])
+        & beyond(value, arr[idx + 1])
+        & beyond(value, back[idx - back_w])
+        & ~beyond(forward[idx + 1], value)
+    )
+    return idx[mask]
 
 def _round_to_tick(price: float, tick_size: Optional[float]) -> float:
     if not tick_size or tick_size <= 0:
@@ -156,31 +468,45 @@ def _ticks_to_abs(tick_size: Optional[float], ticks: int) -> float:
         return 0.0
     return ticks * tick_size
 
-def _is_local_max_causal(arr: np.ndarray, i: int, back_w: int, fwd_w: int) -> bool:
-    # строго выше ближайших соседей (без плато)
-    if not (arr[i] > arr[i - 1] and arr[i] > arr[i + 1]):
-        return False
-    # выше всего, что было в последних back_w свечах до i
-    if arr[i] <= np.max(arr[i - back_w:i]):
-        return False
-    # и не ниже максимума на ближайших fwd_w свечах после i
-    # (т.е. в окна [i+1, i+fwd_w] не появилось более высокой вершины)
-    return arr[i] >= np.max(arr[i + 1:i + 1 + fwd_w])
+def _utc_isoformat(ts_ms: int) -> str:
+    return (_EPOCH + timedelta(milliseconds=ts_ms)).isoformat()
 
-def _is_local_min_causal(arr: np.ndarray, i: int, back_w: int, fwd_w: int) -> bool:
-    if not (arr[i] < arr[i - 1] and arr[i] < arr[i + 1]):
-        return False
-    if arr[i] >= np.min(arr[i - back_w:i]):
+def _utc_isoformat_array(ts_ms: np.ndarray) -> List[str]:
+    """Векторный _utc_isoformat: секунды без дробной части, иначе микросекунды."""
+    moments = ts_ms.astype("datetime64[ms]")
+    whole = np.datetime_as_string(moments, unit="s")
+    fractional = np.datetime_as_string(moments, unit="us")
+    return [
+        text + "+00:00"
+        for text in np.where(ts_ms % 1000 == 0, whole, fractional).tolist()
+    ]
+
+def _push_max(window: Deque[Tuple[int, float]], idx: int, value: float, start: int) -> None:
+    while window and window[-1][1] <= value:
+        window.pop()
+    window.append((idx, value))
+    while window[0][0] < start:
+        window.popleft()
+
+def _push_min(window: Deque[Tuple[int, float]], idx: int, value: float, start: int) -> None:
+    while window and window[-1][1] >= value:
+        window.pop()
+    window.append((idx, value))
+    while window[0][0] < start:
+        window.popleft()
+
+def _same_cluster(last: Level, lv: Level, tick_size: Optional[float], cluster_ticks: int) -> bool:
+    if not tick_size or tick_size <= 0 or cluster_ticks <= 0:
         return False
-    return arr[i] <= np.min(arr[i + 1:i + 1 + fwd_w])
+    tol = _ticks_to_abs(tick_size, cluster_ticks)
+    return abs(last.price - lv.price) <= tol and lv.type == last.type
 
 def _cluster_levels(levels: List[Level], tick_size: Optional[float], cluster_ticks: int) -> List[Level]:
     if not levels or not tick_size or tick_size <= 0 or cluster_ticks <= 0:
         return levels
-    tol = _ticks_to_abs(tick_size, cluster_ticks)
     result: List[Level] = []
     for lv in levels:
-        if result and abs(result[-1].price - lv.price) <= tol and lv.type == result[-1].type:
+        if result and _same_cluster(result[-1], lv, tick_size, cluster_ticks):
             continue
         result.append(lv)
     return result
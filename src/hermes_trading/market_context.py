@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
+import json
+import os
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Sequence
 
-from .candles import Candle
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .candles import Candle, as_candle_series
 from .time_utils import timeframe_to_milliseconds
 
 DEFAULT_CONTEXT_RANGE_LOOKBACK = 20
@@ -119,10 +127,26 @@ def _higher_timeframe_bias(
         target_timeframe=higher_timeframe,
         closed_before_or_at=signal_available_at_timestamp,
     )
-    if not aggregated:
+    return _bias_from_closes(
+        higher_timeframe,
+        [float(candle.close) for candle in aggregated],
+        fast_period=fast_period,
+        slow_period=slow_period,
+    )
+
+
+def _bias_from_closes(
+    higher_timeframe: str,
+    closes: Sequence[float],
+    *,
+    fast_period: int,
+    slow_period: int,
+) -> tuple[str | None, str | None, float | None, float | None, float | None]:
+    """Bias from the closes of the closed higher-timeframe bars, oldest first."""
+
+    if not closes:
         return higher_timeframe, None, None, None, None
 
-    closes = [float(candle.close) for candle in aggregated]
     last_close = closes[-1]
     fast_sma = _sma(closes, fast_period)
     slow_sma = _sma(closes, slow_period)
@@ -222,10 +246,27 @@ def _atr_context(
     if not tr_values:
         return None, None, None, None
 
-    atr_abs = sum(tr_values) / len(tr_values)
-    signal_close = float(candles[signal_index].close)
+    signal_candle = candles[signal_index]
+    return _atr_metrics(
+        tr_values,
+        signal_high=float(signal_candle.high),
+        signal_low=float(signal_candle.low),
+        signal_close=float(signal_candle.close),
+    )
+
+
+def _atr_metrics(
+    true_ranges: Sequence[float],
+    *,
+    signal_high: float,
+    signal_low: float,
+    signal_close: float,
+) -> tuple[float, float | None, float | None, str | None]:
+    """ATR, ATR as % of the close, signal range to ATR ratio and volatility regime."""
+
+    atr_abs = sum(true_ranges) / len(true_ranges)
     atr_pct = _pct_of_price(atr_abs, signal_close)
-    signal_range = float(candles[signal_index].high) - float(candles[signal_index].low)
+    signal_range = signal_high - signal_low
     signal_range_to_atr_ratio = (
         signal_range / atr_abs
         if atr_abs > 0
@@ -326,6 +367,409 @@ def build_signal_market_context(
     )
 
 
+class MarketContextIndex:
+    """Market context for every candle of one series, prepared in one pass.
+
+    Higher-timeframe bars, their close times, true ranges and the trailing
+    range/recent extremes are built once, so ``context_at`` does constant work
+    per signal. SMA and ATR windows are summed at query time over their fixed
+    periods in the same order as ``build_signal_market_context``, whose output
+    ``context_at`` reproduces exactly.
+    """
+
+    def __init__(
+        self,
+        candles: Sequence[Candle],
+        *,
+        range_lookback: int = DEFAULT_CONTEXT_RANGE_LOOKBACK,
+        recent_lookback: int = DEFAULT_CONTEXT_RECENT_LOOKBACK,
+        atr_period: int = DEFAULT_CONTEXT_ATR_PERIOD,
+        bias_fast_period: int = DEFAULT_CONTEXT_BIAS_FAST_PERIOD,
+        bias_slow_period: int = DEFAULT_CONTEXT_BIAS_SLOW_PERIOD,
+    ) -> None:
+        if range_lookback <= 0 or recent_lookback <= 0:
+            raise ValueError("lookback must be positive")
+        if atr_period <= 0:
+            raise ValueError("period must be positive")
+
+        self._candles = candles
+        self.range_lookback = range_lookback
+        self.recent_lookback = recent_lookback
+        self.atr_period = atr_period
+        self.bias_fast_period = bias_fast_period
+        self.bias_slow_period = bias_slow_period
+
+        series = as_candle_series(candles)
+        self._timeframe = series.timeframe
+        self._timestamps = series.timestamp.tolist()
+        self._highs = series.high.tolist()
+        self._lows = series.low.tolist()
+        self._closes = series.close.tolist()
+        self._range_highs = _trailing_extreme(series.high, range_lookback, np.max).tolist()
+        self._range_lows = _trailing_extreme(series.low, range_lookback, np.min).tolist()
+        self._recent_highs = _trailing_extreme(series.high, recent_lookback, np.max).tolist()
+        self._recent_lows = _trailing_extreme(series.low, recent_lookback, np.min).tolist()
+        self._true_ranges = _true_ranges(series.high, series.low, series.close).tolist()
+
+        self._higher_timeframe = (
+            HIGHER_TIMEFRAME_MAP.get(self._timeframe)
+            if self._timeframe is not None
+            else None
+        )
+        self._bucket_ends: list[int] = []
+        self._bucket_last_index: list[int] = []
+        self._bucket_closes: list[float] = []
+        # unsorted input breaks bucket contiguity; such series use the slow path
+        self._sorted = bool(np.all(series.timestamp[1:] >= series.timestamp[:-1]))
+        if self._higher_timeframe is not None and self._sorted and len(series):
+            target_ms = timeframe_to_milliseconds(self._higher_timeframe)
+            buckets = (series.timestamp // target_ms) * target_ms
+            last_index = np.append(np.flatnonzero(buckets[1:] != buckets[:-1]), len(series) - 1)
+            self._bucket_ends = (buckets[last_index] + target_ms).tolist()
+            self._bucket_last_index = last_index.tolist()
+            self._bucket_closes = series.close[last_index].tolist()
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def context_at(self, signal_index: int) -> SignalMarketContext:
+        """Context of the candle at ``signal_index``, as ``build_signal_market_context``."""
+
+        if signal_index < 0 or signal_index >= len(self):
+            raise IndexError("signal_index is out of bounds")
+        if not self._sorted or self._timeframe is None:
+            return self._build_directly(signal_index)
+
+        signal_available_at_timestamp = (
+            self._timestamps[signal_index] + timeframe_to_milliseconds(self._timeframe)
+        )
+        higher = self._higher_timeframe_bias(signal_index, signal_available_at_timestamp)
+        if higher is None:
+            return self._build_directly(signal_index)
+        start_index = max(0, signal_index - self.atr_period + 1)
+        return _assemble_context(
+            higher,
+            range_lookback=self.range_lookback,
+            range_high=self._range_highs[signal_index],
+            range_low=self._range_lows[signal_index],
+            recent_lookback=self.recent_lookback,
+            recent_high=self._recent_highs[signal_index - 1] if signal_index > 0 else None,
+            recent_low=self._recent_lows[signal_index - 1] if signal_index > 0 else None,
+            atr_period=self.atr_period,
+            true_ranges=self._true_ranges[start_index:signal_index + 1],
+            signal_high=self._highs[signal_index],
+            signal_low=self._lows[signal_index],
+            signal_close=self._closes[signal_index],
+        )
+
+    def _higher_timeframe_bias(
+        self,
+        signal_index: int,
+        signal_available_at_timestamp: int,
+    ) -> tuple[str | None, str | None, float | None, float | None, float | None] | None:
+        if self._higher_timeframe is None:
+            return None, None, None, None, None
+
+        closed = bisect_right(self._bucket_ends, signal_available_at_timestamp)
+        if not closed:
+            return self._higher_timeframe, None, None, None, None
+        if self._bucket_last_index[closed - 1] > signal_index:
+            # the bar also holds candles after the signal; only a prefix rebuild matches
+            return None
+
+        return _bias_from_closes(
+            self._higher_timeframe,
+            self._bucket_closes[max(0, closed - max(self.bias_fast_period, self.bias_slow_period, 1)):closed],
+            fast_period=self.bias_fast_period,
+            slow_period=self.bias_slow_period,
+        )
+
+    def _build_directly(self, signal_index: int) -> SignalMarketContext:
+        return build_signal_market_context(
+            self._candles,
+            signal_index,
+            range_lookback=self.range_lookback,
+            recent_lookback=self.recent_lookback,
+            atr_period=self.atr_period,
+            bias_fast_period=self.bias_fast_period,
+            bias_slow_period=self.bias_slow_period,
+        )
+
+
+class MarketContextTracker:
+    """Streaming market context for one symbol/timeframe.
+
+    ``update`` folds in one closed candle in constant time, keeping only the
+    bounded windows the context needs: recent candles, true ranges and the
+    latest higher-timeframe closes. Fed the same history, ``context`` equals
+    ``build_signal_market_context`` at the latest candle. The state round-trips
+    through ``to_dict``/``from_dict`` so a scan can resume where the last stopped.
+    """
+
+    def __init__(
+        self,
+        timeframe: str,
+        *,
+        range_lookback: int = DEFAULT_CONTEXT_RANGE_LOOKBACK,
+        recent_lookback: int = DEFAULT_CONTEXT_RECENT_LOOKBACK,
+        atr_period: int = DEFAULT_CONTEXT_ATR_PERIOD,
+        bias_fast_period: int = DEFAULT_CONTEXT_BIAS_FAST_PERIOD,
+        bias_slow_period: int = DEFAULT_CONTEXT_BIAS_SLOW_PERIOD,
+    ) -> None:
+        if range_lookback <= 0 or recent_lookback <= 0:
+            raise ValueError("lookback must be positive")
+        if atr_period <= 0:
+            raise ValueError("period must be positive")
+
+        self.timeframe = timeframe
+        self.range_lookback = range_lookback
+        self.recent_lookback = recent_lookback
+        self.atr_period = atr_period
+        self.bias_fast_period = bias_fast_period
+        self.bias_slow_period = bias_slow_period
+        self.higher_timeframe = HIGHER_TIMEFRAME_MAP.get(timeframe)
+        self._timeframe_ms = timeframe_to_milliseconds(timeframe)
+        self._higher_timeframe_ms = (
+            timeframe_to_milliseconds(self.higher_timeframe)
+            if self.higher_timeframe is not None
+            else None
+        )
+        # (timestamp, high, low, close) of the latest candles, oldest first
+        self._candles: deque[tuple[int, float, float, float]] = deque(
+            maxlen=max(range_lookback, recent_lookback + 1)
+        )
+        self._true_ranges: deque[float] = deque(maxlen=atr_period)
+        self._bucket_closes: deque[float] = deque(maxlen=max(bias_fast_period, bias_slow_period, 1))
+        self._open_bucket: tuple[int, float] | None = None
+
+    @property
+    def last_timestamp(self) -> int | None:
+        return self._candles[-1][0] if self._candles else None
+
+    @property
+    def warmup_candles(self) -> int:
+        """Candles needed before every context field is populated."""
+
+        needed = max(self.range_lookback, self.recent_lookback + 1, self.atr_period + 1)
+        if self._higher_timeframe_ms is not None:
+            bars = max(self.bias_fast_period, self.bias_slow_period) + 1
+            needed = max(needed, bars * (self._higher_timeframe_ms // self._timeframe_ms))
+        return needed
+
+    def update(self, candle: Candle) -> bool:
+        """Add a closed candle; candles at or before the last one are ignored."""
+
+        last_timestamp = self.last_timestamp
+        if last_timestamp is not None and candle.timestamp <= last_timestamp:
+            return False
+
+        previous_close = self._candles[-1][3] if self._candles else None
+        self._true_ranges.append(_true_range(candle, previous_close))
+        self._candles.append(
+            (int(candle.timestamp), float(candle.high), float(candle.low), float(candle.close))
+        )
+        if self._higher_timeframe_ms is not None:
+            bucket = (candle.timestamp // self._higher_timeframe_ms) * self._higher_timeframe_ms
+            if self._open_bucket is not None and self._open_bucket[0] != bucket:
+                self._bucket_closes.append(self._open_bucket[1])
+            self._open_bucket = (int(bucket), float(candle.close))
+        return True
+
+    def context(self) -> SignalMarketContext | None:
+        """Context of the latest candle, or ``None`` before the first update."""
+
+        if not self._candles:
+            return None
+
+        timestamp, signal_high, signal_low, signal_close = self._candles[-1]
+        if self.higher_timeframe is None:
+            higher = (None, None, None, None, None)
+        else:
+            closes = list(self._bucket_closes)
+            # the open bar counts once its end is not after the signal close
+            if self._open_bucket[0] + self._higher_timeframe_ms <= timestamp + self._timeframe_ms:
+                closes.append(self._open_bucket[1])
+            higher = _bias_from_closes(
+                self.higher_timeframe,
+                closes,
+                fast_period=self.bias_fast_period,
+                slow_period=self.bias_slow_period,
+            )
+
+        candles = list(self._candles)
+        range_window = candles[-self.range_lookback:]
+        recent_window = candles[-self.recent_lookback - 1:-1]
+        return _assemble_context(
+            higher,
+            range_lookback=self.range_lookback,
+            range_high=max(high for _, high, _, _ in range_window),
+            range_low=min(low for _, _, low, _ in range_window),
+            recent_lookback=self.recent_lookback,
+            recent_high=max((high for _, high, _, _ in recent_window), default=None),
+            recent_low=min((low for _, _, low, _ in recent_window), default=None),
+            atr_period=self.atr_period,
+            true_ranges=list(self._true_ranges),
+            signal_high=signal_high,
+            signal_low=signal_low,
+            signal_close=signal_close,
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "timeframe": self.timeframe,
+            "range_lookback": self.range_lookback,
+            "recent_lookback": self.recent_lookback,
+            "atr_period": self.atr_period,
+            "bias_fast_period": self.bias_fast_period,
+            "bias_slow_period": self.bias_slow_period,
+            "candles": [list(item) for item in self._candles],
+            "true_ranges": list(self._true_ranges),
+            "bucket_closes": list(self._bucket_closes),
+            "open_bucket": list(self._open_bucket) if self._open_bucket is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, object]) -> MarketContextTracker:
+        tracker = cls(
+            str(payload["timeframe"]),
+            range_lookback=int(payload["range_lookback"]),
+            recent_lookback=int(payload["recent_lookback"]),
+            atr_period=int(payload["atr_period"]),
+            bias_fast_period=int(payload["bias_fast_period"]),
+            bias_slow_period=int(payload["bias_slow_period"]),
+        )
+        tracker._candles.extend(
+            (int(timestamp), float(high), float(low), float(close))
+            for timestamp, high, low, close in payload["candles"]
+        )
+        tracker._true_ranges.extend(float(value) for value in payload["true_ranges"])
+        tracker._bucket_closes.extend(float(value) for value in payload["bucket_closes"])
+        open_bucket = payload["open_bucket"]
+        if open_bucket is not None:
+            tracker._open_bucket = (int(open_bucket[0]), float(open_bucket[1]))
+        return tracker
+
+
+def load_context_trackers(path: str | Path) -> dict[str, MarketContextTracker]:
+    """Read trackers saved by ``save_context_trackers``; a missing file is empty."""
+
+    path = Path(path)
+    if not path.exists():
+        return {}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        key: MarketContextTracker.from_dict(item)
+        for key, item in payload.get("trackers", {}).items()
+    }
+
+
+def save_context_trackers(path: str | Path, trackers: dict[str, MarketContextTracker]) -> None:
+    """Atomically persist trackers keyed by an exchange/symbol/timeframe string."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"trackers": {key: tracker.to_dict() for key, tracker in trackers.items()}}),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
+
+
+def _assemble_context(
+    higher: tuple[str | None, str | None, float | None, float | None, float | None],
+    *,
+    range_lookback: int,
+    range_high: float,
+    range_low: float,
+    recent_lookback: int,
+    recent_high: float | None,
+    recent_low: float | None,
+    atr_period: int,
+    true_ranges: Sequence[float],
+    signal_high: float,
+    signal_low: float,
+    signal_close: float,
+) -> SignalMarketContext:
+    """Finish a context from precomputed windows, with ``build_signal_market_context`` math."""
+
+    (
+        higher_timeframe,
+        higher_timeframe_bias,
+        higher_timeframe_close,
+        higher_timeframe_fast_sma,
+        higher_timeframe_slow_sma,
+    ) = higher
+    range_size = range_high - range_low
+    range_position_pct = (
+        ((signal_close - range_low) / range_size) * 100
+        if range_size > 0
+        else None
+    )
+
+    if recent_high is not None and recent_low is not None:
+        distance_to_recent_high_abs = abs(recent_high - signal_close)
+        distance_to_recent_low_abs = abs(signal_close - recent_low)
+    else:
+        distance_to_recent_high_abs = distance_to_recent_low_abs = None
+
+    atr_abs, atr_pct, signal_range_to_atr_ratio, volatility_regime = _atr_metrics(
+        true_ranges,
+        signal_high=signal_high,
+        signal_low=signal_low,
+        signal_close=signal_close,
+    )
+
+    return SignalMarketContext(
+        higher_timeframe=higher_timeframe,
+        higher_timeframe_bias=higher_timeframe_bias,
+        higher_timeframe_close=higher_timeframe_close,
+        higher_timeframe_fast_sma=higher_timeframe_fast_sma,
+        higher_timeframe_slow_sma=higher_timeframe_slow_sma,
+        range_lookback=range_lookback,
+        range_high=range_high,
+        range_low=range_low,
+        range_position_pct=range_position_pct,
+        recent_lookback=recent_lookback,
+        recent_high=recent_high,
+        recent_low=recent_low,
+        distance_to_recent_high_abs=distance_to_recent_high_abs,
+        distance_to_recent_high_pct=_pct_of_price(distance_to_recent_high_abs, signal_close),
+        distance_to_recent_low_abs=distance_to_recent_low_abs,
+        distance_to_recent_low_pct=_pct_of_price(distance_to_recent_low_abs, signal_close),
+        atr_period=atr_period,
+        atr_abs=atr_abs,
+        atr_pct=atr_pct,
+        signal_range_to_atr_ratio=signal_range_to_atr_ratio,
+        volatility_regime=volatility_regime,
+    )
+
+
+def _trailing_extreme(values: np.ndarray, lookback: int, extreme) -> np.ndarray:
+    """``extreme(values[max(0, i - lookback + 1):i + 1])`` for every ``i``."""
+
+    if len(values) == 0:
+        return values.copy()
+    head = min(lookback - 1, len(values))
+    accumulate = np.maximum.accumulate if extreme is np.max else np.minimum.accumulate
+    result = np.empty_like(values)
+    result[:head] = accumulate(values[:head])
+    if len(values) >= lookback:
+        result[head:] = extreme(sliding_window_view(values, lookback), axis=1)
+    return result
+
+
+def _true_ranges(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    true_ranges = high - low
+    if len(true_ranges) > 1:
+        previous_close = close[:-1]
+        true_ranges[1:] = np.maximum(
+            true_ranges[1:],
+            np.maximum(np.abs(high[1:] - previous_close), np.abs(low[1:] - previous_close)),
+        )
+    return true_ranges
+
+
 __all__ = [
     "DEFAULT_CONTEXT_ATR_PERIOD",
     "DEFAULT_CONTEXT_BIAS_FAST_PERIOD",
@@ -333,6 +777,10 @@ __all__ = [
     "DEFAULT_CONTEXT_RANGE_LOOKBACK",
     "DEFAULT_CONTEXT_RECENT_LOOKBACK",
     "HIGHER_TIMEFRAME_MAP",
+    "MarketContextIndex",
+    "MarketContextTracker",
     "SignalMarketContext",
     "build_signal_market_context",
+    "load_context_trackers",
+    "save_context_trackers",
 ]
@@ -9,11 +9,16 @@ import time
 import urllib.parse
 import urllib.request
 from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Deque, List, Sequence
+from typing import Callable, Deque, Iterable, Iterator, List, Sequence
 
-from .candles import Candle, CandleBatch
+import numpy as np
+
+from .candles import Candle, CandleBatch, CandleSeries
 from .connectors.base import ExchangeConnector
 from .liquidity import Level, LiquidityLevels
 from .signals.base import Signal, SignalMatch
@@ -47,33 +52,47 @@ class SQLiteStorage:
         self._conn = sqlite3.connect(path, check_same_thread=False)
         self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._in_transaction = False
         self._create_schema()
 
     def close(self) -> None:
         self._conn.close()
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group the writes inside the block into one commit.
+
+        Nested blocks join the outer transaction; an exception rolls it back.
+        """
+
+        if self._in_transaction:
+            yield
+            return
+        self._in_transaction = True
+        try:
+            with self._conn:
+                yield
+        finally:
+            self._in_transaction = False
+
     def store_candle(self, symbol: str, interval: str, candle: Candle) -> bool:
-        query = (
-            "INSERT OR IGNORE INTO candles\n"
-            "    (symbol, interval, timestamp, datetime, open, high, low, close)\n"
-            "    VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
-        )
-        with self._conn:
-            cur = self._conn.execute(
-                query,
-                (
-                    symbol,
-                    interval,
-                    candle.timestamp,
-                    candle.datetime,
-                    candle.open,
-                    candle.high,
-                    candle.low,
-                    candle.close,
-                ),
-            )
+        with self.transaction():
+            cur = self._conn.execute(_INSERT_CANDLE, _candle_row(symbol, interval, candle))
         return cur.rowcount > 0
 
+    def store_candles(
+        self, symbol: str, interval: str, candles: Iterable[Candle]
+    ) -> int:
+        """Bulk-insert candles, e.g. for a backfill; return how many were new."""
+
+        with self.transaction():
+            before = self._conn.total_changes
+            self._conn.executemany(
+                _INSERT_CANDLE,
+                (_candle_row(symbol, interval, candle) for candle in candles),
+            )
+            return self._conn.total_changes - before
+
     def last_candle_timestamp(self, symbol: str, interval: str) -> int | None:
         query = (
             "SELECT timestamp FROM candles\n"
@@ -88,8 +107,13 @@ class SQLiteStorage:
     def fetch_recent_candles(
         self, symbol: str, interval: str, limit: int
     ) -> List[Candle]:
+        return self.fetch_recent_series(symbol, interval, limit).to_candles()
+
+    def fetch_recent_series(
+        self, symbol: str, interval: str, limit: int
+    ) -> CandleSeries:
         query = (
-            "SELECT timestamp, datetime, open, high, low, close\n"
+            "SELECT timestamp, datetime, open, high, low, close, volume\n"
             "  FROM candles\n"
             " WHERE symbol = ? AND interval = ?\n"
             " ORDER BY timestamp DESC\n"
@@ -97,43 +121,110 @@ class SQLiteStorage:
         )
         cur = self._conn.execute(query, (symbol, interval, limit))
         rows = cur.fetchall()
-        candles = [
-            Candle(
-                timestamp=int(ts),
-                datetime=dt,
-                open=float(open_),
-                high=float(high),
-                low=float(low),
-                close=float(close),
-            )
-            for ts, dt, open_, high, low, close in rows
-        ]
-        candles.reverse()
-        return candles
+        rows.reverse()
+        if not rows:
+            return CandleSeries.empty(symbol=symbol, timeframe=interval)
+        timestamps, datetimes, opens, highs, lows, closes, volumes = zip(*rows)
+        return CandleSeries(
+            timestamp=np.asarray(timestamps, dtype=np.int64),
+            open=np.asarray(opens, dtype=np.float64),
+            high=np.asarray(highs, dtype=np.float64),
+            low=np.asarray(lows, dtype=np.float64),
+            close=np.asarray(closes, dtype=np.float64),
+            volume=np.asarray(volumes, dtype=np.float64),
+            symbol=symbol,
+            timeframe=interval,
+            datetime=np.asarray(datetimes, dtype=object),
+        )
+
+    def fetch_series_between(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int
+    ) -> CandleSeries:
+        """Return candles with ``start_ms <= timestamp < end_ms`` as columns.
+
+        The scan walks the primary-key index. Stored datetimes are not read;
+        the series renders them on demand.
+        """
 
-    def store_level(self, symbol: str, interval: str, level: Level) -> bool:
         query = (
-            "INSERT OR IGNORE INTO levels\n"
-            "    (symbol, interval, price, type, timestamp, datetime,\n"
-            "     confirmed_timestamp, confirmed_datetime, active)\n"
-            "    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            "SELECT timestamp, open, high, low, close, volume\n"
+            "  FROM candles\n"
+            " WHERE symbol = ? AND interval = ?\n"
+            "   AND timestamp >= ? AND timestamp < ?\n"
+            " ORDER BY timestamp"
         )
-        with self._conn:
-            cur = self._conn.execute(
-                query,
+        rows = self._conn.execute(query, (symbol, interval, start_ms, end_ms)).fetchall()
+        if not rows:
+            return CandleSeries.empty(symbol=symbol, timeframe=interval)
+        return CandleSeries.from_ohlcv(rows, symbol=symbol, timeframe=interval)
+
+    def upsert_ohlcv_rows(
+        self,
+        symbol: str,
+        interval: str,
+        rows: Iterable[tuple[int, float, float, float, float, float]],
+    ) -> None:
+        """Insert or overwrite raw ``(timestamp, o, h, l, c, v)`` rows."""
+
+        with self.transaction():
+            self._conn.executemany(
+                _UPSERT_CANDLE,
                 (
-                    symbol,
-                    interval,
-                    level.price,
-                    level.type,
-                    level.timestamp,
-                    level.datetime,
-                    level.confirmed_timestamp,
-                    level.confirmed_datetime,
-                    int(level.active),
+                    (
+                        symbol,
+                        interval,
+                        int(timestamp),
+                        datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).isoformat(),
+                        open_,
+                        high,
+                        low,
+                        close,
+                        volume,
+                    )
+                    for timestamp, open_, high, low, close, volume in rows
                 ),
             )
-        return cur.rowcount > 0
+
+    def complete_ranges(self, symbol: str, interval: str) -> tuple[tuple[int, int], ...]:
+        """``[start_ms, end_ms)`` ranges recorded as fully downloaded."""
+
+        query = (
+            "SELECT start_ms, end_ms FROM candle_ranges\n"
+            " WHERE symbol = ? AND interval = ?\n"
+            " ORDER BY start_ms"
+        )
+        rows = self._conn.execute(query, (symbol, interval)).fetchall()
+        return tuple((int(start), int(end)) for start, end in rows)
+
+    def replace_complete_ranges(
+        self, symbol: str, interval: str, ranges: Iterable[tuple[int, int]]
+    ) -> None:
+        with self.transaction():
+            self._conn.execute(
+                "DELETE FROM candle_ranges WHERE symbol = ? AND interval = ?",
+                (symbol, interval),
+            )
+            self._conn.executemany(
+                "INSERT INTO candle_ranges (symbol, interval, start_ms, end_ms)\n"
+                "    VALUES (?, ?, ?, ?)",
+                ((symbol, interval, start, end) for start, end in ranges),
+            )
+
+    def store_level(self, symbol: str, interval: str, level: Level) -> bool:
+        return bool(self.store_levels(symbol, interval, [level]))
+
+    def store_levels(
+        self, symbol: str, interval: str, levels: Iterable[Level]
+    ) -> list[Level]:
+        """Insert levels in one transaction and return those that were new."""
+
+        inserted = []
+        with self.transaction():
+            for level in levels:
+                cur = self._conn.execute(_INSERT_LEVEL, _level_row(symbol, interval, level))
+                if cur.rowcount > 0:
+                    inserted.append(level)
+        return inserted
 
     def update_level_active(
         self,
@@ -141,15 +232,18 @@ class SQLiteStorage:
         interval: str,
         level: Level,
     ) -> None:
-        query = (
-            "UPDATE levels SET active = ?\n"
-            " WHERE symbol = ? AND interval = ?\n"
-            "   AND timestamp = ? AND type = ?"
-        )
-        with self._conn:
-            self._conn.execute(
-                query,
-                (int(level.active), symbol, interval, level.timestamp, level.type),
+        self.update_levels_active(symbol, interval, [level])
+
+    def update_levels_active(
+        self, symbol: str, interval: str, levels: Iterable[Level]
+    ) -> None:
+        with self.transaction():
+            self._conn.executemany(
+                _UPDATE_LEVEL_ACTIVE,
+                (
+                    (int(level.active), symbol, interval, level.timestamp, level.type)
+                    for level in levels
+                ),
             )
 
     def store_signal(self, symbol: str, interval: str, match: SignalMatch) -> bool:
@@ -167,7 +261,7 @@ class SQLiteStorage:
             "     level_timestamp, payload, created_at)\n"
             "    VALUES (?, ?, ?, ?, ?, ?, ?, strftime('%s','now'))"
         )
-        with self._conn:
+        with self.transaction():
             cur = self._conn.execute(
                 query,
                 (
@@ -195,9 +289,18 @@ class SQLiteStorage:
                     high REAL NOT NULL,
                     low REAL NOT NULL,
                     close REAL NOT NULL,
+                    volume REAL NOT NULL DEFAULT 0,
                     PRIMARY KEY (symbol, interval, timestamp)
                 );
 
+                CREATE TABLE IF NOT EXISTS candle_ranges (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    start_ms INTEGER NOT NULL,
+                    end_ms INTEGER NOT NULL,
+                    PRIMARY KEY (symbol, interval, start_ms)
+                );
+
                 CREATE TABLE IF NOT EXISTS levels (
                     symbol TEXT NOT NULL,
                     interval TEXT NOT NULL,
@@ -224,6 +327,221 @@ class SQLiteStorage:
                 );
                 """
             )
+            self._migrate_schema()
+
+    def _migrate_schema(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(candles)")}
+        if "volume" not in columns:
+            # databases from before volume was stored
+            self._conn.execute("ALTER TABLE candles ADD COLUMN volume REAL NOT NULL DEFAULT 0")
+
+
+_CANDLE_COLUMNS = "(symbol, interval, timestamp, datetime, open, high, low, close, volume)"
+_INSERT_CANDLE = (
+    f"INSERT OR IGNORE INTO candles\n    {_CANDLE_COLUMNS}\n"
+    "    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_UPSERT_CANDLE = (
+    f"INSERT OR REPLACE INTO candles\n    {_CANDLE_COLUMNS}\n"
+    "    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_LEVEL = (
+    "INSERT OR IGNORE INTO levels\n"
+    "    (symbol, interval, price, type, timestamp, datetime,\n"
+    "     confirmed_timestamp, confirmed_datetime, active)\n"
+    "    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_UPDATE_LEVEL_ACTIVE = (
+    "UPDATE levels SET active = ?\n"
+    " WHERE symbol = ? AND interval = ?\n"
+    "   AND timestamp = ? AND type = ?"
+)
+
+
+def _candle_row(symbol: str, interval: str, candle: Candle) -> tuple:
+    return (
+        symbol,
+        interval,
+        candle.timestamp,
+        candle.datetime,
+        candle.open,
+        candle.high,
+        candle.low,
+        candle.close,
+        candle.volume,
+    )
+
+
+def _level_row(symbol: str, interval: str, level: Level) -> tuple:
+    return (
+        symbol,
+        interval,
+        level.price,
+        level.type,
+        level.timestamp,
+        level.datetime,
+        level.confirmed_timestamp,
+        level.confirmed_datetime,
+        int(level.active),
+    )
+
+
+class LevelWriteBuffer:
+    """Write-behind buffer for one series' levels.
+
+    New levels and activity changes are collected between flushes; a level
+    is written once with its latest state, and untouched levels not at all.
+    Rows written inside a caller's transaction stay pending until ``clear``,
+    so a rollback does not lose them.
+    """
+
+    def __init__(self) -> None:
+        self._new: dict[tuple[int, str], Level] = {}
+        self._changed: dict[tuple[int, str], Level] = {}
+
+    def __len__(self) -> int:
+        return len(self._new) + len(self._changed)
+
+    def add(self, level: Level) -> None:
+        self._new[(level.timestamp, level.type)] = level
+
+    def mark_changed(self, level: Level) -> None:
+        key = (level.timestamp, level.type)
+        if key not in self._new:
+            # a pending insert already carries the latest state
+            self._changed[key] = level
+
+    def write(self, storage: SQLiteStorage, symbol: str, interval: str) -> list[Level]:
+        """Write pending rows without clearing them; return the newly stored levels."""
+
+        with storage.transaction():
+            inserted = storage.store_levels(symbol, interval, self._new.values())
+            storage.update_levels_active(symbol, interval, self._changed.values())
+        return inserted
+
+    def clear(self) -> None:
+        self._new.clear()
+        self._changed.clear()
+
+    def flush(self, storage: SQLiteStorage, symbol: str, interval: str) -> list[Level]:
+        """Persist pending rows in one transaction and return the newly stored levels."""
+
+        inserted = self.write(storage, symbol, interval)
+        self.clear()
+        return inserted
+
+
+@dataclass(slots=True)
+class _ScheduledSeries:
+    name: str
+    interval_ms: int
+    handler: Callable[[int], bool]
+
+
+class CandleCloseScheduler:
+    """Wakes registered series just after their candles close.
+
+    Each handler receives the close time in milliseconds and returns ``True``
+    once the candle closing then has been handled. Series that close at the
+    same instant are woken together; handlers still waiting for the exchange
+    are retried with a doubling backoff until their own next close. A series
+    still waiting when another series closes is carried into that wakeup.
+    """
+
+    def __init__(
+        self,
+        *,
+        settle_delay: float = 1.0,
+        retry_delay: float = 0.5,
+        max_retry_delay: float = 5.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._settle_delay = settle_delay
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max(max_retry_delay, retry_delay)
+        self._clock = clock
+        self._sleep = sleep
+        self._series: list[_ScheduledSeries] = []
+        # series still waiting for the candle closing at the paired time
+        self._carried: list[tuple[_ScheduledSeries, int]] = []
+
+    def add(self, name: str, interval: str, handler: Callable[[int], bool]) -> None:
+        self._series.append(
+            _ScheduledSeries(name, timeframe_to_milliseconds(interval), handler)
+        )
+
+    def next_close(self, now_ms: int) -> tuple[int, list[str]]:
+        """Return the first close after ``now_ms`` and the series closing then."""
+
+        close_ms, due = self._next_close(now_ms)
+        return close_ms, [series.name for series in due]
+
+    def run_forever(self) -> None:
+        while True:
+            self.run_next()
+
+    def run_next(self) -> list[str]:
+        """Wait for the next close, handle every due series and return those handled."""
+
+        if not self._series:
+            raise ValueError("no series scheduled")
+        close_ms, due = self._next_close(int(self._clock() * 1000))
+        next_wakeup_ms, _ = self._next_close(close_ms)
+        self._sleep_until(close_ms / 1000 + self._settle_delay)
+
+        pending = self._carried + [(series, close_ms) for series in due]
+        self._carried = []
+        handled: list[str] = []
+        delay = self._retry_delay
+        while True:
+            waiting = []
+            for series, series_close_ms in pending:
+                if self._call(series, series_close_ms):
+                    handled.append(series.name)
+                else:
+                    waiting.append((series, series_close_ms))
+            retry_ms = (self._clock() + delay) * 1000
+            pending = []
+            for series, series_close_ms in waiting:
+                if retry_ms >= series_close_ms + series.interval_ms:
+                    logger.warning(
+                        "No closed candle at %s for %s before its next close",
+                        series_close_ms,
+                        series.name,
+                    )
+                else:
+                    pending.append((series, series_close_ms))
+            if not pending:
+                break
+            if retry_ms >= next_wakeup_ms:
+                self._carried = pending
+                break
+            self._sleep(delay)
+            delay = min(delay * 2, self._max_retry_delay)
+        return handled
+
+    def _next_close(self, now_ms: int) -> tuple[int, list[_ScheduledSeries]]:
+        closes = [
+            (now_ms // series.interval_ms + 1) * series.interval_ms for series in self._series
+        ]
+        close_ms = min(closes)
+        return close_ms, [
+            series for series, close in zip(self._series, closes) if close == close_ms
+        ]
+
+    def _sleep_until(self, moment: float) -> None:
+        remaining = moment - self._clock()
+        if remaining > 0:
+            self._sleep(remaining)
+
+    @staticmethod
+    def _call(series: _ScheduledSeries, close_ms: int) -> bool:
+        try:
+            return bool(series.handler(close_ms))
+        except Exception:
+            logger.exception("Error while handling %s close at %s", series.name, close_ms)
+            return False
 
 
 class TelegramNotifier:
@@ -278,37 +596,49 @@ class RealtimeTradingBot:
         self._signals = list(signals or []) or [PriceActionSignalAdapter()]
         self._notifier = TelegramNotifier(config.telegram_token, config.telegram_chat_id)
         self._recent: Deque[Candle] = deque(maxlen=config.history_limit)
+        self._level_writes = LevelWriteBuffer()
+        # matches of the latest candle waiting for its commit, and the last pruned candle
+        self._pending_matches: list[SignalMatch] = []
+        self._pruned_through: int | None = None
         self._last_processed = self._storage.last_candle_timestamp(
             config.symbol, config.interval
         )
         self._timeframe_ms = timeframe_to_milliseconds(config.interval)
 
-    def run_forever(self) -> None:
+    def run_forever(self, scheduler: CandleCloseScheduler | None = None) -> None:
+        """Process each candle right after it closes instead of polling blindly."""
+
+        scheduler = scheduler or CandleCloseScheduler(max_retry_delay=self._config.poll_interval)
+        self.schedule(scheduler)
+        scheduler.run_forever()
+
+    def schedule(self, scheduler: CandleCloseScheduler) -> None:
+        """Load cached history and register this series with ``scheduler``.
+
+        Several bots can share one scheduler so series closing together are
+        handled in the same wakeup.
+        """
+
         logger.info(
             "Starting realtime bot for %s %s", self._config.symbol, self._config.interval
         )
         self._load_recent_history()
-        while True:
-            try:
-                candle = self._fetch_latest_closed_candle()
-            except Exception:
-                logger.exception("Failed to fetch candles")
-                time.sleep(self._config.poll_interval)
-                continue
-
-            if candle is None or (
-                self._last_processed is not None and candle.timestamp <= self._last_processed
-            ):
-                time.sleep(self._config.poll_interval)
-                continue
-
-            try:
-                self._process_candle(candle)
-                self._last_processed = candle.timestamp
-            except Exception:
-                logger.exception("Error while processing candle")
-
-            time.sleep(self._config.poll_interval)
+        scheduler.add(
+            f"{self._config.symbol} {self._config.interval}",
+            self._config.interval,
+            self.process_close,
+        )
+
+    def process_close(self, close_ms: int) -> bool:
+        """Process the candle closing at ``close_ms``; ``False`` until the exchange has it."""
+
+        candle = self._fetch_latest_closed_candle()
+        if candle is None or candle.timestamp + self._timeframe_ms < close_ms:
+            return False
+        if self._last_processed is None or candle.timestamp > self._last_processed:
+            self._process_candle(candle)
+            self._last_processed = candle.timestamp
+        return True
 
     def run_once(self) -> None:
         """Process a single update; useful for testing."""
@@ -328,6 +658,44 @@ class RealtimeTradingBot:
             self._recent.append(candle)
         if self._recent:
             logger.info("Loaded %s candles from cache", len(self._recent))
+            # replay cached history so levels broken earlier stay inactive
+            self._levels.build(cached)
+            for candle in cached:
+                self._levels.prune(candle)
+
+    def _advance(self, candle: Candle) -> None:
+        """Apply ``candle`` to the in-memory state and queue its writes.
+
+        Each step runs once per candle: a retry after a rolled back commit
+        skips the steps an earlier attempt completed.
+        """
+
+        if not self._recent or self._recent[-1].timestamp < candle.timestamp:
+            self._recent.append(candle)
+            if len(self._recent) > self._levels.window:
+                # keep the levels a rebuild from the history window would find:
+                # the pivot candle and its look-back window are still inside it
+                self._levels.evict_before(self._recent[self._levels.window].timestamp)
+            for lvl in self._levels.update(candle):
+                self._level_writes.add(lvl)
+        if self._pruned_through is None or self._pruned_through < candle.timestamp:
+            # evaluate before pruning: the levels this candle touches are the
+            # ones its pattern can trade, and prune deactivates exactly those
+            self._pending_matches = self._evaluate_signals(candle)
+            for lvl in self._levels.prune(candle):
+                self._level_writes.mark_changed(lvl)
+            self._pruned_through = candle.timestamp
+
+    def _evaluate_signals(self, candle: Candle) -> list[SignalMatch]:
+        if len(self._recent) < max(self._config.signal_batch_size, 10):
+            return []
+        active_levels = self._levels.active_levels(candle.timestamp)
+        signal_batch = CandleBatch(list(islice(self._recent, len(self._recent) - 10, None)))
+        return [
+            match
+            for signal in self._signals
+            for match in signal.evaluate(signal_batch, active_levels)
+        ]
 
     def _fetch_latest_closed_candle(self) -> Candle | None:
         batch = self._connector.get_klines(
@@ -346,57 +714,38 @@ class RealtimeTradingBot:
         return latest
 
     def _process_candle(self, candle: Candle) -> None:
-        if not self._storage.store_candle(self._config.symbol, self._config.interval, candle):
-            logger.debug("Candle %s already processed", candle.timestamp)
-            return
-
-        self._recent.append(candle)
-        if len(self._recent) < self._levels.window + self._levels.confirm_forward + 1:
-            logger.debug("Not enough candles for level detection yet")
-            return
-
-        history = list(self._recent)
-        self._levels.build(history)
-
-        # track activation state changes after pruning with the new candle
-        before = {(lvl.timestamp, lvl.type): lvl.active for lvl in self._levels.levels}
-        self._levels.prune(candle)
-
-        for lvl in self._levels.levels:
-            inserted = self._storage.store_level(self._config.symbol, self._config.interval, lvl)
-            if inserted:
+        symbol = self._config.symbol
+        interval = self._config.interval
+        notifications: list[SignalMatch] = []
+        # one commit per candle: the candle, its level changes and its signals
+        with self._storage.transaction():
+            if not self._storage.store_candle(symbol, interval, candle):
+                logger.debug("Candle %s already processed", candle.timestamp)
+                return
+
+            # after a rolled back attempt the level writes and matches are
+            # still pending, so the retry only redoes the database writes
+            self._advance(candle)
+            for lvl in self._level_writes.write(self._storage, symbol, interval):
                 logger.info(
                     "New level %s at %s confirmed at %s",
                     lvl.type,
                     lvl.price,
                     lvl.confirmed_datetime,
                 )
-            if before.get((lvl.timestamp, lvl.type)) != lvl.active:
-                self._storage.update_level_active(
-                    self._config.symbol,
-                    self._config.interval,
-                    lvl,
-                )
 
-        active_levels = self._levels.active_levels(candle.timestamp)
-        if len(history) < self._config.signal_batch_size:
-            return
-        batch_candles = history[-max(self._config.signal_batch_size, 10) :]
-        if len(batch_candles) < 10:
-            return
-        signal_batch = CandleBatch(batch_candles[-10:])
-
-        for signal in self._signals:
-            for match in signal.evaluate(signal_batch, active_levels):
-                if self._storage.store_signal(
-                    self._config.symbol,
-                    self._config.interval,
-                    match,
-                ):
+            for match in self._pending_matches:
+                if self._storage.store_signal(symbol, interval, match):
                     logger.info(
                         "Signal %s %s for candle %s", match.pattern, match.direction, match.candle.timestamp
                     )
-                    self._notifier.send_signal(match, self._config.symbol, self._config.interval)
+                    notifications.append(match)
+
+        self._level_writes.clear()
+        self._pending_matches = []
+        # notify only after the commit so a slow Telegram call never holds the write lock
+        for match in notifications:
+            self._notifier.send_signal(match, symbol, interval)
 
 
 class PriceActionSignalAdapter(Signal):
@@ -0,0 +1,114 @@
+"""Concurrent OHLCV fetching for the live signal scan.
+
+The live bot needs the latest candles of every symbol/timeframe pair right
+after a candle closes. ``fetch_scan_series`` issues those requests through
+ccxt's asyncio client with a bounded number in flight and an exchange-wide
+request budget, and yields each series as soon as it arrives so detection
+does not wait for the slowest one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import ccxt.async_support as ccxt_async
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCAN_CONCURRENCY = 8
+
+
+@dataclass(frozen=True)
+class ScanRequest:
+    symbol: str
+    timeframe: str
+    since: int
+    limit: int
+    params: dict[str, Any] = field(default_factory=dict, compare=False)
+
+
+class AsyncRateBudget:
+    """Spaces requests to one exchange at least ``interval_ms`` apart across tasks."""
+
+    def __init__(self, interval_ms: float) -> None:
+        self._interval_s = max(float(interval_ms), 0.0) / 1000.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        # no await between reading and reserving the slot, so tasks cannot race
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval_s
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def create_async_client(connector) -> Any:
+    """Open a ccxt asyncio client for the same exchange and credentials as ``connector``.
+
+    ccxt's own throttle is disabled; callers pace requests with ``AsyncRateBudget``.
+    """
+
+    client = connector.client
+    exchange_class = getattr(ccxt_async, client.id)
+    return exchange_class(
+        {
+            "apiKey": client.apiKey,
+            "secret": client.secret,
+            "options": dict(client.options),
+            "enableRateLimit": False,
+        }
+    )
+
+
+async def fetch_scan_series(
+    client,
+    requests: Sequence[ScanRequest],
+    *,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    budget: AsyncRateBudget | None = None,
+) -> AsyncIterator[tuple[ScanRequest, list[list[float]]]]:
+    """Yield ``(request, ohlcv)`` pairs in completion order.
+
+    At most ``concurrency`` requests are in flight. A request that fails is
+    logged and skipped so one bad market does not abort the whole scan.
+    """
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if budget is None:
+        budget = AsyncRateBudget(getattr(client, "rateLimit", 0) or 0)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(request: ScanRequest) -> tuple[ScanRequest, list[list[float]] | None]:
+        async with semaphore:
+            await budget.acquire()
+            try:
+                ohlcv = await client.fetch_ohlcv(
+                    request.symbol,
+                    timeframe=request.timeframe,
+                    since=request.since,
+                    limit=request.limit,
+                    params=request.params,
+                )
+            except Exception:
+                logger.exception(
+                    "Failed to fetch %s %s candles", request.symbol, request.timeframe
+                )
+                return request, None
+        return request, ohlcv
+
+    tasks = [asyncio.ensure_future(fetch(request)) for request in requests]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            request, ohlcv = await next_done
+            if ohlcv is not None:
+                yield request, ohlcv
+    finally:
+        for task in tasks:
+            task.cancel()
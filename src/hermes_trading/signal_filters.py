@@ -6,13 +6,24 @@ import math
 from dataclasses import dataclass
 from typing import Iterable, Sequence
 
-from .candles import Candle, CandleBatch
+import numpy as np
+
+from .candles import Candle, CandleBatch, as_candle_series
 from .liquidity import Level
 from .signals import PriceActionSignal, SignalMatch
 from .time_utils import is_candle_freshly_closed
 
 DEFAULT_MIN_METRIC_INCREASE_PCT = 10.0
 
+# metric candle and the two reference candles, as offsets from the signal candle
+METRIC_OFFSETS: dict[str, tuple[int, int, int]] = {
+    "pin_bar": (0, -2, -1),
+    "buy_engulfing": (0, -2, -1),
+    "sell_engulfing": (0, -2, -1),
+    "railway_tracks": (0, -3, -2),
+    "inside_bar": (-1, -3, -2),
+}
+
 
 def latest_fresh_batch(
     candles: Sequence[Candle],
@@ -99,6 +110,83 @@ def latest_matches(
     return results
 
 
+@dataclass(frozen=True)
+class SeriesDetection:
+    """Pattern detected on a series candle together with its metrics."""
+
+    index: int
+    pattern: str
+    direction: str
+    volatility_increase_pct: tuple[float, float]
+    volume_increase_pct: tuple[float, float]
+
+    def filtered_signal(self, match: SignalMatch) -> FilteredSignal:
+        return FilteredSignal(
+            match=match,
+            volatility_increase_pct=self.volatility_increase_pct,
+            volume_increase_pct=self.volume_increase_pct,
+        )
+
+
+def series_detections(
+    candles: Sequence[Candle],
+    *,
+    signal: PriceActionSignal | None = None,
+    patterns: Iterable[str] | None = None,
+    directions: Iterable[str] | None = None,
+    min_metric_increase_pct: float | None = DEFAULT_MIN_METRIC_INCREASE_PCT,
+    context_size: int = 4,
+) -> list[SeriesDetection]:
+    """Detect and measure patterns for every full context batch of a series.
+
+    Matches the sliding-batch path: only candles with ``context_size - 1``
+    predecessors are reported, in candle order. Detections failing the metric
+    gate are dropped unless ``min_metric_increase_pct`` is ``None``.
+    """
+
+    if context_size <= 0:
+        raise ValueError("context_size must be positive")
+
+    series = as_candle_series(candles)
+    detector = signal or PriceActionSignal()
+    indices, found_patterns, found_directions = detector.detect_series(
+        series,
+        patterns=patterns,
+        directions=directions,
+    )
+    in_context = indices >= context_size - 1
+    indices = indices[in_context]
+    found_patterns = found_patterns[in_context]
+    found_directions = found_directions[in_context]
+
+    volatility, volume = series_signal_metrics(series, indices, found_patterns)
+    if min_metric_increase_pct is None:
+        keep = ~np.isnan(volatility).any(axis=1)
+    else:
+        keep = series_metrics_pass(
+            volatility,
+            volume,
+            min_metric_increase_pct=min_metric_increase_pct,
+        )
+
+    return [
+        SeriesDetection(
+            index=idx,
+            pattern=pattern,
+            direction=direction,
+            volatility_increase_pct=(volatility_pair[0], volatility_pair[1]),
+            volume_increase_pct=(volume_pair[0], volume_pair[1]),
+        )
+        for idx, pattern, direction, volatility_pair, volume_pair in zip(
+            indices[keep].tolist(),
+            found_patterns[keep].tolist(),
+            found_directions[keep].tolist(),
+            volatility[keep].tolist(),
+            volume[keep].tolist(),
+        )
+    ]
+
+
 def match_index(match: SignalMatch, batch: CandleBatch) -> int | None:
     return next(
         (idx for idx, candle in enumerate(batch.candles) if candle.timestamp == match.candle.timestamp),
@@ -144,6 +232,80 @@ def reference_candles(match: SignalMatch, batch: CandleBatch) -> list[Candle] |
     return None
 
 
+def percentage_increase_array(
+    pattern_values: np.ndarray,
+    reference_values: np.ndarray,
+) -> np.ndarray:
+    """Vectorized ``percentage_increase`` with the same zero-reference rules."""
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        increase = ((pattern_values - reference_values) / reference_values) * 100.0
+    return np.where(
+        reference_values == 0,
+        np.where(pattern_values == 0, 0.0, math.inf),
+        increase,
+    )
+
+
+def series_signal_metrics(
+    candles: Sequence[Candle],
+    indices: Sequence[int] | np.ndarray,
+    patterns: Sequence[str] | np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return volatility and volume increase pairs for many matches at once.
+
+    ``indices`` are signal candle positions in ``candles`` and ``patterns`` the
+    matching pattern names. Both results have shape ``(len(indices), 2)``; rows
+    with an unknown pattern or missing reference candles are NaN.
+    """
+
+    series = as_candle_series(candles)
+    indices = np.asarray(indices, dtype=np.int64)
+    patterns = np.asarray(patterns)
+    if indices.shape != patterns.shape:
+        raise ValueError("indices and patterns must have the same length")
+
+    volatility = np.full((len(indices), 2), np.nan)
+    volume = np.full((len(indices), 2), np.nan)
+    if len(indices) == 0 or len(series) == 0:
+        return volatility, volume
+
+    offsets = np.zeros((len(indices), 3), dtype=np.int64)
+    known = np.zeros(len(indices), dtype=bool)
+    for pattern, pattern_offsets in METRIC_OFFSETS.items():
+        rows = patterns == pattern
+        offsets[rows] = pattern_offsets
+        known |= rows
+
+    positions = indices[:, None] + offsets
+    valid = known & (positions.min(axis=1) >= 0) & (positions.max(axis=1) < len(series))
+    positions = positions[valid]
+
+    candle_ranges = series.high - series.low
+    volatility[valid] = percentage_increase_array(
+        candle_ranges[positions[:, :1]],
+        candle_ranges[positions[:, 1:]],
+    )
+    volume[valid] = percentage_increase_array(
+        series.volume[positions[:, :1]],
+        series.volume[positions[:, 1:]],
+    )
+    return volatility, volume
+
+
+def series_metrics_pass(
+    volatility_increase_pct: np.ndarray,
+    volume_increase_pct: np.ndarray,
+    *,
+    min_metric_increase_pct: float = DEFAULT_MIN_METRIC_INCREASE_PCT,
+) -> np.ndarray:
+    """Vectorized ``signal_metrics_pass`` over metric pair arrays."""
+
+    return (volatility_increase_pct.min(axis=1) >= min_metric_increase_pct) & (
+        volume_increase_pct.min(axis=1) >= min_metric_increase_pct
+    )
+
+
 def build_filtered_signal(
     match: SignalMatch,
     batch: CandleBatch,
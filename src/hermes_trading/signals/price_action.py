@@ -2,19 +2,99 @@
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Iterable, List, Literal
+from typing import Iterable, List, Literal, Sequence
 
-from ..candles import Candle, CandleBatch
+import numpy as np
+
+from ..candles import Candle, CandleBatch, as_candle_series
 from ..liquidity import Level
 from .base import Signal, SignalMatch
 
 
+# (pattern, direction) pairs in the order ``_detect_patterns`` reports them
+SERIES_PATTERN_ORDER: tuple[tuple[str, Literal["long", "short"]], ...] = (
+    ("pin_bar", "long"),
+    ("pin_bar", "short"),
+    ("buy_engulfing", "long"),
+    ("sell_engulfing", "short"),
+    ("inside_bar", "long"),
+    ("inside_bar", "short"),
+    ("railway_tracks", "long"),
+    ("railway_tracks", "short"),
+)
+
+
 @dataclass
 class PriceActionSignal(Signal):
     """Detects price action patterns within a batch of candles."""
 
     INSIDE_BAR_MIN_BODY_COVERAGE = 0.9
 
+    def detect_series(
+        self,
+        candles: Sequence[Candle],
+        *,
+        patterns: Iterable[str] | None = None,
+        directions: Iterable[str] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Detect patterns on every candle of a series in one vectorized pass.
+
+        Returns ``(index, pattern, direction)`` arrays sorted by candle index and,
+        for the same candle, in the order ``evaluate_without_levels`` reports
+        them. Each candle sees the same history as the last bar of a batch, so
+        two- and three-bar patterns start at indices 1 and 2.
+        """
+
+        series = as_candle_series(candles)
+        allowed_patterns = set(patterns) if patterns is not None else None
+        allowed_directions = set(directions) if directions is not None else None
+
+        index_parts: list[np.ndarray] = []
+        code_parts: list[np.ndarray] = []
+        for code, mask in enumerate(self._series_masks(series)):
+            pattern, direction = SERIES_PATTERN_ORDER[code]
+            if allowed_patterns is not None and pattern not in allowed_patterns:
+                continue
+            if allowed_directions is not None and direction not in allowed_directions:
+                continue
+            matched = np.flatnonzero(mask)
+            index_parts.append(matched)
+            code_parts.append(np.full(matched.shape, code, dtype=np.int8))
+
+        if not index_parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, np.empty(0, dtype="<U14"), np.empty(0, dtype="<U5")
+
+        indices = np.concatenate(index_parts).astype(np.int64, copy=False)
+        codes = np.concatenate(code_parts)
+        order = np.lexsort((codes, indices))
+        indices = indices[order]
+        codes = codes[order]
+        pattern_names = np.array([pattern for pattern, _ in SERIES_PATTERN_ORDER])
+        direction_names = np.array([direction for _, direction in SERIES_PATTERN_ORDER])
+        return indices, pattern_names[codes], direction_names[codes]
+
+    def level_matches(
+        self,
+        pattern: str,
+        direction: Literal["long", "short"],
+        candle: Candle,
+        levels: Iterable[Level],
+    ) -> List[SignalMatch]:
+        """Pair a detected pattern with the actionable levels ``candle`` touches."""
+
+        level_type = "low" if direction == "long" else "high"
+        return self._build_matches(
+            pattern,
+            direction,
+            candle,
+            [
+                lvl
+                for lvl in levels
+                if lvl.type == level_type and self._level_is_actionable(lvl, candle)
+            ],
+        )
+
     def evaluate_without_levels(self, candles: CandleBatch) -> List[SignalMatch]:
         matches: List[SignalMatch] = []
         bars = candles.candles
@@ -121,6 +201,102 @@ class PriceActionSignal(Signal):
 
         return matches
 
+    @classmethod
+    def _series_masks(cls, series) -> list[np.ndarray]:
+        """Return per-candle masks aligned with ``SERIES_PATTERN_ORDER``."""
+
+        o, h, l, c = series.open, series.high, series.low, series.close
+        n = len(series)
+        body = np.abs(c - o)
+        rng = h - l
+        body_low = np.minimum(o, c)
+        body_high = np.maximum(o, c)
+        lower_wick = body_low - l
+        upper_wick = h - body_high
+        bullish = c > o
+        bearish = c < o
+
+        small_body = body < rng * 0.3
+        buy_pin = small_body & (lower_wick > body * 2) & (upper_wick < lower_wick * 0.5)
+        sell_pin = small_body & (upper_wick > body * 2) & (lower_wick < upper_wick * 0.5)
+
+        buy_engulfing = np.zeros(n, dtype=bool)
+        sell_engulfing = np.zeros(n, dtype=bool)
+        buy_inside = np.zeros(n, dtype=bool)
+        sell_inside = np.zeros(n, dtype=bool)
+        railway_long = np.zeros(n, dtype=bool)
+        railway_short = np.zeros(n, dtype=bool)
+
+        if n >= 2:
+            engulfs_prev = (body_low[1:] < body_low[:-1]) & (body_high[1:] > body_high[:-1])
+            buy_engulfing[1:] = bullish[1:] & bearish[:-1] & engulfs_prev
+            sell_engulfing[1:] = bearish[1:] & bullish[:-1] & engulfs_prev
+
+            mother_body = body_high[:-1] - body_low[:-1]
+            current_body = body_high[1:] - body_low[1:]
+            inside = (
+                (mother_body > 0)
+                & (current_body > 0)
+                & (body_low[1:] >= body_low[:-1])
+                & (body_high[1:] <= body_high[:-1])
+                & (current_body >= mother_body * cls.INSIDE_BAR_MIN_BODY_COVERAGE)
+            )
+            buy_inside[1:] = bearish[:-1] & bullish[1:] & inside
+            sell_inside[1:] = bullish[:-1] & bearish[1:] & inside
+
+            prev_open, prev_close = o[:-1], c[:-1]
+            curr_open, curr_close = o[1:], c[1:]
+            railway_long[1:] = bearish[:-1] & bullish[1:] & cls._railway_tracks_mask(
+                prev_open - prev_close,
+                curr_close - curr_open,
+                curr_open - prev_close,
+                curr_close - prev_open,
+            )
+            railway_short[1:] = bullish[:-1] & bearish[1:] & cls._railway_tracks_mask(
+                prev_close - prev_open,
+                curr_open - curr_close,
+                curr_open - prev_close,
+                curr_close - prev_open,
+            )
+
+        if n >= 3:
+            engulfs_two = (
+                (body_low[2:] < np.minimum(body_low[1:-1], body_low[:-2]))
+                & (body_high[2:] > np.maximum(body_high[1:-1], body_high[:-2]))
+            )
+            buy_engulfing[2:] |= bullish[2:] & bearish[1:-1] & bearish[:-2] & engulfs_two
+            sell_engulfing[2:] |= bearish[2:] & bullish[1:-1] & bullish[:-2] & engulfs_two
+
+        return [
+            buy_pin,
+            sell_pin,
+            buy_engulfing,
+            sell_engulfing,
+            buy_inside,
+            sell_inside,
+            railway_long,
+            railway_short,
+        ]
+
+    @staticmethod
+    def _railway_tracks_mask(
+        body1: np.ndarray,
+        body2: np.ndarray,
+        open_gap: np.ndarray,
+        close_gap: np.ndarray,
+    ) -> np.ndarray:
+        max_body = np.maximum(body1, body2)
+        valid = (body1 > 0) & (body2 > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similar = np.abs(body1 - body2) / max_body < 0.2
+        tolerance = max_body * 0.2
+        return (
+            valid
+            & similar
+            & (np.abs(open_gap) <= tolerance)
+            & (np.abs(close_gap) <= tolerance)
+        )
+
     @staticmethod
     def _build_matches(
         pattern: str,
@@ -6,21 +6,28 @@ import argparse
 from bisect import bisect_left
 import json
 from collections import Counter
-from dataclasses import asdict, dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, time, timezone
 from itertools import product
 from pathlib import Path
-from typing import Sequence
+from typing import Callable, Iterator, Sequence, TypeVar
 
-from .backtest.data_loader import create_connector, fetch_historical_candles
-from .candles import Candle, CandleBatch
-from .liquidity import Level, LiquidityLevels
-from .market_context import SignalMarketContext, build_signal_market_context
+import numpy as np
+
+from .backtest.candle_cache import CandleCache
+from .backtest.data_loader import create_connector, fetch_historical_series_batch
+from .backtest.first_passage import FirstPassageIndex
+from .candles import Candle, CandleSeries, as_candle_series
+from .liquidity import LiquidityLevels
+from .market_context import MarketContextIndex, SignalMarketContext, build_signal_market_context
 from .signal_filters import (
     DEFAULT_MIN_METRIC_INCREASE_PCT,
     FilteredSignal,
-    filtered_latest_matches,
+    SeriesDetection,
+    series_detections,
 )
+from .signals import PriceActionSignal, SignalMatch
 from .time_utils import (
     MADRID_TIMEZONE,
     is_candle_closed,
@@ -48,6 +55,14 @@ DEFAULT_PATTERNS = (
     "inside_bar",
 )
 DEFAULT_OUTPUT_PATH = Path(__file__).resolve().parents[1] / "signals_bot_backtest_results.json"
+RUNTIME_CONFIG_FIELDS = ("cache_dir", "fetch_workers", "workers", "trades_format")
+TRADES_FORMATS = ("json", "ndjson")
+HIGHER_TIMEFRAME_BIASES = ("bullish", "bearish", "neutral", "none")
+VOLATILITY_REGIMES = ("compressed", "normal", "expanded", "none")
+_SeriesResult = TypeVar("_SeriesResult")
+
+# post-entry bars resolved from running extremes before using the first-passage index
+_GRID_WINDOW = 64
 
 
 @dataclass(frozen=True)
@@ -78,6 +93,10 @@ class SignalBotBacktestConfig:
     normalized_date_to_madrid: str
     normalized_date_from_utc: str
     normalized_date_to_utc: str
+    cache_dir: str | None = None
+    fetch_workers: int = 4
+    workers: int = 1
+    trades_format: str = "json"
 
 
 @dataclass(frozen=True)
@@ -261,9 +280,11 @@ class SignalBotBacktestResult:
     series: list[SignalBotSeriesStats]
     trades: list[SignalBotBacktestTrade]
     variant_trades: dict[str, list[SignalBotBacktestTrade]] | None
+    # NDJSON trade files by variant key when trades were streamed to disk
+    trade_files: dict[str, str] | None = None
 
 
-def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--exchange", default="binance")
     parser.add_argument("--symbols", nargs="+", default=list(DEFAULT_SYMBOLS))
@@ -271,6 +292,22 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--date-from", required=True)
     parser.add_argument("--date-to", required=True)
     parser.add_argument("--fetch-limit", type=int, default=1000)
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for the on-disk candle cache; only missing ranges are downloaded.",
+    )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=4,
+        help="Concurrent history page requests, bounded by the exchange rate limit.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to backtest symbol/timeframe series in parallel.",
+    )
     parser.add_argument("--patterns", nargs="+", default=list(DEFAULT_PATTERNS))
     parser.add_argument(
         "--min-metric-increase-pct",
@@ -293,7 +330,20 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--compare-stop-range", nargs=3, type=float)
     parser.add_argument("--save-all-variant-trades", action="store_true")
     parser.add_argument("--output-file", default=str(DEFAULT_OUTPUT_PATH))
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--trades-format",
+        choices=TRADES_FORMATS,
+        default="json",
+        help=(
+            "json keeps trades in the output file; ndjson streams them to "
+            "per-variant files while the backtest runs."
+        ),
+    )
+    return parser
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    return build_parser().parse_args(argv)
 
 
 def _parse_cli_datetime(value: str, *, is_end: bool) -> datetime:
@@ -450,6 +500,13 @@ def _normalize_optional_non_negative(
     return current
 
 
+def _normalize_positive_int(value: int, *, label: str) -> int:
+    current = int(value)
+    if current <= 0:
+        raise ValueError(f"{label} must be positive")
+    return current
+
+
 def build_config(args: argparse.Namespace) -> SignalBotBacktestConfig:
     start_dt, end_dt = normalize_date_range(args.date_from, args.date_to)
     take_multiple, take_multiples = normalize_take_multiples(
@@ -477,12 +534,12 @@ def build_config(args: argparse.Namespace) -> SignalBotBacktestConfig:
         allowed_higher_timeframe_biases=_normalize_optional_choices(
             args.allowed_higher_timeframe_biases,
             label="allowed_higher_timeframe_biases",
-            allowed_values={"bullish", "bearish", "neutral", "none"},
+            allowed_values=set(HIGHER_TIMEFRAME_BIASES),
         ),
         allowed_volatility_regimes=_normalize_optional_choices(
             args.allowed_volatility_regimes,
             label="allowed_volatility_regimes",
-            allowed_values={"compressed", "normal", "expanded", "none"},
+            allowed_values=set(VOLATILITY_REGIMES),
         ),
         min_distance_to_recent_low_pct=_normalize_optional_non_negative(
             args.min_distance_to_recent_low_pct,
@@ -507,6 +564,10 @@ def build_config(args: argparse.Namespace) -> SignalBotBacktestConfig:
         normalized_date_to_madrid=end_dt.isoformat(),
         normalized_date_from_utc=start_dt.astimezone(timezone.utc).isoformat(),
         normalized_date_to_utc=end_dt.astimezone(timezone.utc).isoformat(),
+        cache_dir=str(args.cache_dir) if getattr(args, "cache_dir", None) else None,
+        fetch_workers=_normalize_positive_int(getattr(args, "fetch_workers", 4), label="fetch_workers"),
+        workers=_normalize_positive_int(getattr(args, "workers", 1), label="workers"),
+        trades_format=str(getattr(args, "trades_format", "json")),
     )
 
 
@@ -531,31 +592,59 @@ def collect_filtered_signals(
         if levels_state is None:
             active_levels_state.build(list(candles))
 
+    detector = PriceActionSignal()
+    detections_by_index: dict[int, list[SeriesDetection]] = {}
+    for detection in series_detections(
+        candles,
+        signal=detector,
+        patterns=patterns,
+        min_metric_increase_pct=min_metric_increase_pct,
+    ):
+        detections_by_index.setdefault(detection.index, []).append(detection)
+    candidate_indices = range(3, len(candles)) if use_levels else sorted(detections_by_index)
+
     signals: list[DetectedSignal] = []
-    for idx in range(3, len(candles)):
-        current_candle = candles[idx]
-        batch = CandleBatch(list(candles[idx - 3: idx + 1]))
-        active_levels: list[Level] | None = None
-        if use_levels and active_levels_state is not None:
-            active_levels = [
-                level
-                for level in active_levels_state.active_levels(current_candle.timestamp)
-                if level.weight >= min_level_weight
-            ]
-        for filtered in filtered_latest_matches(
-            batch,
-            patterns=patterns,
-            min_metric_increase_pct=min_metric_increase_pct,
-            levels=active_levels,
-        ):
-            signals.append(
-                DetectedSignal(
-                    filtered_signal=filtered,
-                    candle_index=idx,
+    for idx in candidate_indices:
+        detected = detections_by_index.get(idx)
+        if detected:
+            current_candle = candles[idx]
+            if use_levels and active_levels_state is not None:
+                touched_levels = active_levels_state.touched_levels(
+                    current_candle,
+                    min_weight=min_level_weight,
+                )
+                matches = [
+                    (detection, match)
+                    for detection in detected
+                    for match in detector.level_matches(
+                        detection.pattern,
+                        detection.direction,
+                        current_candle,
+                        touched_levels,
+                    )
+                ]
+            else:
+                matches = [
+                    (
+                        detection,
+                        SignalMatch(
+                            pattern=detection.pattern,
+                            direction=detection.direction,
+                            candle=current_candle,
+                            level=None,
+                        ),
+                    )
+                    for detection in detected
+                ]
+            for detection, match in matches:
+                signals.append(
+                    DetectedSignal(
+                        filtered_signal=detection.filtered_signal(match),
+                        candle_index=idx,
+                    )
                 )
-            )
         if use_levels and active_levels_state is not None:
-            active_levels_state.prune(current_candle)
+            active_levels_state.prune(candles[idx])
     return signals
 
 
@@ -669,36 +758,6 @@ def _pct_of_price(value: float, price: float) -> float:
     return (value / price) * 100 if price else 0.0
 
 
-def _profit_factor(trades: Sequence[SignalBotBacktestTrade]) -> float | None:
-    positive_pnl = sum(trade.pnl_r for trade in trades if trade.pnl_r > 0)
-    negative_pnl = sum(trade.pnl_r for trade in trades if trade.pnl_r < 0)
-    if negative_pnl < 0:
-        return positive_pnl / abs(negative_pnl)
-    if positive_pnl > 0:
-        return float("inf")
-    return None
-
-
-def _max_equity_drawdown_r(trades: Sequence[SignalBotBacktestTrade]) -> float:
-    equity = 0.0
-    peak = 0.0
-    max_drawdown = 0.0
-    for trade in sorted(
-        trades,
-        key=lambda trade: (
-            trade.entry_timestamp,
-            trade.signal_timestamp,
-            trade.symbol,
-            trade.timeframe,
-            trade.pattern,
-        ),
-    ):
-        equity += trade.pnl_r
-        peak = max(peak, equity)
-        max_drawdown = max(max_drawdown, peak - equity)
-    return max_drawdown
-
-
 def build_variant_keys(config: SignalBotBacktestConfig) -> list[tuple[float, float]]:
     variant_keys = list(
         product(
@@ -734,8 +793,11 @@ def find_entry_candle_index(
 ) -> int | None:
     if not candles:
         return None
-    timestamps = [candle.timestamp for candle in candles]
-    index = bisect_left(timestamps, signal_available_at_timestamp)
+    if isinstance(candles, CandleSeries):
+        index = int(np.searchsorted(candles.timestamp, signal_available_at_timestamp, side="left"))
+    else:
+        timestamps = [candle.timestamp for candle in candles]
+        index = bisect_left(timestamps, signal_available_at_timestamp)
     if index >= len(candles):
         return None
     return index
@@ -804,10 +866,43 @@ def simulate_trade(
     take_multiple: float = 1.0,
     stop_multiple: float = 1.0,
 ) -> SignalBotBacktestTrade | None:
-    if take_multiple <= 0:
-        raise ValueError("take_multiple must be positive")
-    if stop_multiple <= 0:
-        raise ValueError("stop_multiple must be positive")
+    (trade,) = simulate_trade_grid(
+        detected_signal,
+        candles,
+        execution_candles=execution_candles,
+        execution_timeframe=execution_timeframe,
+        entry_context=entry_context,
+        market_context=market_context,
+        variant_keys=((take_multiple, stop_multiple),),
+    )
+    return trade
+
+
+def simulate_trade_grid(
+    detected_signal: DetectedSignal,
+    candles: Sequence[Candle],
+    *,
+    execution_candles: Sequence[Candle] | None = None,
+    execution_timeframe: str | None = None,
+    entry_context: EntryContext | None = None,
+    market_context: SignalMarketContext | None = None,
+    variant_keys: Sequence[tuple[float, float]],
+    passage_index: FirstPassageIndex | None = None,
+) -> list[SignalBotBacktestTrade | None]:
+    """Simulate every ``(take_multiple, stop_multiple)`` variant of one signal.
+
+    Each variant's exit is the first bar touching its stop or take, found by
+    first-passage searches over the post-entry path; excursions are the path
+    extremes up to that bar. ``passage_index`` may be prebuilt over the
+    tracking candles to share it between signals. Results line up with
+    ``variant_keys``; ``None`` marks invalid risk.
+    """
+
+    for take_multiple, stop_multiple in variant_keys:
+        if take_multiple <= 0:
+            raise ValueError("take_multiple must be positive")
+        if stop_multiple <= 0:
+            raise ValueError("stop_multiple must be positive")
 
     filtered = detected_signal.filtered_signal
     match = filtered.match
@@ -819,86 +914,204 @@ def simulate_trade(
         execution_timeframe=execution_timeframe,
     )
     if entry_context is None:
-        return None
+        return [None] * len(variant_keys)
 
     entry_price = entry_context.entry_price
-
-    if match.direction == "long":
+    is_long = match.direction == "long"
+    if is_long:
         signal_risk_per_unit = entry_price - float(signal_candle.low)
-        risk_per_unit = signal_risk_per_unit * stop_multiple
-        stop_price = entry_price - risk_per_unit
-        take_price = entry_price + (signal_risk_per_unit * take_multiple)
     else:
         signal_risk_per_unit = float(signal_candle.high) - entry_price
+    if signal_risk_per_unit <= 0:
+        return [None] * len(variant_keys)
+
+    variants: list[tuple[float, float, float, float, float]] = []
+    for take_multiple, stop_multiple in variant_keys:
         risk_per_unit = signal_risk_per_unit * stop_multiple
-        stop_price = entry_price + risk_per_unit
-        take_price = entry_price - (signal_risk_per_unit * take_multiple)
+        if is_long:
+            stop_price = entry_price - risk_per_unit
+            take_price = entry_price + (signal_risk_per_unit * take_multiple)
+        else:
+            stop_price = entry_price + risk_per_unit
+            take_price = entry_price - (signal_risk_per_unit * take_multiple)
+        variants.append((take_multiple, stop_multiple, risk_per_unit, stop_price, take_price))
+
+    tracking_candles = as_candle_series(
+        execution_candles if entry_context.entry_source == "execution_timeframe_open" else candles
+    )
+    path = _TradePath(
+        tracking_candles,
+        entry_context.tracking_start_index,
+        passage_index or FirstPassageIndex.from_candles(tracking_candles),
+    )
 
-    if signal_risk_per_unit <= 0 or risk_per_unit <= 0:
-        return None
+    shared = _shared_trade_fields(
+        detected_signal,
+        candles,
+        entry_context=entry_context,
+        market_context=market_context,
+        signal_risk_per_unit=signal_risk_per_unit,
+    )
+    first_at_most: dict[float, int] = {}
+    first_at_least: dict[float, int] = {}
+    trades: list[SignalBotBacktestTrade | None] = []
+    for take_multiple, stop_multiple, risk_per_unit, stop_price, take_price in variants:
+        if risk_per_unit <= 0:
+            trades.append(None)
+            continue
 
-    max_drawdown_abs = 0.0
-    max_profit_abs = 0.0
-    intrabar_conflict = False
-    intrabar_conflict_reason: str | None = None
+        # stop prices repeat across take multiples, so searches are memoized per price
+        if is_long:
+            stop_at = _memoized(first_at_most, stop_price, path.first_low_at_most)
+            take_at = _memoized(first_at_least, take_price, path.first_high_at_least)
+        else:
+            stop_at = _memoized(first_at_least, stop_price, path.first_high_at_least)
+            take_at = _memoized(first_at_most, take_price, path.first_low_at_most)
+
+        intrabar_conflict = False
+        intrabar_conflict_reason: str | None = None
+        exit_index = min(stop_at, take_at)
+        if exit_index < path.end:
+            exit_timestamp = int(tracking_candles.timestamp[exit_index])
+            exit_datetime = tracking_candles.datetime_at(exit_index)
+            if stop_at == take_at:
+                intrabar_conflict = True
+                intrabar_conflict_reason = "stop_and_take_hit_same_candle"
+            if stop_at <= take_at:
+                exit_price = stop_price
+                exit_reason = "stop_loss"
+            else:
+                exit_price = take_price
+                exit_reason = "take_profit"
+        elif path.end > path.start:
+            exit_index = path.end - 1
+            exit_timestamp = int(tracking_candles.timestamp[exit_index])
+            exit_datetime = tracking_candles.datetime_at(exit_index)
+            exit_price = float(tracking_candles.close[exit_index])
+            exit_reason = "end_of_data"
+        else:
+            exit_index = entry_context.bars_reference_index
+            exit_timestamp = entry_context.entry_timestamp
+            exit_datetime = entry_context.entry_datetime
+            exit_price = entry_price
+            exit_reason = "end_of_data"
+
+        if path.end > path.start:
+            lowest = path.lowest_through(exit_index)
+            highest = path.highest_through(exit_index)
+            if is_long:
+                max_drawdown_abs = max(entry_price - lowest, 0.0)
+                max_profit_abs = max(highest - entry_price, 0.0)
+            else:
+                max_drawdown_abs = max(highest - entry_price, 0.0)
+                max_profit_abs = max(entry_price - lowest, 0.0)
+        else:
+            max_drawdown_abs = 0.0
+            max_profit_abs = 0.0
+
+        pnl_abs = _pnl_abs(match.direction, entry_price, exit_price)
+        pnl_r = pnl_abs / risk_per_unit if risk_per_unit else 0.0
+        trades.append(
+            SignalBotBacktestTrade(
+                **shared,
+                take_multiple=take_multiple,
+                stop_multiple=stop_multiple,
+                rr_ratio=(take_multiple / stop_multiple) if stop_multiple else 0.0,
+                stop_price=stop_price,
+                take_price=take_price,
+                risk_per_unit=risk_per_unit,
+                risk_pct_from_entry=_pct_of_price(risk_per_unit, entry_price),
+                exit_timestamp=exit_timestamp,
+                exit_datetime=exit_datetime,
+                closed_at=exit_datetime,
+                exit_price=exit_price,
+                exit_reason=exit_reason,
+                result=_classify_result(pnl_r),
+                pnl_abs=pnl_abs,
+                pnl_pct=(pnl_abs / entry_price) * 100 if entry_price else 0.0,
+                pnl_r=pnl_r,
+                pnl_signal_r=pnl_abs / signal_risk_per_unit if signal_risk_per_unit else 0.0,
+                bars_in_trade=max(exit_index - entry_context.bars_reference_index, 0),
+                duration_minutes=max((exit_timestamp - entry_context.entry_timestamp) / 60000.0, 0.0),
+                max_drawdown_abs=max_drawdown_abs,
+                max_drawdown_pct=(max_drawdown_abs / entry_price) * 100 if entry_price else 0.0,
+                max_drawdown_r=max_drawdown_abs / risk_per_unit if risk_per_unit else 0.0,
+                max_drawdown_signal_r=(
+                    max_drawdown_abs / signal_risk_per_unit if signal_risk_per_unit else 0.0
+                ),
+                max_profit_abs=max_profit_abs,
+                max_profit_pct=(max_profit_abs / entry_price) * 100 if entry_price else 0.0,
+                max_profit_r=max_profit_abs / risk_per_unit if risk_per_unit else 0.0,
+                max_profit_signal_r=(
+                    max_profit_abs / signal_risk_per_unit if signal_risk_per_unit else 0.0
+                ),
+                intrabar_conflict=intrabar_conflict,
+                intrabar_conflict_reason=intrabar_conflict_reason,
+            )
+        )
+    return trades
 
-    tracking_candles = execution_candles if entry_context.entry_source == "execution_timeframe_open" else candles
 
-    exit_timestamp = entry_context.entry_timestamp
-    exit_datetime = entry_context.entry_datetime
-    exit_price = entry_price
-    exit_reason = "end_of_data"
-    exit_index = entry_context.bars_reference_index
+class _TradePath:
+    """Post-entry bars of one trade, searched for stop/take first passages.
 
-    for candle_index in range(entry_context.tracking_start_index, len(tracking_candles)):
-        candle = tracking_candles[candle_index]
-        max_drawdown_abs = max(
-            max_drawdown_abs,
-            _adverse_abs(match.direction, entry_price, candle),
-        )
-        max_profit_abs = max(
-            max_profit_abs,
-            _favorable_abs(match.direction, entry_price, candle),
-        )
+    Most exits land within a few bars, so a short prefix of running extremes
+    answers them with a binary search; far targets fall through to the
+    ``FirstPassageIndex`` built over the whole tracking series.
+    """
+
+    def __init__(self, candles: CandleSeries, start: int, index: FirstPassageIndex) -> None:
+        self.start = start
+        self.end = len(candles)
+        self._index = index
+        self._prefix_end = min(self.end, start + _GRID_WINDOW)
+        self._running_low = np.minimum.accumulate(candles.low[start:self._prefix_end])
+        self._running_high = np.maximum.accumulate(candles.high[start:self._prefix_end])
+
+    def first_low_at_most(self, price: float) -> int:
+        offset = int(np.searchsorted(-self._running_low, -price, side="left"))
+        if self.start + offset < self._prefix_end:
+            return self.start + offset
+        return self._index.first_low_at_most(self._prefix_end, price)
+
+    def first_high_at_least(self, price: float) -> int:
+        offset = int(np.searchsorted(self._running_high, price, side="left"))
+        if self.start + offset < self._prefix_end:
+            return self.start + offset
+        return self._index.first_high_at_least(self._prefix_end, price)
+
+    def lowest_through(self, index: int) -> float:
+        if index < self._prefix_end:
+            return float(self._running_low[index - self.start])
+        return min(float(self._running_low[-1]), self._index.min_low(self._prefix_end, index + 1))
+
+    def highest_through(self, index: int) -> float:
+        if index < self._prefix_end:
+            return float(self._running_high[index - self.start])
+        return max(float(self._running_high[-1]), self._index.max_high(self._prefix_end, index + 1))
+
+
+def _memoized(cache: dict[float, int], price: float, search) -> int:
+    found = cache.get(price)
+    if found is None:
+        found = cache[price] = search(price)
+    return found
+
+
+def _shared_trade_fields(
+    detected_signal: DetectedSignal,
+    candles: Sequence[Candle],
+    *,
+    entry_context: EntryContext,
+    market_context: SignalMarketContext | None,
+    signal_risk_per_unit: float,
+) -> dict[str, object]:
+    """Trade fields that do not depend on the take/stop variant."""
 
-        stop_hit = _stop_hit(match.direction, stop_price, candle)
-        take_hit = _take_hit(match.direction, take_price, candle)
-
-        if stop_hit and take_hit:
-            intrabar_conflict = True
-            intrabar_conflict_reason = "stop_and_take_hit_same_candle"
-            exit_timestamp = candle.timestamp
-            exit_datetime = candle.datetime
-            exit_price = stop_price
-            exit_reason = "stop_loss"
-            exit_index = candle_index
-            break
-
-        if stop_hit:
-            exit_timestamp = candle.timestamp
-            exit_datetime = candle.datetime
-            exit_price = stop_price
-            exit_reason = "stop_loss"
-            exit_index = candle_index
-            break
-
-        if take_hit:
-            exit_timestamp = candle.timestamp
-            exit_datetime = candle.datetime
-            exit_price = take_price
-            exit_reason = "take_profit"
-            exit_index = candle_index
-            break
-
-        exit_timestamp = candle.timestamp
-        exit_datetime = candle.datetime
-        exit_price = float(candle.close)
-        exit_index = candle_index
-
-    pnl_abs = _pnl_abs(match.direction, entry_price, exit_price)
-    pnl_pct = (pnl_abs / entry_price) * 100 if entry_price else 0.0
-    pnl_r = pnl_abs / risk_per_unit if risk_per_unit else 0.0
-    pnl_signal_r = pnl_abs / signal_risk_per_unit if signal_risk_per_unit else 0.0
+    filtered = detected_signal.filtered_signal
+    match = filtered.match
+    signal_candle = match.candle
+    entry_price = entry_context.entry_price
     signal_hour, signal_weekday, signal_weekday_name = _signal_parts(signal_candle.datetime)
     signal_range_abs = _signal_range_abs(signal_candle)
     signal_body_abs = _signal_body_abs(signal_candle)
@@ -915,7 +1128,7 @@ def simulate_trade(
         else None
     )
 
-    return SignalBotBacktestTrade(
+    return dict(
         symbol=signal_candle.symbol or "",
         timeframe=signal_candle.timeframe or "",
         signal_timeframe=signal_candle.timeframe or "",
@@ -993,49 +1206,146 @@ def simulate_trade(
         ),
         signal_available_at_timestamp=entry_context.signal_available_at_timestamp,
         signal_available_at=entry_context.signal_available_at,
-        take_multiple=take_multiple,
-        stop_multiple=stop_multiple,
-        rr_ratio=(take_multiple / stop_multiple) if stop_multiple else 0.0,
         entry_timestamp=entry_context.entry_timestamp,
         entry_datetime=entry_context.entry_datetime,
         entry_source=entry_context.entry_source,
         signal_to_entry_minutes=entry_context.signal_to_entry_minutes,
         entry_price=entry_price,
-        stop_price=stop_price,
-        take_price=take_price,
         signal_risk_per_unit=signal_risk_per_unit,
-        risk_per_unit=risk_per_unit,
-        risk_pct_from_entry=_pct_of_price(risk_per_unit, entry_price),
         signal_risk_pct_from_entry=_pct_of_price(signal_risk_per_unit, entry_price),
-        exit_timestamp=exit_timestamp,
-        exit_datetime=exit_datetime,
-        closed_at=exit_datetime,
-        exit_price=exit_price,
-        exit_reason=exit_reason,
-        result=_classify_result(pnl_r),
-        pnl_abs=pnl_abs,
-        pnl_pct=pnl_pct,
-        pnl_r=pnl_r,
-        pnl_signal_r=pnl_signal_r,
-        bars_in_trade=max(exit_index - entry_context.bars_reference_index, 0),
-        duration_minutes=max((exit_timestamp - entry_context.entry_timestamp) / 60000.0, 0.0),
-        max_drawdown_abs=max_drawdown_abs,
-        max_drawdown_pct=(max_drawdown_abs / entry_price) * 100 if entry_price else 0.0,
-        max_drawdown_r=max_drawdown_abs / risk_per_unit if risk_per_unit else 0.0,
-        max_drawdown_signal_r=(
-            max_drawdown_abs / signal_risk_per_unit if signal_risk_per_unit else 0.0
-        ),
-        max_profit_abs=max_profit_abs,
-        max_profit_pct=(max_profit_abs / entry_price) * 100 if entry_price else 0.0,
-        max_profit_r=max_profit_abs / risk_per_unit if risk_per_unit else 0.0,
-        max_profit_signal_r=(
-            max_profit_abs / signal_risk_per_unit if signal_risk_per_unit else 0.0
-        ),
-        intrabar_conflict=intrabar_conflict,
-        intrabar_conflict_reason=intrabar_conflict_reason,
     )
 
 
+def _trade_order_key(trade: SignalBotBacktestTrade) -> tuple[int, int, str, str, str]:
+    return (
+        trade.entry_timestamp,
+        trade.signal_timestamp,
+        trade.symbol,
+        trade.timeframe,
+        trade.pattern,
+    )
+
+
+class _SummaryAccumulator:
+    """Running totals behind ``build_summary`` for trades seen one at a time.
+
+    Only counters and ``(order key, pnl_r)`` pairs for the equity curve are
+    kept, so summaries can be built without holding the trades themselves.
+    Trades added in the same order give exactly the ``build_summary`` result.
+    """
+
+    def __init__(self) -> None:
+        self.total_trades_opened = 0
+        self.wins = 0
+        self.losses = 0
+        self.breakevens = 0
+        self.end_of_data_closes = 0
+        self.intrabar_conflicts = 0
+        # int starts like sum(), so an empty run still reports 0
+        self.total_pnl_r = 0
+        self.total_pnl_signal_r = 0
+        self.positive_pnl_r = 0
+        self.negative_pnl_r = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.total_max_drawdown_r = 0
+        self.total_max_profit_r = 0
+        self.counts_by_pattern: Counter[str] = Counter()
+        self.counts_by_symbol: Counter[str] = Counter()
+        self.counts_by_timeframe: Counter[str] = Counter()
+        self.counts_by_level_weight: Counter[str] = Counter()
+        self.counts_by_level_type: Counter[str] = Counter()
+        self.equity_points: list[tuple[tuple[int, int, str, str, str], float]] = []
+
+    def add(self, trade: SignalBotBacktestTrade) -> None:
+        self.total_trades_opened += 1
+        if trade.result == "win":
+            self.wins += 1
+        elif trade.result == "loss":
+            self.losses += 1
+        elif trade.result == "breakeven":
+            self.breakevens += 1
+        if trade.exit_reason == "end_of_data":
+            self.end_of_data_closes += 1
+        if trade.intrabar_conflict:
+            self.intrabar_conflicts += 1
+        self.total_pnl_r += trade.pnl_r
+        self.total_pnl_signal_r += trade.pnl_signal_r
+        if trade.pnl_r > 0:
+            self.positive_pnl_r += trade.pnl_r
+            self.winning_trades += 1
+        elif trade.pnl_r < 0:
+            self.negative_pnl_r += trade.pnl_r
+            self.losing_trades += 1
+        self.total_max_drawdown_r += trade.max_drawdown_r
+        self.total_max_profit_r += trade.max_profit_r
+        self.counts_by_pattern[trade.pattern] += 1
+        self.counts_by_symbol[trade.symbol] += 1
+        self.counts_by_timeframe[trade.timeframe] += 1
+        self.counts_by_level_weight[
+            f"{float(trade.level_weight):g}" if trade.level_weight is not None else "none"
+        ] += 1
+        self.counts_by_level_type[
+            trade.level_type if trade.level_type is not None else "none"
+        ] += 1
+        self.equity_points.append((_trade_order_key(trade), trade.pnl_r))
+
+    def build(
+        self,
+        *,
+        total_signals: int,
+        skipped_invalid_risk: int,
+        skipped_missing_entry_candle: int,
+    ) -> SignalBotBacktestSummary:
+        total = self.total_trades_opened
+        if self.negative_pnl_r < 0:
+            profit_factor = self.positive_pnl_r / abs(self.negative_pnl_r)
+        elif self.positive_pnl_r > 0:
+            profit_factor = float("inf")
+        else:
+            profit_factor = None
+
+        equity = 0.0
+        peak = 0.0
+        max_drawdown = 0.0
+        for _, pnl_r in sorted(self.equity_points, key=lambda point: point[0]):
+            equity += pnl_r
+            peak = max(peak, equity)
+            max_drawdown = max(max_drawdown, peak - equity)
+
+        return SignalBotBacktestSummary(
+            total_signals=total_signals,
+            total_trades_opened=total,
+            skipped_invalid_risk=skipped_invalid_risk,
+            skipped_missing_entry_candle=skipped_missing_entry_candle,
+            wins=self.wins,
+            losses=self.losses,
+            breakevens=self.breakevens,
+            end_of_data_closes=self.end_of_data_closes,
+            intrabar_conflicts=self.intrabar_conflicts,
+            win_rate=(self.wins / total) * 100 if total else 0.0,
+            total_pnl_r=self.total_pnl_r,
+            total_pnl_signal_r=self.total_pnl_signal_r,
+            average_pnl_r=self.total_pnl_r / total if total else 0.0,
+            average_pnl_signal_r=self.total_pnl_signal_r / total if total else 0.0,
+            average_win_r=(
+                self.positive_pnl_r / self.winning_trades if self.winning_trades else 0.0
+            ),
+            average_loss_r=(
+                self.negative_pnl_r / self.losing_trades if self.losing_trades else 0.0
+            ),
+            profit_factor=profit_factor,
+            max_equity_drawdown_r=max_drawdown,
+            average_max_drawdown_r=self.total_max_drawdown_r / total if total else 0.0,
+            average_max_profit_r=self.total_max_profit_r / total if total else 0.0,
+            counts_by_pattern=dict(self.counts_by_pattern),
+            counts_by_symbol=dict(self.counts_by_symbol),
+            counts_by_timeframe=dict(self.counts_by_timeframe),
+            counts_by_level_weight=dict(self.counts_by_level_weight),
+            counts_by_level_type=dict(self.counts_by_level_type),
+        )
+
+
 def build_summary(
     *,
     total_signals: int,
@@ -1043,75 +1353,13 @@ def build_summary(
     skipped_invalid_risk: int,
     skipped_missing_entry_candle: int,
 ) -> SignalBotBacktestSummary:
-    total_trades_opened = len(trades)
-    wins = sum(1 for trade in trades if trade.result == "win")
-    losses = sum(1 for trade in trades if trade.result == "loss")
-    breakevens = sum(1 for trade in trades if trade.result == "breakeven")
-    end_of_data_closes = sum(1 for trade in trades if trade.exit_reason == "end_of_data")
-    intrabar_conflicts = sum(1 for trade in trades if trade.intrabar_conflict)
-    total_pnl_r = sum(trade.pnl_r for trade in trades)
-    total_pnl_signal_r = sum(trade.pnl_signal_r for trade in trades)
-    winning_trades = [trade for trade in trades if trade.pnl_r > 0]
-    losing_trades = [trade for trade in trades if trade.pnl_r < 0]
-
-    return SignalBotBacktestSummary(
+    accumulator = _SummaryAccumulator()
+    for trade in trades:
+        accumulator.add(trade)
+    return accumulator.build(
         total_signals=total_signals,
-        total_trades_opened=total_trades_opened,
         skipped_invalid_risk=skipped_invalid_risk,
         skipped_missing_entry_candle=skipped_missing_entry_candle,
-        wins=wins,
-        losses=losses,
-        breakevens=breakevens,
-        end_of_data_closes=end_of_data_closes,
-        intrabar_conflicts=intrabar_conflicts,
-        win_rate=(wins / total_trades_opened) * 100 if total_trades_opened else 0.0,
-        total_pnl_r=total_pnl_r,
-        total_pnl_signal_r=total_pnl_signal_r,
-        average_pnl_r=total_pnl_r / total_trades_opened if total_trades_opened else 0.0,
-        average_pnl_signal_r=(
-            total_pnl_signal_r / total_trades_opened if total_trades_opened else 0.0
-        ),
-        average_win_r=(
-            sum(trade.pnl_r for trade in winning_trades) / len(winning_trades)
-            if winning_trades
-            else 0.0
-        ),
-        average_loss_r=(
-            sum(trade.pnl_r for trade in losing_trades) / len(losing_trades)
-            if losing_trades
-            else 0.0
-        ),
-        profit_factor=_profit_factor(trades),
-        max_equity_drawdown_r=_max_equity_drawdown_r(trades),
-        average_max_drawdown_r=(
-            sum(trade.max_drawdown_r for trade in trades) / total_trades_opened
-            if total_trades_opened
-            else 0.0
-        ),
-        average_max_profit_r=(
-            sum(trade.max_profit_r for trade in trades) / total_trades_opened
-            if total_trades_opened
-            else 0.0
-        ),
-        counts_by_pattern=dict(Counter(trade.pattern for trade in trades)),
-        counts_by_symbol=dict(Counter(trade.symbol for trade in trades)),
-        counts_by_timeframe=dict(Counter(trade.timeframe for trade in trades)),
-        counts_by_level_weight=dict(
-            Counter(
-                (
-                    f"{float(trade.level_weight):g}"
-                    if trade.level_weight is not None
-                    else "none"
-                )
-                for trade in trades
-            )
-        ),
-        counts_by_level_type=dict(
-            Counter(
-                trade.level_type if trade.level_type is not None else "none"
-                for trade in trades
-            )
-        ),
     )
 
 
@@ -1119,7 +1367,18 @@ def filter_closed_candles(
     candles: Sequence[Candle],
     *,
     now_ms: int | None = None,
-) -> list[Candle]:
+) -> list[Candle] | CandleSeries:
+    if isinstance(candles, CandleSeries):
+        if candles.timeframe is None:
+            return candles[:0]
+        current_ms = (
+            now_ms
+            if now_ms is not None
+            else int(datetime.now(timezone.utc).timestamp() * 1000)
+        )
+        # series are sorted by timestamp, so closed candles form a prefix
+        cutoff = current_ms - timeframe_to_milliseconds(candles.timeframe)
+        return candles[: int(np.searchsorted(candles.timestamp, cutoff, side="right"))]
     return [
         candle
         for candle in candles
@@ -1128,131 +1387,310 @@ def filter_closed_candles(
     ]
 
 
-def run_backtest(config: SignalBotBacktestConfig) -> SignalBotBacktestResult:
-    connector = create_connector(config.exchange)
-    variant_keys = build_variant_keys(config)
+@dataclass(frozen=True)
+class SeriesBacktestTask:
+    config: SignalBotBacktestConfig
+    symbol: str
+    timeframe: str
+    candles: CandleSeries
+    execution_candles: CandleSeries | None
+    variant_keys: tuple[tuple[float, float], ...]
+
+    def detached(self) -> SeriesBacktestTask:
+        """Copy of the task whose series pickle as plain arrays for a worker process."""
+
+        return replace(
+            self,
+            candles=_detached_series(self.candles),
+            execution_candles=(
+                _detached_series(self.execution_candles)
+                if self.execution_candles is not None
+                else None
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class SeriesBacktestOutcome:
+    stats: SignalBotSeriesStats
+    trades_by_variant: dict[tuple[float, float], list[SignalBotBacktestTrade]]
+
+
+def _detached_series(series: CandleSeries) -> CandleSeries:
+    # contiguous copies instead of memmap views, without the rendered datetime cache
+    return CandleSeries(
+        timestamp=np.ascontiguousarray(series.timestamp),
+        open=np.ascontiguousarray(series.open),
+        high=np.ascontiguousarray(series.high),
+        low=np.ascontiguousarray(series.low),
+        close=np.ascontiguousarray(series.close),
+        volume=np.ascontiguousarray(series.volume),
+        symbol=series.symbol,
+        timeframe=series.timeframe,
+        datetime=series.datetime,
+    )
+
+
+def backtest_series(task: SeriesBacktestTask) -> SeriesBacktestOutcome:
+    """Detect, filter and simulate every variant for one symbol/timeframe series."""
+
+    config = task.config
+    closed_candles = task.candles
+    execution_candles = task.execution_candles
     trades_by_variant: dict[tuple[float, float], list[SignalBotBacktestTrade]] = {
         variant_key: []
-        for variant_key in variant_keys
+        for variant_key in task.variant_keys
     }
-    series_stats: list[SignalBotSeriesStats] = []
-    total_signals = 0
     skipped_invalid_risk = 0
     skipped_missing_entry_candle = 0
+    filtered_signal_count = 0
+    passage_index = FirstPassageIndex.from_candles(
+        execution_candles if execution_candles is not None else closed_candles
+    )
+    context_index = MarketContextIndex(closed_candles)
+
+    detected_signals = collect_filtered_signals(
+        closed_candles,
+        patterns=config.patterns,
+        min_metric_increase_pct=config.min_metric_increase_pct,
+        use_levels=config.use_levels,
+        min_level_weight=config.min_level_weight,
+    )
+    for detected_signal in detected_signals:
+        market_context = context_index.context_at(detected_signal.candle_index)
+        if not signal_passes_context_filters(
+            detected_signal,
+            market_context,
+            config,
+        ):
+            continue
+        filtered_signal_count += 1
+
+        entry_context = build_entry_context(
+            detected_signal,
+            closed_candles,
+            execution_candles=execution_candles,
+            execution_timeframe=config.execution_timeframe,
+        )
+        if entry_context is None:
+            skipped_missing_entry_candle += 1
+            continue
+
+        trades = simulate_trade_grid(
+            detected_signal,
+            closed_candles,
+            execution_candles=execution_candles,
+            execution_timeframe=config.execution_timeframe,
+            entry_context=entry_context,
+            market_context=market_context,
+            variant_keys=task.variant_keys,
+            passage_index=passage_index,
+        )
+        invalid_risk = False
+        for variant_key, trade in zip(task.variant_keys, trades):
+            if trade is None:
+                invalid_risk = True
+                continue
+            trades_by_variant[variant_key].append(trade)
+        if invalid_risk:
+            skipped_invalid_risk += 1
+
+    return SeriesBacktestOutcome(
+        stats=SignalBotSeriesStats(
+            symbol=task.symbol,
+            timeframe=task.timeframe,
+            candle_count=len(closed_candles),
+            signal_count=filtered_signal_count,
+            trade_count=len(trades_by_variant[(config.take_multiple, config.stop_multiple)]),
+            skipped_invalid_risk=skipped_invalid_risk,
+            skipped_missing_entry_candle=skipped_missing_entry_candle,
+        ),
+        trades_by_variant=trades_by_variant,
+    )
+
+
+class TradeStreamWriter:
+    """Appends trades to one NDJSON file per variant as series finish.
+
+    Lines follow simulation order (series by series), not entry time. Only
+    the variants passed in are written; trades for other variants are dropped.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        variant_keys: Sequence[tuple[float, float]],
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.paths = {
+            variant_key: self.directory / trade_file_name(*variant_key)
+            for variant_key in variant_keys
+        }
+        self._handles = {
+            variant_key: path.open("w", encoding="utf-8")
+            for variant_key, path in self.paths.items()
+        }
+
+    def write(
+        self,
+        variant_key: tuple[float, float],
+        trades: Sequence[SignalBotBacktestTrade],
+    ) -> None:
+        handle = self._handles.get(variant_key)
+        if handle is None:
+            return
+        for trade in trades:
+            handle.write(json.dumps(asdict(trade), ensure_ascii=True))
+            handle.write("\n")
+
+    def close(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+
+    def __enter__(self) -> TradeStreamWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def trade_file_name(take_multiple: float, stop_multiple: float) -> str:
+    return f"take_{take_multiple:.10g}_stop_{stop_multiple:.10g}.ndjson"
+
+
+def load_series_tasks(
+    config: SignalBotBacktestConfig,
+    variant_keys: Sequence[tuple[float, float]],
+) -> list[SeriesBacktestTask]:
+    """Load closed candles for every symbol/timeframe series of ``config``."""
+
+    connector = create_connector(config.exchange)
+    cache = CandleCache(config.cache_dir) if config.cache_dir else None
     now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
 
+    execution_timeframes = (
+        (config.execution_timeframe,) if config.execution_timeframe is not None else ()
+    )
+    loaded_series = fetch_historical_series_batch(
+        connector,
+        [
+            (symbol, timeframe)
+            for symbol in config.symbols
+            for timeframe in (*execution_timeframes, *config.timeframes)
+        ],
+        config.normalized_date_from_utc,
+        config.normalized_date_to_utc,
+        fetch_limit=config.fetch_limit,
+        cache=cache,
+        workers=config.fetch_workers,
+    )
+
+    tasks: list[SeriesBacktestTask] = []
     for symbol in config.symbols:
-        execution_candles: list[Candle] | None = None
+        execution_candles: CandleSeries | None = None
         if config.execution_timeframe is not None:
             execution_candles = filter_closed_candles(
-                fetch_historical_candles(
-                    connector,
-                    symbol,
-                    config.execution_timeframe,
-                    config.normalized_date_from_utc,
-                    config.normalized_date_to_utc,
-                    fetch_limit=config.fetch_limit,
-                ),
+                loaded_series[(symbol, config.execution_timeframe)],
                 now_ms=now_ms,
             )
         for timeframe in config.timeframes:
-            candles = fetch_historical_candles(
-                connector,
-                symbol,
-                timeframe,
-                config.normalized_date_from_utc,
-                config.normalized_date_to_utc,
-                fetch_limit=config.fetch_limit,
-            )
-            closed_candles = filter_closed_candles(candles, now_ms=now_ms)
-            detected_signals = collect_filtered_signals(
-                closed_candles,
-                patterns=config.patterns,
-                min_metric_increase_pct=config.min_metric_increase_pct,
-                use_levels=config.use_levels,
-                min_level_weight=config.min_level_weight,
-            )
-
-            primary_variant_key = (config.take_multiple, config.stop_multiple)
-            primary_trades_before = len(trades_by_variant[primary_variant_key])
-            skipped_before = skipped_invalid_risk
-            skipped_missing_before = skipped_missing_entry_candle
-            filtered_signal_count = 0
-
-            for detected_signal in detected_signals:
-                market_context = build_signal_market_context(
-                    closed_candles,
-                    detected_signal.candle_index,
-                )
-                if not signal_passes_context_filters(
-                    detected_signal,
-                    market_context,
-                    config,
-                ):
-                    continue
-                filtered_signal_count += 1
-
-                entry_context = build_entry_context(
-                    detected_signal,
-                    closed_candles,
-                    execution_candles=execution_candles,
-                    execution_timeframe=config.execution_timeframe,
-                )
-                if entry_context is None:
-                    skipped_missing_entry_candle += 1
-                    continue
-
-                invalid_risk = False
-                for take_multiple, stop_multiple in variant_keys:
-                    trade = simulate_trade(
-                        detected_signal,
-                        closed_candles,
-                        execution_candles=execution_candles,
-                        execution_timeframe=config.execution_timeframe,
-                        entry_context=entry_context,
-                        market_context=market_context,
-                        take_multiple=take_multiple,
-                        stop_multiple=stop_multiple,
-                    )
-                    if trade is None:
-                        invalid_risk = True
-                        continue
-                    trades_by_variant[(take_multiple, stop_multiple)].append(trade)
-                if invalid_risk:
-                    skipped_invalid_risk += 1
-            total_signals += filtered_signal_count
-
-            series_stats.append(
-                SignalBotSeriesStats(
+            tasks.append(
+                SeriesBacktestTask(
+                    config=config,
                     symbol=symbol,
                     timeframe=timeframe,
-                    candle_count=len(closed_candles),
-                    signal_count=filtered_signal_count,
-                    trade_count=(
-                        len(trades_by_variant[primary_variant_key])
-                        - primary_trades_before
-                    ),
-                    skipped_invalid_risk=skipped_invalid_risk - skipped_before,
-                    skipped_missing_entry_candle=(
-                        skipped_missing_entry_candle - skipped_missing_before
+                    candles=filter_closed_candles(
+                        loaded_series[(symbol, timeframe)],
+                        now_ms=now_ms,
                     ),
+                    execution_candles=execution_candles,
+                    variant_keys=tuple(variant_keys),
                 )
             )
+    return tasks
 
-            print(
-                f"[{symbol} {timeframe}] "
-                f"candles={len(closed_candles)} "
-                f"signals={filtered_signal_count} "
-                f"trades={len(trades_by_variant[primary_variant_key]) - primary_trades_before}"
-            )
+
+def run_series_tasks(
+    function: Callable[[SeriesBacktestTask], _SeriesResult],
+    tasks: Sequence[SeriesBacktestTask],
+    *,
+    workers: int,
+) -> Iterator[_SeriesResult]:
+    """Apply ``function`` to every task, in worker processes when ``workers > 1``.
+
+    Results are yielded in task order as they complete.
+    """
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            # map yields in task order, so the result matches a sequential run exactly
+            yield from pool.map(function, [task.detached() for task in tasks])
+    else:
+        for task in tasks:
+            yield function(task)
+
+
+def _series_outcomes(
+    config: SignalBotBacktestConfig,
+    variant_keys: Sequence[tuple[float, float]],
+) -> Iterator[SeriesBacktestOutcome]:
+    """Load history and yield each series' outcome in task order as it completes."""
+
+    tasks = load_series_tasks(config, variant_keys)
+    yield from run_series_tasks(backtest_series, tasks, workers=config.workers)
+
+
+def run_backtest(
+    config: SignalBotBacktestConfig,
+    *,
+    trade_stream: TradeStreamWriter | None = None,
+) -> SignalBotBacktestResult:
+    """Backtest every series and summarize each take/stop variant.
+
+    With a ``trade_stream`` trades are written out as each series finishes
+    instead of being kept, and the result carries no trade lists.
+    """
+
+    variant_keys = build_variant_keys(config)
+    accumulators = {variant_key: _SummaryAccumulator() for variant_key in variant_keys}
+    trades_by_variant: dict[tuple[float, float], list[SignalBotBacktestTrade]] = {
+        variant_key: []
+        for variant_key in variant_keys
+    }
+    series_stats: list[SignalBotSeriesStats] = []
+    total_signals = 0
+    skipped_invalid_risk = 0
+    skipped_missing_entry_candle = 0
+
+    for outcome in _series_outcomes(config, variant_keys):
+        stats = outcome.stats
+        for variant_key in variant_keys:
+            trades = outcome.trades_by_variant[variant_key]
+            accumulator = accumulators[variant_key]
+            for trade in trades:
+                accumulator.add(trade)
+            if trade_stream is not None:
+                trade_stream.write(variant_key, trades)
+            else:
+                trades_by_variant[variant_key].extend(trades)
+        total_signals += stats.signal_count
+        skipped_invalid_risk += stats.skipped_invalid_risk
+        skipped_missing_entry_candle += stats.skipped_missing_entry_candle
+        series_stats.append(stats)
+        print(
+            f"[{stats.symbol} {stats.timeframe}] "
+            f"candles={stats.candle_count} "
+            f"signals={stats.signal_count} "
+            f"trades={stats.trade_count}"
+        )
 
     variant_summaries = [
         SignalBotVariantSummary(
             take_multiple=take_multiple,
             stop_multiple=stop_multiple,
-            summary=build_summary(
+            summary=accumulators[(take_multiple, stop_multiple)].build(
                 total_signals=total_signals,
-                trades=trades_by_variant[(take_multiple, stop_multiple)],
                 skipped_invalid_risk=skipped_invalid_risk,
                 skipped_missing_entry_candle=skipped_missing_entry_candle,
             ),
@@ -1264,16 +1702,6 @@ def run_backtest(config: SignalBotBacktestConfig) -> SignalBotBacktestResult:
         for variant in variant_summaries
         if variant.stop_multiple == config.stop_multiple
     ]
-    primary_trades = sorted(
-        trades_by_variant[(config.take_multiple, config.stop_multiple)],
-        key=lambda trade: (
-            trade.entry_timestamp,
-            trade.signal_timestamp,
-            trade.symbol,
-            trade.timeframe,
-            trade.pattern,
-        ),
-    )
     summary = next(
         variant.summary
         for variant in variant_summaries
@@ -1282,6 +1710,25 @@ def run_backtest(config: SignalBotBacktestConfig) -> SignalBotBacktestResult:
             and variant.stop_multiple == config.stop_multiple
         )
     )
+    if trade_stream is not None:
+        return SignalBotBacktestResult(
+            config=config,
+            summary=summary,
+            variant_summaries=variant_summaries,
+            take_variant_summaries=take_variant_summaries,
+            series=series_stats,
+            trades=[],
+            variant_trades=None,
+            trade_files={
+                format_variant_key(*variant_key): str(path)
+                for variant_key, path in trade_stream.paths.items()
+            },
+        )
+
+    primary_trades = sorted(
+        trades_by_variant[(config.take_multiple, config.stop_multiple)],
+        key=_trade_order_key,
+    )
     return SignalBotBacktestResult(
         config=config,
         summary=summary,
@@ -1293,13 +1740,7 @@ def run_backtest(config: SignalBotBacktestConfig) -> SignalBotBacktestResult:
             {
                 format_variant_key(take_multiple, stop_multiple): sorted(
                     trades_by_variant[(take_multiple, stop_multiple)],
-                    key=lambda trade: (
-                        trade.entry_timestamp,
-                        trade.signal_timestamp,
-                        trade.symbol,
-                        trade.timeframe,
-                        trade.pattern,
-                    ),
+                    key=_trade_order_key,
                 )
                 for take_multiple, stop_multiple in variant_keys
             }
@@ -1309,21 +1750,62 @@ def run_backtest(config: SignalBotBacktestConfig) -> SignalBotBacktestResult:
     )
 
 
+def stream_backtest(
+    config: SignalBotBacktestConfig,
+    output_file: str | Path | None = None,
+) -> tuple[SignalBotBacktestResult, Path]:
+    """Run the backtest writing NDJSON trades next to a small JSON manifest.
+
+    Trades go to ``<output stem>_trades/`` (every variant with
+    ``save_all_variant_trades``, otherwise only the primary one); the manifest
+    at ``output_file`` holds the config, summaries and the trade file paths
+    relative to it.
+    """
+
+    path = Path(output_file or config.output_file)
+    trades_dir = path.with_name(f"{path.stem}_trades")
+    variant_keys = (
+        build_variant_keys(config)
+        if config.save_all_variant_trades
+        else [(config.take_multiple, config.stop_multiple)]
+    )
+    with TradeStreamWriter(trades_dir, variant_keys) as trade_stream:
+        result = run_backtest(config, trade_stream=trade_stream)
+    result = replace(
+        result,
+        trade_files={
+            key: str(Path(file_path).relative_to(path.parent))
+            for key, file_path in (result.trade_files or {}).items()
+        },
+    )
+    return result, save_result(result, path)
+
+
+def result_to_json(result: SignalBotBacktestResult) -> str:
+    payload = asdict(result)
+    # execution settings do not change results, keep them out of the report
+    for name in RUNTIME_CONFIG_FIELDS:
+        payload["config"].pop(name, None)
+    if payload["trade_files"] is None:
+        payload.pop("trade_files")
+    return json.dumps(payload, ensure_ascii=True, indent=2)
+
+
 def save_result(result: SignalBotBacktestResult, output_file: str | Path | None = None) -> Path:
     path = Path(output_file or result.config.output_file)
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
-        json.dumps(asdict(result), ensure_ascii=True, indent=2),
-        encoding="utf-8",
-    )
+    path.write_text(result_to_json(result), encoding="utf-8")
     return path
 
 
 def main(argv: Sequence[str] | None = None) -> None:
     args = parse_args(argv)
     config = build_config(args)
-    result = run_backtest(config)
-    output_path = save_result(result)
+    if config.trades_format == "ndjson":
+        result, output_path = stream_backtest(config)
+    else:
+        result = run_backtest(config)
+        output_path = save_result(result)
 
     print(f"Output file: {output_path}")
     print(f"Signals: {result.summary.total_signals}")
@@ -1358,13 +1840,19 @@ __all__ = [
     "DEFAULT_TIMEFRAMES",
     "DetectedSignal",
     "EntryContext",
+    "HIGHER_TIMEFRAME_BIASES",
+    "SeriesBacktestOutcome",
+    "SeriesBacktestTask",
     "SignalBotBacktestConfig",
     "SignalBotBacktestResult",
     "SignalBotBacktestSummary",
     "SignalBotVariantSummary",
     "SignalBotBacktestTrade",
     "SignalBotSeriesStats",
+    "TradeStreamWriter",
+    "VOLATILITY_REGIMES",
     "build_config",
+    "build_parser",
     "build_entry_context",
     "build_signal_market_context",
     "build_summary",
@@ -1373,14 +1861,21 @@ __all__ = [
     "find_entry_candle_index",
     "filter_closed_candles",
     "format_variant_key",
+    "load_series_tasks",
     "main",
     "normalize_date_range",
     "normalize_stop_multiples",
     "normalize_take_multiples",
+    "backtest_series",
+    "result_to_json",
     "run_backtest",
+    "run_series_tasks",
     "save_result",
     "signal_available_timestamp",
     "signal_passes_context_filters",
     "simulate_trade",
+    "simulate_trade_grid",
+    "stream_backtest",
+    "trade_file_name",
     "SignalBotVariantSummary",
 ]
@@ -3,16 +3,58 @@
 from __future__ import annotations
 
 import argparse
-from collections import defaultdict
+from dataclasses import dataclass
 import json
 from pathlib import Path
-from typing import Any, Callable, Sequence
+import re
+from typing import Any, Callable, Iterator, Sequence, TextIO
+
+import numpy as np
 
 from .signals_bot_backtest import format_variant_key
 
 DEFAULT_INPUT_PATH = Path(__file__).resolve().parents[1] / "signals_bot_backtest_results.json"
 DEFAULT_OUTPUT_PATH = Path(__file__).resolve().parents[1] / "signals_bot_backtest_analysis.json"
 
+# order of trades in the JSON export (signals_bot_backtest._trade_order_key)
+_TRADE_ORDER_FIELDS = ("entry_timestamp", "signal_timestamp", "symbol", "timeframe", "pattern")
+
+# trade fields read by analyze_backtest_result; everything else is dropped on load
+TRADE_ANALYSIS_FIELDS = (
+    "pnl_r",
+    "pattern",
+    "timeframe",
+    "signal_timeframe",
+    "direction",
+    "level_weight",
+    "level_type",
+    "context_higher_timeframe_bias",
+    "context_volatility_regime",
+    "signal_hour",
+    "signal_weekday_name",
+    "signal_range_pct",
+    "risk_pct_from_entry",
+    "signal_volatility_increase_max_pct",
+    "signal_volume_increase_max_pct",
+    "context_range_position_pct",
+    "context_atr_pct",
+    "context_signal_range_to_atr_ratio",
+    "context_distance_to_recent_high_pct",
+    "context_distance_to_recent_low_pct",
+)
+# summary key -> trade field averaged per group
+GROUP_MEAN_FIELDS = (
+    ("average_signal_range_pct", "signal_range_pct"),
+    ("average_risk_pct_from_entry", "risk_pct_from_entry"),
+    ("average_signal_volatility_increase_max_pct", "signal_volatility_increase_max_pct"),
+    ("average_signal_volume_increase_max_pct", "signal_volume_increase_max_pct"),
+    ("average_context_range_position_pct", "context_range_position_pct"),
+    ("average_context_atr_pct", "context_atr_pct"),
+    ("average_context_signal_range_to_atr_ratio", "context_signal_range_to_atr_ratio"),
+)
+_READ_CHUNK_SIZE = 1 << 20
+_NON_WHITESPACE = re.compile(r"\S")
+
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
@@ -30,6 +72,205 @@ def load_backtest_result(path: Path) -> dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+class _JsonReader:
+    """Decodes one JSON document value by value from a text stream.
+
+    Only the value currently being decoded is held in memory, so callers can
+    walk large arrays and drop the elements they do not need.
+    """
+
+    def __init__(self, handle: TextIO, chunk_size: int) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        pending = len(self._buffer) - self._pos
+        # grow reads with the pending value so a large one is not re-decoded many times
+        chunk = self._handle.read(max(self._chunk_size, pending))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            self._pos = len(self._buffer)
+            if not self._fill():
+                raise ValueError("unexpected end of JSON input")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in JSON input, found {self.peek()!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a number that ends the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def keys(self) -> Iterator[str]:
+        """Yield object keys; the caller must consume each value before resuming."""
+
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def elements(self) -> Iterator[None]:
+        """Yield once per array element; the caller must consume each value."""
+
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def _project_trade(trade: dict[str, Any], fields: Sequence[str]) -> dict[str, Any]:
+    return {field: trade[field] for field in fields if field in trade}
+
+
+def _read_trades(
+    reader: _JsonReader,
+    fields: Sequence[str],
+    *,
+    keep: bool,
+) -> list[dict[str, Any]]:
+    trades: list[dict[str, Any]] = []
+    for _ in reader.elements():
+        trade = reader.value()
+        if keep:
+            trades.append(_project_trade(trade, fields))
+    return trades
+
+
+def _selected_variant_key(
+    config: dict[str, Any],
+    take_multiple: float | None,
+    stop_multiple: float | None,
+) -> tuple[str, bool]:
+    """Return the requested variant key and whether it is the primary setup."""
+
+    if (take_multiple is None) != (stop_multiple is None):
+        raise ValueError("take_multiple and stop_multiple must be provided together")
+    primary = (
+        float(config.get("take_multiple", 1.0)),
+        float(config.get("stop_multiple", 1.0)),
+    )
+    if take_multiple is None or stop_multiple is None:
+        return format_variant_key(*primary), True
+    selected = (float(take_multiple), float(stop_multiple))
+    return format_variant_key(*selected), selected == primary
+
+
+def load_analysis_input(
+    path: str | Path,
+    *,
+    take_multiple: float | None = None,
+    stop_multiple: float | None = None,
+    fields: Sequence[str] = TRADE_ANALYSIS_FIELDS,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Read a saved result keeping only ``fields`` of the selected variant's trades.
+
+    Accepts the JSON written by ``signals_bot_backtest`` and the manifest of
+    an ``--trades-format ndjson`` run. The file is decoded incrementally, so
+    trades of other variants are never held in memory. Returns the payload
+    without its trade lists and the projected trades.
+    """
+
+    path = Path(path)
+    payload: dict[str, Any] = {}
+    trades: list[dict[str, Any]] | None = None
+    with path.open(encoding="utf-8") as handle:
+        reader = _JsonReader(handle, _READ_CHUNK_SIZE)
+        for key in reader.keys():
+            if key == "trades":
+                _, is_primary = _selected_variant_key(
+                    payload.get("config", {}), take_multiple, stop_multiple
+                )
+                primary_trades = _read_trades(reader, fields, keep=is_primary)
+                if is_primary:
+                    trades = primary_trades
+            elif key == "variant_trades" and reader.peek() == "{":
+                variant_key, is_primary = _selected_variant_key(
+                    payload.get("config", {}), take_multiple, stop_multiple
+                )
+                payload[key] = None
+                for stored_key in reader.keys():
+                    keep = not is_primary and stored_key == variant_key
+                    variant_trades = _read_trades(reader, fields, keep=keep)
+                    if keep:
+                        trades = variant_trades
+                if trades is None:
+                    raise ValueError(f"variant trades not found for {variant_key}")
+            else:
+                payload[key] = reader.value()
+
+    variant_key, is_primary = _selected_variant_key(
+        payload.get("config", {}), take_multiple, stop_multiple
+    )
+    trade_files = payload.get("trade_files")
+    if trade_files is not None:
+        if variant_key not in trade_files:
+            raise ValueError(f"trade file not found for {variant_key}")
+        # NDJSON files are written series by series; restore the JSON export's
+        # trade order so quantile buckets break ties the same way.
+        read_fields = (*fields, *(field for field in _TRADE_ORDER_FIELDS if field not in fields))
+        with (path.parent / trade_files[variant_key]).open(encoding="utf-8") as handle:
+            trades = [
+                _project_trade(json.loads(line), read_fields)
+                for line in handle
+                if line.strip()
+            ]
+        trades.sort(key=lambda trade: tuple(trade[field] for field in _TRADE_ORDER_FIELDS))
+        trades = [_project_trade(trade, fields) for trade in trades]
+    if trades is None:
+        if not is_primary:
+            raise ValueError(
+                "variant_trades are not present in this export; rerun backtest with "
+                "--save-all-variant-trades or analyze the primary setup only"
+            )
+        trades = []
+    return payload, trades
+
+
 def extract_variant_summaries(payload: dict[str, Any]) -> list[dict[str, Any]]:
     variants = payload.get("variant_summaries")
     if variants is not None:
@@ -167,17 +408,7 @@ def summarize_groups(
     trades: Sequence[dict[str, Any]],
     group_builder: Callable[[dict[str, Any]], str | None],
 ) -> list[dict[str, Any]]:
-    grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for trade in trades:
-        group = group_builder(trade)
-        if group is None:
-            continue
-        grouped[group].append(trade)
-
-    return [
-        summarize_trade_group(group, grouped[group])
-        for group in sorted(grouped, key=_group_sort_key)
-    ]
+    return TradeColumns(trades).group_by(group_builder).rows()
 
 
 def summarize_quantile_groups(
@@ -186,29 +417,235 @@ def summarize_quantile_groups(
     *,
     bucket_count: int,
 ) -> list[dict[str, Any]]:
-    indexed_values = [
-        (index, float(trade[field]))
-        for index, trade in enumerate(trades)
-        if trade.get(field) is not None
-    ]
-    if not indexed_values:
-        return []
-
-    bucket_total = max(1, min(bucket_count, len(indexed_values)))
-    sorted_values = sorted(indexed_values, key=lambda item: item[1])
-    grouped_indexes: dict[int, list[tuple[int, float]]] = defaultdict(list)
-    for rank, indexed_value in enumerate(sorted_values):
-        bucket_index = min((rank * bucket_total) // len(sorted_values), bucket_total - 1)
-        grouped_indexes[bucket_index].append(indexed_value)
-
-    summaries: list[dict[str, Any]] = []
-    for bucket_index in sorted(grouped_indexes):
-        bucket_entries = grouped_indexes[bucket_index]
-        bucket_values = [value for _, value in bucket_entries]
-        label = f"q{bucket_index + 1}:{min(bucket_values):.4f}..{max(bucket_values):.4f}"
-        bucket_trades = [trades[index] for index, _ in bucket_entries]
-        summaries.append(summarize_trade_group(label, bucket_trades))
-    return summaries
+    return TradeColumns(trades).quantile_groups(field, bucket_count=bucket_count).rows()
+
+
+@dataclass(frozen=True)
+class GroupTable:
+    """Per-group trade statistics as arrays, one entry per group in output order."""
+
+    labels: tuple[str, ...]
+    total_trades: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+    total_pnl_r: np.ndarray
+    # summary key -> group mean, NaN where the group has no values
+    means: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def loss_rate(self) -> np.ndarray:
+        return self.losses * 100.0 / self.total_trades
+
+    def rows(self, indexes: Sequence[int] | None = None) -> list[dict[str, Any]]:
+        """The groups as ``summarize_trade_group`` dicts."""
+
+        if indexes is None:
+            indexes = range(len(self.labels))
+        rows = []
+        for index in indexes:
+            total_trades = int(self.total_trades[index])
+            wins = int(self.wins[index])
+            losses = int(self.losses[index])
+            total_pnl_r = float(self.total_pnl_r[index])
+            row: dict[str, Any] = {
+                "group": self.labels[index],
+                "total_trades": total_trades,
+                "wins": wins,
+                "losses": losses,
+                "breakevens": total_trades - wins - losses,
+                "win_rate": (wins / total_trades) * 100,
+                "loss_rate": (losses / total_trades) * 100,
+                "total_pnl_r": total_pnl_r,
+                "average_pnl_r": total_pnl_r / total_trades,
+            }
+            for key, _ in GROUP_MEAN_FIELDS:
+                mean = float(self.means[key][index])
+                row[key] = None if np.isnan(mean) else mean
+            rows.append(row)
+        return rows
+
+    def filter_candidates(
+        self,
+        *,
+        overall_loss_rate: float,
+        min_group_trades: int,
+        top_n: int,
+    ) -> list[dict[str, Any]]:
+        """Vectorized ``extract_filter_candidates`` over this table."""
+
+        loss_rate = self.loss_rate
+        candidates = np.flatnonzero(
+            (self.total_trades >= min_group_trades)
+            & (loss_rate > overall_loss_rate)
+            & (self.total_pnl_r < 0)
+        )
+        # highest loss rate, then most negative PnL, then most trades; ties keep group order
+        order = np.lexsort(
+            (
+                -self.total_trades[candidates],
+                self.total_pnl_r[candidates],
+                -loss_rate[candidates],
+            )
+        )
+        return self.rows(candidates[order][:top_n].tolist())
+
+
+def _factorize(values: Sequence[Any]) -> tuple[list[Any], np.ndarray]:
+    """Distinct values in first-seen order and each value's index among them."""
+
+    distinct = list(dict.fromkeys(values))
+    index = {value: position for position, value in enumerate(distinct)}
+    codes = np.fromiter(map(index.__getitem__, values), dtype=np.int64, count=len(values))
+    return distinct, codes
+
+
+class TradeColumns:
+    """Trades held as NumPy columns for grouped summaries.
+
+    Each grouping sorts trade indexes so that groups are contiguous and sums
+    every statistic with one ``np.add.reduceat`` over the segments.
+    """
+
+    def __init__(self, trades: Sequence[dict[str, Any]]) -> None:
+        self._trades = trades
+        self._values: dict[str, list[Any]] = {}
+        self._numeric: dict[str, np.ndarray] = {}
+        pnl_r = np.nan_to_num(self.numeric("pnl_r"), nan=0.0)
+        means = [self.numeric(field) for _, field in GROUP_MEAN_FIELDS]
+        present = [~np.isnan(values) for values in means]
+        # columns: pnl, win, loss, then value sums and value counts of each mean field
+        self._stats = np.column_stack(
+            [
+                pnl_r,
+                pnl_r > 0,
+                pnl_r < 0,
+                *(np.where(mask, values, 0.0) for values, mask in zip(means, present)),
+                *present,
+            ]
+        ).astype(np.float64, copy=False)
+
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def values(self, field: str) -> list[Any]:
+        """Raw values of ``field``, ``None`` where a trade has none."""
+
+        values = self._values.get(field)
+        if values is None:
+            values = [trade.get(field) for trade in self._trades]
+            self._values[field] = values
+        return values
+
+    def numeric(self, field: str) -> np.ndarray:
+        """Float column of ``field`` with NaN where a trade has no value."""
+
+        values = self._numeric.get(field)
+        if values is None:
+            # numpy turns None into NaN for float arrays
+            values = np.array(self.values(field), dtype=np.float64)
+            self._numeric[field] = values
+        return values
+
+    def group_by(self, group_builder: Callable[[dict[str, Any]], str | None]) -> GroupTable:
+        """Group by a label per trade; ``None`` leaves the trade out."""
+
+        distinct, codes = _factorize([group_builder(trade) for trade in self._trades])
+        return self._group_codes(distinct, codes)
+
+    def group_by_field(
+        self,
+        field: str,
+        *,
+        fallback_field: str | None = None,
+        missing: str | None = "none",
+        label: Callable[[Any], str] = str,
+    ) -> GroupTable:
+        """Group by the value of ``field`` without calling Python per trade.
+
+        Falsy values are taken from ``fallback_field``. Trades with no value
+        go to the ``missing`` group, or are left out when it is ``None``.
+        """
+
+        values = self.values(field)
+        if fallback_field is not None:
+            values = [
+                value or fallback
+                for value, fallback in zip(values, self.values(fallback_field))
+            ]
+        distinct, codes = _factorize(values)
+        return self._group_codes(
+            [missing if value is None else label(value) for value in distinct],
+            codes,
+        )
+
+    def quantile_groups(self, field: str, *, bucket_count: int) -> GroupTable:
+        """Equal-count buckets of trades ranked by ``field``; missing values are left out."""
+
+        values = self.numeric(field)
+        present = np.flatnonzero(~np.isnan(values))
+        if present.size == 0:
+            return self._table((), present, np.empty(0, dtype=np.int64))
+        order = present[np.argsort(values[present], kind="stable")]
+        bucket_total = max(1, min(bucket_count, order.size))
+        buckets = np.minimum(
+            np.arange(order.size) * bucket_total // order.size,
+            bucket_total - 1,
+        )
+        starts = np.flatnonzero(np.r_[True, np.diff(buckets) != 0])
+        ends = np.r_[starts[1:], order.size] - 1
+        sorted_values = values[order]
+        labels = tuple(
+            f"q{bucket + 1}:{low:.4f}..{high:.4f}"
+            for bucket, low, high in zip(
+                buckets[starts].tolist(),
+                sorted_values[starts].tolist(),
+                sorted_values[ends].tolist(),
+            )
+        )
+        return self._table(labels, order, starts)
+
+    def _group_codes(self, code_labels: list[str | None], codes: np.ndarray) -> GroupTable:
+        # several codes may share a label; number the labels in output order
+        labels = sorted(
+            {label for label in code_labels if label is not None},
+            key=_group_sort_key,
+        )
+        if not labels:
+            return self._table((), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        rank = {label: index for index, label in enumerate(labels)}
+        code_groups = np.array(
+            [-1 if label is None else rank[label] for label in code_labels],
+            dtype=np.int64,
+        )
+        groups = code_groups[codes]
+        kept = np.flatnonzero(groups >= 0)
+        order = kept[np.argsort(groups[kept], kind="stable")]
+        starts = np.flatnonzero(np.r_[True, np.diff(groups[order]) != 0])
+        return self._table(tuple(labels), order, starts)
+
+    def _table(self, labels: tuple[str, ...], order: np.ndarray, starts: np.ndarray) -> GroupTable:
+        if not labels:
+            sums = np.zeros((self._stats.shape[1], 0), dtype=np.float64)
+        else:
+            # one row per trade keeps the gather contiguous
+            sums = np.add.reduceat(self._stats.take(order, axis=0), starts, axis=0).T
+        field_count = len(GROUP_MEAN_FIELDS)
+        value_sums = sums[3:3 + field_count]
+        value_counts = sums[3 + field_count:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(value_counts > 0, value_sums / value_counts, np.nan)
+        total_trades = np.diff(np.r_[starts, order.size]).astype(np.int64)
+        return GroupTable(
+            labels=labels,
+            total_trades=total_trades,
+            wins=sums[1].astype(np.int64),
+            losses=sums[2].astype(np.int64),
+            total_pnl_r=sums[0],
+            means={key: means[index] for index, (key, _) in enumerate(GROUP_MEAN_FIELDS)},
+        )
 
 
 def extract_filter_candidates(
@@ -244,14 +681,22 @@ def analyze_backtest_result(
     min_group_trades: int = 5,
     selected_take_multiple: float | None = None,
     selected_stop_multiple: float | None = None,
+    trades: Sequence[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
+    """Rank variants and group the selected variant's trades.
+
+    ``trades`` overrides the trades stored in ``payload``, e.g. the projected
+    trades returned by ``load_analysis_input``.
+    """
+
     variants = extract_variant_summaries(payload)
     variant_snapshots = [_summary_snapshot(variant) for variant in variants]
-    trades = select_variant_trades(
-        payload,
-        take_multiple=selected_take_multiple,
-        stop_multiple=selected_stop_multiple,
-    )
+    if trades is None:
+        trades = select_variant_trades(
+            payload,
+            take_multiple=selected_take_multiple,
+            stop_multiple=selected_stop_multiple,
+        )
     summary = payload.get("summary", {})
     selected_variant = {
         "take_multiple": (
@@ -266,101 +711,58 @@ def analyze_backtest_result(
         ),
     }
 
-    grouped_stats = {
-        "by_pattern": summarize_groups(trades, lambda trade: str(trade["pattern"])),
-        "by_timeframe": summarize_groups(
-            trades,
-            lambda trade: str(trade.get("signal_timeframe") or trade.get("timeframe")),
-        ),
-        "by_direction": summarize_groups(trades, lambda trade: str(trade["direction"])),
-        "by_level_weight": summarize_groups(
-            trades,
-            lambda trade: (
-                str(trade["level_weight"])
-                if trade.get("level_weight") is not None
-                else "none"
-            ),
-        ),
-        "by_level_type": summarize_groups(
-            trades,
-            lambda trade: (
-                str(trade["level_type"])
-                if trade.get("level_type") is not None
-                else "none"
-            ),
-        ),
-        "by_higher_timeframe_bias": summarize_groups(
-            trades,
-            lambda trade: (
-                str(trade["context_higher_timeframe_bias"])
-                if trade.get("context_higher_timeframe_bias") is not None
-                else "none"
-            ),
+    columns = TradeColumns(trades)
+    group_tables = {
+        "by_pattern": columns.group_by_field("pattern", missing=None),
+        "by_timeframe": columns.group_by_field(
+            "signal_timeframe",
+            fallback_field="timeframe",
+            missing="None",
         ),
-        "by_volatility_regime": summarize_groups(
-            trades,
-            lambda trade: (
-                str(trade["context_volatility_regime"])
-                if trade.get("context_volatility_regime") is not None
-                else "none"
-            ),
+        "by_direction": columns.group_by_field("direction", missing=None),
+        "by_level_weight": columns.group_by_field("level_weight"),
+        "by_level_type": columns.group_by_field("level_type"),
+        "by_higher_timeframe_bias": columns.group_by_field("context_higher_timeframe_bias"),
+        "by_volatility_regime": columns.group_by_field("context_volatility_regime"),
+        "by_hour": columns.group_by_field(
+            "signal_hour",
+            missing=None,
+            label=lambda hour: str(int(hour)),
         ),
-        "by_hour": summarize_groups(
-            trades,
-            lambda trade: (
-                str(int(trade["signal_hour"]))
-                if trade.get("signal_hour") is not None
-                else None
-            ),
-        ),
-        "by_weekday": summarize_groups(
-            trades,
-            lambda trade: str(trade.get("signal_weekday_name"))
-            if trade.get("signal_weekday_name") is not None
-            else None,
-        ),
-        "by_signal_range_pct_bucket": summarize_quantile_groups(
-            trades,
+        "by_weekday": columns.group_by_field("signal_weekday_name", missing=None),
+        "by_signal_range_pct_bucket": columns.quantile_groups(
             "signal_range_pct",
             bucket_count=bucket_count,
         ),
-        "by_risk_pct_from_entry_bucket": summarize_quantile_groups(
-            trades,
+        "by_risk_pct_from_entry_bucket": columns.quantile_groups(
             "risk_pct_from_entry",
             bucket_count=bucket_count,
         ),
-        "by_signal_volatility_increase_max_pct_bucket": summarize_quantile_groups(
-            trades,
+        "by_signal_volatility_increase_max_pct_bucket": columns.quantile_groups(
             "signal_volatility_increase_max_pct",
             bucket_count=bucket_count,
         ),
-        "by_signal_volume_increase_max_pct_bucket": summarize_quantile_groups(
-            trades,
+        "by_signal_volume_increase_max_pct_bucket": columns.quantile_groups(
             "signal_volume_increase_max_pct",
             bucket_count=bucket_count,
         ),
-        "by_context_range_position_pct_bucket": summarize_quantile_groups(
-            trades,
+        "by_context_range_position_pct_bucket": columns.quantile_groups(
             "context_range_position_pct",
             bucket_count=bucket_count,
         ),
-        "by_context_atr_pct_bucket": summarize_quantile_groups(
-            trades,
+        "by_context_atr_pct_bucket": columns.quantile_groups(
             "context_atr_pct",
             bucket_count=bucket_count,
         ),
-        "by_context_signal_range_to_atr_ratio_bucket": summarize_quantile_groups(
-            trades,
+        "by_context_signal_range_to_atr_ratio_bucket": columns.quantile_groups(
             "context_signal_range_to_atr_ratio",
             bucket_count=bucket_count,
         ),
-        "by_context_distance_to_recent_high_pct_bucket": summarize_quantile_groups(
-            trades,
+        "by_context_distance_to_recent_high_pct_bucket": columns.quantile_groups(
             "context_distance_to_recent_high_pct",
             bucket_count=bucket_count,
         ),
-        "by_context_distance_to_recent_low_pct_bucket": summarize_quantile_groups(
-            trades,
+        "by_context_distance_to_recent_low_pct_bucket": columns.quantile_groups(
             "context_distance_to_recent_low_pct",
             bucket_count=bucket_count,
         ),
@@ -373,14 +775,14 @@ def analyze_backtest_result(
         else 0.0
     )
 
+    grouped_stats = {section: table.rows() for section, table in group_tables.items()}
     candidate_filters = {
-        section: extract_filter_candidates(
-            grouped_summaries,
+        section: table.filter_candidates(
             overall_loss_rate=overall_loss_rate,
             min_group_trades=min_group_trades,
             top_n=top_n,
         )
-        for section, grouped_summaries in grouped_stats.items()
+        for section, table in group_tables.items()
     }
 
     return {
@@ -436,8 +838,14 @@ def save_analysis(analysis: dict[str, Any], output_file: str | Path) -> Path:
 def main(argv: Sequence[str] | None = None) -> None:
     args = parse_args(argv)
     input_path = Path(args.input_file)
+    payload, trades = load_analysis_input(
+        input_path,
+        take_multiple=args.take_multiple,
+        stop_multiple=args.stop_multiple,
+    )
     analysis = analyze_backtest_result(
-        load_backtest_result(input_path),
+        payload,
+        trades=trades,
         top_n=int(args.top_n),
         bucket_count=int(args.bucket_count),
         min_group_trades=int(args.min_group_trades),
@@ -467,9 +875,14 @@ def main(argv: Sequence[str] | None = None) -> None:
 
 
 __all__ = [
+    "GROUP_MEAN_FIELDS",
+    "GroupTable",
+    "TRADE_ANALYSIS_FIELDS",
+    "TradeColumns",
     "analyze_backtest_result",
     "extract_filter_candidates",
     "extract_variant_summaries",
+    "load_analysis_input",
     "load_backtest_result",
     "main",
     "save_analysis",
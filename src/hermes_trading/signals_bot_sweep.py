@@ -0,0 +1,574 @@
+"""Sweep signals_bot backtest filters over one shared simulation.
+
+Candles are loaded and patterns detected once with the loosest filters of
+the sweep, and every detected signal is simulated once per take/stop
+variant. Each filter combination is then a boolean mask over those signals,
+so it costs a few array reductions instead of a full backtest.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from itertools import product
+import json
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from .backtest.first_passage import FirstPassageIndex
+from .market_context import MarketContextIndex
+from .signals_bot_backtest import (
+    HIGHER_TIMEFRAME_BIASES,
+    RUNTIME_CONFIG_FIELDS,
+    VOLATILITY_REGIMES,
+    SeriesBacktestTask,
+    SignalBotBacktestConfig,
+    build_config,
+    build_entry_context,
+    build_parser,
+    build_variant_keys,
+    collect_filtered_signals,
+    load_series_tasks,
+    run_series_tasks,
+    signal_passes_context_filters,
+    simulate_trade_grid,
+)
+
+DEFAULT_OUTPUT_PATH = Path(__file__).resolve().parents[1] / "signals_bot_sweep_results.json"
+# combinations x signals cells reduced at once; bounds memory on large sweeps
+DEFAULT_SWEEP_CELLS = 1 << 22
+NO_FILTER = "any"
+
+
+@dataclass(frozen=True)
+class SweepFilters:
+    """One combination of the filters a sweep varies."""
+
+    min_metric_increase_pct: float | None
+    min_level_weight: float
+    exclude_hours: tuple[int, ...]
+    allowed_higher_timeframe_biases: tuple[str, ...]
+    allowed_volatility_regimes: tuple[str, ...]
+
+    def apply(self, config: SignalBotBacktestConfig) -> SignalBotBacktestConfig:
+        """The backtest config this combination stands for."""
+
+        return replace(config, **asdict(self))
+
+
+@dataclass(frozen=True)
+class SweepSignals:
+    """Filter attributes and simulated PnL of detected signals, one entry per signal."""
+
+    # weakest of the volatility and volume increases
+    metric_increase_pct: np.ndarray
+    level_weight: np.ndarray
+    signal_hour: np.ndarray
+    higher_timeframe_bias: np.ndarray
+    volatility_regime: np.ndarray
+    missing_entry: np.ndarray
+    invalid_risk: np.ndarray
+    # trade order key, as used for the backtest equity curve
+    entry_timestamp: np.ndarray
+    signal_timestamp: np.ndarray
+    symbol: np.ndarray
+    timeframe: np.ndarray
+    pattern: np.ndarray
+    # (variants, signals); NaN where the variant opened no trade
+    pnl_r: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.metric_increase_pct.shape[0])
+
+    @classmethod
+    def concatenate(cls, parts: Sequence[SweepSignals], variant_count: int) -> SweepSignals:
+        """Join series results and order them like the backtest equity curve."""
+
+        if not parts:
+            return _signals_from_rows([], variant_count)
+        joined = cls(
+            **{
+                name: np.concatenate(
+                    [getattr(part, name) for part in parts],
+                    axis=-1,
+                )
+                for name in cls.__dataclass_fields__
+            }
+        )
+        # lexsort is stable, so ties keep series order as in the backtest
+        order = np.lexsort(
+            (
+                joined.pattern,
+                joined.timeframe,
+                joined.symbol,
+                joined.signal_timestamp,
+                joined.entry_timestamp,
+            )
+        )
+        return cls(
+            **{
+                name: getattr(joined, name)[..., order]
+                for name in cls.__dataclass_fields__
+            }
+        )
+
+
+@dataclass(frozen=True)
+class SweepRow:
+    """Summary of one filter combination and take/stop variant."""
+
+    filters: SweepFilters
+    take_multiple: float
+    stop_multiple: float
+    total_signals: int
+    total_trades_opened: int
+    skipped_invalid_risk: int
+    skipped_missing_entry_candle: int
+    wins: int
+    losses: int
+    breakevens: int
+    win_rate: float
+    total_pnl_r: float
+    average_pnl_r: float
+    profit_factor: float | None
+    max_equity_drawdown_r: float
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    config: SignalBotBacktestConfig
+    rows: list[SweepRow]
+
+
+def build_sweep_filters(
+    config: SignalBotBacktestConfig,
+    *,
+    min_metric_increase_pcts: Sequence[float] | None = None,
+    min_level_weights: Sequence[float] | None = None,
+    exclude_hours: Sequence[tuple[int, ...]] | None = None,
+    higher_timeframe_biases: Sequence[tuple[str, ...]] | None = None,
+    volatility_regimes: Sequence[tuple[str, ...]] | None = None,
+) -> list[SweepFilters]:
+    """Every combination of the given values; omitted filters keep the config value."""
+
+    return [
+        SweepFilters(*values)
+        for values in product(
+            min_metric_increase_pcts or (config.min_metric_increase_pct,),
+            min_level_weights or (config.min_level_weight,),
+            exclude_hours or (config.exclude_hours,),
+            higher_timeframe_biases or (config.allowed_higher_timeframe_biases,),
+            volatility_regimes or (config.allowed_volatility_regimes,),
+        )
+    ]
+
+
+def sweep_series(task: SeriesBacktestTask) -> SweepSignals:
+    """Detect and simulate every signal of one series without the swept filters.
+
+    ``task.config`` carries the loosest metric and level weight of the sweep;
+    its hour, bias and regime filters are ignored, the distance filters apply.
+    """
+
+    config = task.config
+    candles = task.candles
+    execution_candles = task.execution_candles
+    passage_index = FirstPassageIndex.from_candles(
+        execution_candles if execution_candles is not None else candles
+    )
+    context_index = MarketContextIndex(candles)
+    distance_config = replace(
+        config,
+        exclude_hours=(),
+        allowed_higher_timeframe_biases=(),
+        allowed_volatility_regimes=(),
+    )
+
+    rows: list[tuple] = []
+    for detected_signal in collect_filtered_signals(
+        candles,
+        patterns=config.patterns,
+        min_metric_increase_pct=config.min_metric_increase_pct,
+        use_levels=config.use_levels,
+        min_level_weight=config.min_level_weight,
+    ):
+        market_context = context_index.context_at(detected_signal.candle_index)
+        if not signal_passes_context_filters(detected_signal, market_context, distance_config):
+            continue
+
+        filtered = detected_signal.filtered_signal
+        match = filtered.match
+        entry_context = build_entry_context(
+            detected_signal,
+            candles,
+            execution_candles=execution_candles,
+            execution_timeframe=config.execution_timeframe,
+        )
+        if entry_context is None:
+            trades = [None] * len(task.variant_keys)
+        else:
+            trades = simulate_trade_grid(
+                detected_signal,
+                candles,
+                execution_candles=execution_candles,
+                execution_timeframe=config.execution_timeframe,
+                entry_context=entry_context,
+                market_context=market_context,
+                variant_keys=task.variant_keys,
+                passage_index=passage_index,
+            )
+        rows.append(
+            (
+                min(*filtered.volatility_increase_pct, *filtered.volume_increase_pct),
+                float(match.level.weight) if match.level is not None else np.nan,
+                datetime.fromisoformat(match.candle.datetime).hour,
+                market_context.higher_timeframe_bias or "none",
+                market_context.volatility_regime or "none",
+                entry_context is None,
+                entry_context is not None and any(trade is None for trade in trades),
+                entry_context.entry_timestamp if entry_context is not None else 0,
+                match.candle.timestamp,
+                match.candle.symbol or "",
+                match.candle.timeframe or "",
+                match.pattern,
+                [trade.pnl_r if trade is not None else np.nan for trade in trades],
+            )
+        )
+    return _signals_from_rows(rows, len(task.variant_keys))
+
+
+def _signals_from_rows(rows: Sequence[tuple], variant_count: int) -> SweepSignals:
+    columns = list(zip(*rows)) if rows else [()] * 13
+    return SweepSignals(
+        metric_increase_pct=np.array(columns[0], dtype=np.float64),
+        level_weight=np.array(columns[1], dtype=np.float64),
+        signal_hour=np.array(columns[2], dtype=np.int64),
+        higher_timeframe_bias=np.array(columns[3], dtype=str),
+        volatility_regime=np.array(columns[4], dtype=str),
+        missing_entry=np.array(columns[5], dtype=bool),
+        invalid_risk=np.array(columns[6], dtype=bool),
+        entry_timestamp=np.array(columns[7], dtype=np.int64),
+        signal_timestamp=np.array(columns[8], dtype=np.int64),
+        symbol=np.array(columns[9], dtype=str),
+        timeframe=np.array(columns[10], dtype=str),
+        pattern=np.array(columns[11], dtype=str),
+        pnl_r=np.array(columns[12], dtype=np.float64).reshape(len(rows), variant_count).T,
+    )
+
+
+def filter_masks(
+    signals: SweepSignals,
+    filters: Sequence[SweepFilters],
+    *,
+    use_levels: bool,
+) -> np.ndarray:
+    """Boolean ``(combinations, signals)`` matrix of the signals each combination keeps."""
+
+    masks = np.ones((len(filters), len(signals)), dtype=bool)
+    for row, combination in enumerate(filters):
+        mask = masks[row]
+        if combination.min_metric_increase_pct is not None:
+            mask &= signals.metric_increase_pct >= combination.min_metric_increase_pct
+        if use_levels:
+            mask &= signals.level_weight >= combination.min_level_weight
+        if combination.exclude_hours:
+            mask &= ~np.isin(signals.signal_hour, combination.exclude_hours)
+        if combination.allowed_higher_timeframe_biases:
+            mask &= np.isin(
+                signals.higher_timeframe_bias,
+                combination.allowed_higher_timeframe_biases,
+            )
+        if combination.allowed_volatility_regimes:
+            mask &= np.isin(signals.volatility_regime, combination.allowed_volatility_regimes)
+    return masks
+
+
+def summarize_sweep(
+    signals: SweepSignals,
+    filters: Sequence[SweepFilters],
+    variant_keys: Sequence[tuple[float, float]],
+    *,
+    use_levels: bool,
+    max_cells: int = DEFAULT_SWEEP_CELLS,
+) -> list[SweepRow]:
+    """One row per combination and variant, in that order."""
+
+    chunk_size = max(1, max_cells // max(len(signals), 1))
+    rows: list[SweepRow] = []
+    for start in range(0, len(filters), chunk_size):
+        chunk = filters[start:start + chunk_size]
+        masks = filter_masks(signals, chunk, use_levels=use_levels)
+        total_signals = masks.sum(axis=1)
+        skipped_missing = (masks & signals.missing_entry).sum(axis=1)
+        skipped_invalid = (masks & signals.invalid_risk).sum(axis=1)
+        by_variant = [
+            _variant_totals(masks, signals.pnl_r[variant_index])
+            for variant_index in range(len(variant_keys))
+        ]
+        for row, combination in enumerate(chunk):
+            for (take_multiple, stop_multiple), totals in zip(variant_keys, by_variant):
+                opened, wins, losses, total_pnl_r, positive, negative, drawdown = (
+                    values[row] for values in totals
+                )
+                rows.append(
+                    _sweep_row(
+                        combination,
+                        take_multiple=take_multiple,
+                        stop_multiple=stop_multiple,
+                        total_signals=int(total_signals[row]),
+                        skipped_invalid_risk=int(skipped_invalid[row]),
+                        skipped_missing_entry_candle=int(skipped_missing[row]),
+                        total_trades_opened=int(opened),
+                        wins=int(wins),
+                        losses=int(losses),
+                        total_pnl_r=float(total_pnl_r),
+                        positive_pnl_r=float(positive),
+                        negative_pnl_r=float(negative),
+                        max_equity_drawdown_r=float(drawdown),
+                    )
+                )
+    return rows
+
+
+def _variant_totals(masks: np.ndarray, pnl_r: np.ndarray) -> tuple[np.ndarray, ...]:
+    opened = masks & ~np.isnan(pnl_r)
+    pnl = np.where(opened, pnl_r, 0.0)
+    # signals are in equity-curve order; skipped ones add 0 and leave drawdown unchanged
+    equity = np.cumsum(pnl, axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 0.0)
+    return (
+        opened.sum(axis=1),
+        (pnl > 0).sum(axis=1),
+        (pnl < 0).sum(axis=1),
+        pnl.sum(axis=1),
+        np.where(pnl > 0, pnl, 0.0).sum(axis=1),
+        np.where(pnl < 0, pnl, 0.0).sum(axis=1),
+        np.max(peak - equity, axis=1, initial=0.0),
+    )
+
+
+def _sweep_row(
+    filters: SweepFilters,
+    *,
+    take_multiple: float,
+    stop_multiple: float,
+    total_signals: int,
+    skipped_invalid_risk: int,
+    skipped_missing_entry_candle: int,
+    total_trades_opened: int,
+    wins: int,
+    losses: int,
+    total_pnl_r: float,
+    positive_pnl_r: float,
+    negative_pnl_r: float,
+    max_equity_drawdown_r: float,
+) -> SweepRow:
+    if negative_pnl_r < 0:
+        profit_factor = positive_pnl_r / abs(negative_pnl_r)
+    elif positive_pnl_r > 0:
+        profit_factor = float("inf")
+    else:
+        profit_factor = None
+    total = total_trades_opened
+    return SweepRow(
+        filters=filters,
+        take_multiple=take_multiple,
+        stop_multiple=stop_multiple,
+        total_signals=total_signals,
+        total_trades_opened=total,
+        skipped_invalid_risk=skipped_invalid_risk,
+        skipped_missing_entry_candle=skipped_missing_entry_candle,
+        wins=wins,
+        losses=losses,
+        breakevens=total - wins - losses,
+        win_rate=(wins / total) * 100 if total else 0.0,
+        total_pnl_r=total_pnl_r,
+        average_pnl_r=total_pnl_r / total if total else 0.0,
+        profit_factor=profit_factor,
+        max_equity_drawdown_r=max_equity_drawdown_r,
+    )
+
+
+def _loosest(values: Sequence[float | None]) -> float | None:
+    return None if any(value is None for value in values) else min(values)
+
+
+def run_sweep(
+    config: SignalBotBacktestConfig,
+    filters: Sequence[SweepFilters],
+    *,
+    max_cells: int = DEFAULT_SWEEP_CELLS,
+) -> SweepResult:
+    """Backtest every filter combination from one load, detection and simulation.
+
+    Series are processed in ``config.workers`` processes; each combination's
+    row matches ``run_backtest(filters.apply(config))`` for that variant.
+    """
+
+    if not filters:
+        raise ValueError("at least one filter combination is required")
+    variant_keys = build_variant_keys(config)
+    detection_config = replace(
+        config,
+        min_metric_increase_pct=_loosest([item.min_metric_increase_pct for item in filters]),
+        min_level_weight=min(item.min_level_weight for item in filters),
+    )
+    tasks = load_series_tasks(detection_config, variant_keys)
+    parts = []
+    for task, part in zip(tasks, run_series_tasks(sweep_series, tasks, workers=config.workers)):
+        print(f"[{task.symbol} {task.timeframe}] candles={len(task.candles)} signals={len(part)}")
+        parts.append(part)
+    signals = SweepSignals.concatenate(parts, len(variant_keys))
+    return SweepResult(
+        config=config,
+        rows=summarize_sweep(
+            signals,
+            filters,
+            variant_keys,
+            use_levels=config.use_levels,
+            max_cells=max_cells,
+        ),
+    )
+
+
+def sweep_result_to_json(result: SweepResult) -> str:
+    payload = asdict(result)
+    for name in RUNTIME_CONFIG_FIELDS:
+        payload["config"].pop(name, None)
+    return json.dumps(payload, ensure_ascii=True, indent=2)
+
+
+def save_sweep_result(result: SweepResult, output_file: str | Path | None = None) -> Path:
+    path = Path(output_file or result.config.output_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(sweep_result_to_json(result), encoding="utf-8")
+    return path
+
+
+def _parse_choice_sets(
+    values: Sequence[str] | None,
+    *,
+    label: str,
+    allowed_values: Sequence[str],
+) -> list[tuple[str, ...]] | None:
+    """Parse comma-separated choice sets; ``any`` disables the filter."""
+
+    if values is None:
+        return None
+    choice_sets: list[tuple[str, ...]] = []
+    for value in values:
+        current = value.strip().lower()
+        if current == NO_FILTER:
+            choice_sets.append(())
+            continue
+        choices = tuple(dict.fromkeys(item.strip() for item in current.split(",") if item.strip()))
+        unknown = [choice for choice in choices if choice not in allowed_values]
+        if unknown or not choices:
+            raise ValueError(
+                f"{label} sets must be '{NO_FILTER}' or comma lists of: {', '.join(allowed_values)}"
+            )
+        choice_sets.append(choices)
+    return choice_sets
+
+
+def _parse_hour_sets(values: Sequence[str] | None) -> list[tuple[int, ...]] | None:
+    """Parse comma-separated hour sets; ``any`` excludes no hours."""
+
+    if values is None:
+        return None
+    hour_sets: list[tuple[int, ...]] = []
+    for value in values:
+        current = value.strip().lower()
+        if current == NO_FILTER:
+            hour_sets.append(())
+            continue
+        hours = tuple(dict.fromkeys(int(item) for item in current.split(",") if item.strip()))
+        if not hours or any(hour < 0 or hour > 23 for hour in hours):
+            raise ValueError("exclude hour sets must be 'any' or comma lists of hours 0..23")
+        hour_sets.append(hours)
+    return hour_sets
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = build_parser()
+    parser.description = __doc__
+    parser.set_defaults(output_file=str(DEFAULT_OUTPUT_PATH))
+    parser.add_argument("--sweep-min-metric-increase-pct", nargs="+", type=float)
+    parser.add_argument("--sweep-min-level-weight", nargs="+", type=float)
+    parser.add_argument(
+        "--sweep-exclude-hours",
+        nargs="+",
+        help="Hour sets to exclude, e.g. any 0,1,2 22,23.",
+    )
+    parser.add_argument(
+        "--sweep-higher-timeframe-biases",
+        nargs="+",
+        help="Allowed bias sets, e.g. any bullish,neutral.",
+    )
+    parser.add_argument(
+        "--sweep-volatility-regimes",
+        nargs="+",
+        help="Allowed regime sets, e.g. any normal,expanded.",
+    )
+    parser.add_argument("--top", type=int, default=20, help="Rows to print, best total R first.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    config = build_config(args)
+    for weight in args.sweep_min_level_weight or ():
+        if weight < 0:
+            raise ValueError("min_level_weight must be greater than or equal to 0")
+    filters = build_sweep_filters(
+        config,
+        min_metric_increase_pcts=args.sweep_min_metric_increase_pct,
+        min_level_weights=args.sweep_min_level_weight,
+        exclude_hours=_parse_hour_sets(args.sweep_exclude_hours),
+        higher_timeframe_biases=_parse_choice_sets(
+            args.sweep_higher_timeframe_biases,
+            label="higher timeframe bias",
+            allowed_values=HIGHER_TIMEFRAME_BIASES,
+        ),
+        volatility_regimes=_parse_choice_sets(
+            args.sweep_volatility_regimes,
+            label="volatility regime",
+            allowed_values=VOLATILITY_REGIMES,
+        ),
+    )
+    result = run_sweep(config, filters)
+    output_path = save_sweep_result(result)
+
+    print(f"Output file: {output_path}")
+    print(f"Combinations: {len(filters)} x variants: {len(build_variant_keys(config))}")
+    print("Best by total PnL (R):")
+    for row in sorted(result.rows, key=lambda item: item.total_pnl_r, reverse=True)[: args.top]:
+        item = row.filters
+        print(
+            f"  metric>={item.min_metric_increase_pct} weight>={item.min_level_weight:g} "
+            f"exclude_hours={','.join(map(str, item.exclude_hours)) or NO_FILTER} "
+            f"bias={','.join(item.allowed_higher_timeframe_biases) or NO_FILTER} "
+            f"regime={','.join(item.allowed_volatility_regimes) or NO_FILTER} "
+            f"take={row.take_multiple:.2f} stop={row.stop_multiple:.2f} -> "
+            f"trades={row.total_trades_opened} win_rate={row.win_rate:.2f}% "
+            f"total_pnl_r={row.total_pnl_r:.4f}"
+        )
+
+
+__all__ = [
+    "SweepFilters",
+    "SweepResult",
+    "SweepRow",
+    "SweepSignals",
+    "build_sweep_filters",
+    "filter_masks",
+    "main",
+    "run_sweep",
+    "save_sweep_result",
+    "summarize_sweep",
+    "sweep_result_to_json",
+    "sweep_series",
+]
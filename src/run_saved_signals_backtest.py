@@ -12,6 +12,7 @@ from pathlib import Path
 from hermes_trading.backtest import (
     BacktestConfig,
     BacktestResult,
+    CandleCache,
     StrategyConfig,
     build_signal_events_from_saved_records,
     build_summary,
@@ -35,6 +36,10 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--date-from")
     parser.add_argument("--date-to")
     parser.add_argument("--fetch-limit", type=int, default=1000)
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for the on-disk candle cache; only missing ranges are downloaded.",
+    )
     parser.add_argument("--output-dir", default="backtest_results/saved_signals")
     parser.add_argument("--symbols", nargs="+")
     parser.add_argument("--timeframes", nargs="+")
@@ -160,9 +165,11 @@ def main() -> None:
         output_dir=output_dir,
         export_trades=not args.no_export_trades,
         export_summary=not args.no_export_summary,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
     )
 
     connector = create_connector(config.exchange)
+    cache = CandleCache(config.cache_dir) if config.cache_dir is not None else None
     records_by_series: dict[tuple[str, str], list[SavedSignalRecord]] = defaultdict(list)
     for record in filtered_records:
         records_by_series[(record.symbol, record.timeframe)].append(record)
@@ -181,6 +188,7 @@ def main() -> None:
             series_date_from,
             date_to,
             fetch_limit=config.fetch_limit,
+            cache=cache,
         )
         total_candles += len(candles)
 
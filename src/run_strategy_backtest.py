@@ -10,6 +10,7 @@ from pathlib import Path
 from hermes_trading.backtest import (
     BacktestConfig,
     BacktestResult,
+    CandleCache,
     StrategyConfig,
     build_signal_events,
     build_summary,
@@ -30,6 +31,10 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--date-from", required=True)
     parser.add_argument("--date-to", required=True)
     parser.add_argument("--fetch-limit", type=int, default=1000)
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for the on-disk candle cache; only missing ranges are downloaded.",
+    )
     parser.add_argument("--output-dir", default="backtest_results")
     parser.add_argument("--patterns", nargs="+", default=["pin_bar", "railway_tracks"])
     parser.add_argument("--min-metric-increase-pct", type=float, default=10.0)
@@ -113,6 +118,7 @@ def main() -> None:
         output_dir=Path(args.output_dir),
         export_trades=not args.no_export_trades,
         export_summary=not args.no_export_summary,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
     )
     strategy = StrategyConfig(
         patterns=tuple(args.patterns),
@@ -123,6 +129,7 @@ def main() -> None:
     strategy_variants = _build_strategy_variants(args, strategy)
 
     connector = create_connector(config.exchange)
+    cache = CandleCache(config.cache_dir) if config.cache_dir is not None else None
     total_candles = 0
     total_events = 0
     series_cache = []
@@ -136,6 +143,7 @@ def main() -> None:
                 config.date_from,
                 config.date_to,
                 fetch_limit=config.fetch_limit,
+                cache=cache,
             )
             total_candles += len(candles)
             events = build_signal_events(
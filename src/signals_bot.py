@@ -1,18 +1,42 @@
 #!/usr/bin/env python
-"""Fetch last month's candles and print any price action signals."""
+"""Scan recent candles and send price action signals to Telegram."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import argparse
+import asyncio
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 import html
+import logging
 import math
 import os
+from pathlib import Path
+from signal import SIGINT, SIGTERM
 
+from hermes_trading.candle_buffer import (
+    CandleRingBuffer,
+    load_candle_buffers,
+    save_candle_buffers,
+)
 from hermes_trading.candles import Candle
 from hermes_trading.connectors import BingXConnector
+from hermes_trading.market_context import (
+    MarketContextTracker,
+    SignalMarketContext,
+    load_context_trackers,
+    save_context_trackers,
+)
 from hermes_trading.market_sessions import (
     signal_candle_close_ms,
     signal_candle_market_session_label,
 )
+from hermes_trading.scan_engine import (
+    DEFAULT_SCAN_CONCURRENCY,
+    ScanRequest,
+    create_async_client,
+    fetch_scan_series,
+)
 from hermes_trading.signal_filters import (
     DEFAULT_MIN_METRIC_INCREASE_PCT,
     FilteredSignal,
@@ -25,14 +49,30 @@ from hermes_trading.signal_filters import (
 from hermes_trading.signals import PriceActionSignal
 from hermes_trading.telegram import TelegramClient, TelegramConfig
 from hermes_trading.time_utils import (
+    MADRID_TIMEZONE,
     is_candle_closed,
     madrid_datetime_from_timestamp_ms,
     timeframe_to_milliseconds,
 )
 
+logger = logging.getLogger(__name__)
+
 MIN_METRIC_INCREASE_PCT = DEFAULT_MIN_METRIC_INCREASE_PCT
 SCAN_INTERVAL_MS = timeframe_to_milliseconds("15m")
 ENV_METRIC_FILTER_ENABLED = "SIGNAL_METRIC_FILTER_ENABLED"
+ENV_SYMBOLS = "SIGNAL_SYMBOLS"
+ENV_SCAN_CONCURRENCY = "SIGNAL_SCAN_CONCURRENCY"
+ENV_STATE_DIR = "SIGNAL_STATE_DIR"
+ENV_SYSTEMD_STATE_DIRECTORY = "STATE_DIRECTORY"
+MARKET_CONTEXT_STATE_FILE = "market_context.json"
+CANDLE_BUFFER_STATE_FILE = "candle_buffers.json"
+SCAN_CANDLE_LIMIT = 24
+# give the exchange a moment to publish the candle that just closed
+SCAN_CLOSE_DELAY_MS = 2_000
+SCAN_WINDOW_START_HOUR = 8
+SCAN_WINDOW_END_HOUR = 23
+DEFAULT_SYMBOLS = ("BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT", "NEAR/USDT")
+TIMEFRAMES = ("15m", "30m", "1h", "4h")
 TRUTHY_CONFIG_VALUES = {"1", "true", "yes", "on"}
 FALSY_CONFIG_VALUES = {"0", "false", "no", "off", ""}
 
@@ -49,6 +89,64 @@ def metric_filter_enabled_from_env(
     raise ValueError(f"{key} must be one of: {allowed}")
 
 
+def symbols_from_env(key: str = ENV_SYMBOLS) -> list[str]:
+    """Comma-separated symbols to scan; the built-in list when unset."""
+
+    value = os.getenv(key, "")
+    symbols = [item.strip() for item in value.split(",") if item.strip()]
+    return symbols or list(DEFAULT_SYMBOLS)
+
+
+def scan_concurrency_from_env(key: str = ENV_SCAN_CONCURRENCY) -> int:
+    value = os.getenv(key, "").strip()
+    if not value:
+        return DEFAULT_SCAN_CONCURRENCY
+    try:
+        concurrency = int(value)
+    except ValueError:
+        concurrency = 0
+    if concurrency < 1:
+        raise ValueError(f"{key} must be a positive integer")
+    return concurrency
+
+
+def state_dir_from_env() -> Path | None:
+    """Directory for state kept between scans, or ``None`` to keep nothing.
+
+    ``SIGNAL_STATE_DIR`` wins; otherwise the first ``STATE_DIRECTORY`` entry
+    that systemd sets for units with ``StateDirectory=`` is used.
+    """
+
+    explicit = os.getenv(ENV_STATE_DIR, "").strip()
+    if explicit:
+        return Path(explicit)
+    systemd_dirs = os.getenv(ENV_SYSTEMD_STATE_DIRECTORY, "").strip()
+    if systemd_dirs:
+        return Path(systemd_dirs.split(":")[0])
+    return None
+
+
+def tracker_key(exchange: str, symbol: str, timeframe: str) -> str:
+    return f"{exchange}|{symbol}|{timeframe}"
+
+
+def history_limit(
+    tracker: MarketContextTracker | None,
+    timeframe: str,
+    *,
+    now_ms: int,
+) -> int:
+    """Candles to fetch so the tracker continues without a gap."""
+
+    if tracker is None:
+        return max(SCAN_CANDLE_LIMIT, MarketContextTracker(timeframe).warmup_candles)
+    last_timestamp = tracker.last_timestamp
+    window_start = now_ms - SCAN_CANDLE_LIMIT * timeframe_to_milliseconds(timeframe)
+    if last_timestamp is not None and last_timestamp >= window_start:
+        return SCAN_CANDLE_LIMIT
+    return max(SCAN_CANDLE_LIMIT, tracker.warmup_candles)
+
+
 def match_key(signal: FilteredSignal) -> str:
     match = signal.match
     return "|".join(
@@ -94,7 +192,38 @@ def should_send_signal(
     )
 
 
-def format_signal_message(signal: FilteredSignal) -> str:
+def format_market_context_lines(context: SignalMarketContext) -> list[str]:
+    lines: list[str] = []
+    if context.higher_timeframe is not None and context.higher_timeframe_bias is not None:
+        higher_timeframe = html.escape(context.higher_timeframe)
+        bias = html.escape(context.higher_timeframe_bias.title())
+        lines.append(f"<b>{higher_timeframe} bias:</b> <code>{bias}</code>")
+    if context.range_position_pct is not None:
+        lines.append(
+            f"<b>Range position ({context.range_lookback} bars):</b> "
+            f"<code>{context.range_position_pct:.1f}%</code>"
+        )
+    if (
+        context.distance_to_recent_high_pct is not None
+        and context.distance_to_recent_low_pct is not None
+    ):
+        lines.append(
+            f"<b>Distance to recent high / low ({context.recent_lookback} bars):</b> "
+            f"<code>{context.distance_to_recent_high_pct:.2f}%</code> / "
+            f"<code>{context.distance_to_recent_low_pct:.2f}%</code>"
+        )
+    if context.atr_pct is not None:
+        line = f"<b>ATR ({context.atr_period}):</b> <code>{context.atr_pct:.2f}%</code>"
+        if context.volatility_regime is not None:
+            line += f" <code>{html.escape(context.volatility_regime)}</code>"
+        lines.append(line)
+    return lines
+
+
+def format_signal_message(
+    signal: FilteredSignal,
+    market_context: SignalMarketContext | None = None,
+) -> str:
     match = signal.match
     pattern = html.escape(str(match.pattern).replace("_", " ").title())
     direction = html.escape(str(match.direction).upper())
@@ -130,101 +259,472 @@ def format_signal_message(signal: FilteredSignal) -> str:
     ):
         volume = format_percentage_pair(signal.volume_increase_pct)
         lines.append(f"<b>Volume vs {reference_context}:</b> {volume}")
+    if market_context is not None:
+        lines.extend(format_market_context_lines(market_context))
     return "\n".join(lines)
 
 
 def send_signal_notifications(
     client: TelegramClient,
     signals: list[FilteredSignal],
+    market_contexts: Mapping[str, SignalMarketContext] | None = None,
 ) -> None:
     for signal in signals:
-        client.send_text(format_signal_message(signal), parse_mode="HTML")
+        market_context = (
+            market_contexts.get(match_key(signal))
+            if market_contexts is not None
+            else None
+        )
+        client.send_text(
+            format_signal_message(signal, market_context),
+            parse_mode="HTML",
+        )
 
 
-def since_ms(interval: str, multiplier: int = 1) -> int:
-    units = {
-        "s": 1,
-        "m": 60,
-        "h": 3600,
-        "d": 86400,
-        "w": 604800,
-    }
+@dataclass
+class ScanState:
+    """Per-series state carried from one scan to the next.
 
-    value = int(interval[:-1])
-    unit = interval[-1]
-    if unit not in units:
-        raise ValueError(f"Unsupported interval: {interval}")
-    seconds = value * units[unit] * multiplier
-    dt = datetime.now(timezone.utc) - timedelta(seconds=seconds)
-    return int(dt.timestamp() * 1000)
+    ``trackers`` hold the streaming market context and ``buffers`` the latest
+    closed candles, both keyed by ``tracker_key``.
+    """
 
+    trackers: dict[str, MarketContextTracker] = field(default_factory=dict)
+    buffers: dict[str, CandleRingBuffer] = field(default_factory=dict)
 
-def main() -> None:
-    client = TelegramClient(TelegramConfig.from_env())
-    metric_filter_enabled = metric_filter_enabled_from_env()
-    connectors = [BingXConnector()]
-    timeframes = ["15m", "30m", "1h", "4h"]
-    symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT", "NEAR/USDT"]
-
-    for connector in connectors:
-        signals: list[FilteredSignal] = []
-        for symbol in symbols:
-            for timeframe in timeframes:
-                limit = 24
-                since = since_ms(timeframe, limit)
-                now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
-                ohlcv = connector.client.fetch_ohlcv(
-                    symbol,
-                    timeframe=timeframe,
-                    since=since,
-                    limit=limit,
-                    params={"paginate": True},
+    @classmethod
+    def load(cls, state_dir: Path | None) -> ScanState:
+        if state_dir is None:
+            return cls()
+        return cls(
+            trackers=load_context_trackers(state_dir / MARKET_CONTEXT_STATE_FILE),
+            buffers=load_candle_buffers(state_dir / CANDLE_BUFFER_STATE_FILE),
+        )
+
+    def save(self, state_dir: Path | None) -> None:
+        if state_dir is None:
+            return
+        save_context_trackers(state_dir / MARKET_CONTEXT_STATE_FILE, self.trackers)
+        save_candle_buffers(state_dir / CANDLE_BUFFER_STATE_FILE, self.buffers)
+
+
+def plan_scan_request(
+    exchange: str,
+    symbol: str,
+    timeframe: str,
+    state: ScanState,
+    *,
+    now_ms: int,
+) -> ScanRequest:
+    """Request only the candles after the buffered ones when the series is warm.
+
+    Series whose tracker fell behind are dropped so they warm up from scratch;
+    a buffer that no longer reaches the present is refilled in full.
+    """
+
+    key = tracker_key(exchange, symbol, timeframe)
+    tracker = state.trackers.get(key)
+    buffer = state.buffers.get(key)
+    limit = history_limit(tracker, timeframe, now_ms=now_ms)
+    if limit > SCAN_CANDLE_LIMIT:
+        # a gap since the last scan would skew the context; start over
+        state.trackers.pop(key, None)
+        state.buffers.pop(key, None)
+    elif (
+        tracker is not None
+        and buffer is not None
+        and buffer.covers(now_ms)
+        and buffer.last_timestamp == tracker.last_timestamp
+    ):
+        timeframe_ms = timeframe_to_milliseconds(timeframe)
+        since = buffer.last_timestamp + timeframe_ms
+        return ScanRequest(
+            symbol=symbol,
+            timeframe=timeframe,
+            since=since,
+            # the candles closed since the buffer plus the one still open
+            limit=max(now_ms - since, 0) // timeframe_ms + 1,
+        )
+    else:
+        state.buffers.pop(key, None)
+    return full_scan_request(symbol, timeframe, now_ms=now_ms, limit=limit)
+
+
+def full_scan_request(
+    symbol: str,
+    timeframe: str,
+    *,
+    now_ms: int,
+    limit: int = SCAN_CANDLE_LIMIT,
+) -> ScanRequest:
+    return ScanRequest(
+        symbol=symbol,
+        timeframe=timeframe,
+        since=now_ms - limit * timeframe_to_milliseconds(timeframe),
+        limit=limit,
+        params={"paginate": True},
+    )
+
+
+def plan_scan_requests(
+    exchange: str,
+    symbols: Sequence[str],
+    timeframes: Sequence[str],
+    state: ScanState,
+    *,
+    now_ms: int,
+) -> list[ScanRequest]:
+    return [
+        plan_scan_request(exchange, symbol, timeframe, state, now_ms=now_ms)
+        for symbol in symbols
+        for timeframe in timeframes
+    ]
+
+
+def closed_candles(
+    symbol: str,
+    timeframe: str,
+    ohlcv: list[list[float]],
+    *,
+    now_ms: int,
+) -> list[Candle]:
+    return [
+        Candle(
+            timestamp=ts,
+            datetime=madrid_datetime_from_timestamp_ms(int(ts)),
+            open=o,
+            high=h,
+            low=l,
+            close=c,
+            volume=v,
+            symbol=symbol,
+            timeframe=timeframe,
+        )
+        for ts, o, h, l, c, v in ohlcv
+        if is_candle_closed(int(ts), timeframe, now_ms=now_ms)
+    ]
+
+
+def update_series_state(
+    exchange: str,
+    request: ScanRequest,
+    ohlcv: list[list[float]],
+    state: ScanState,
+    *,
+    now_ms: int,
+) -> list[Candle] | None:
+    """Fold fetched candles into the series state and return its recent candles.
+
+    Returns ``None`` when an incremental fetch does not continue the buffer,
+    in which case the series needs a full refill.
+    """
+
+    key = tracker_key(exchange, request.symbol, request.timeframe)
+    candles = closed_candles(request.symbol, request.timeframe, ohlcv, now_ms=now_ms)
+    buffer = state.buffers.get(key)
+    incremental = (
+        buffer is not None
+        and buffer.last_timestamp is not None
+        and request.since > buffer.last_timestamp
+    )
+    if not incremental:
+        buffer = state.buffers[key] = CandleRingBuffer(request.timeframe, SCAN_CANDLE_LIMIT)
+    rows = [
+        (candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume)
+        for candle in candles
+    ]
+    if not buffer.extend(rows) and incremental:
+        state.buffers.pop(key, None)
+        return None
+
+    tracker = state.trackers.get(key)
+    if tracker is None:
+        tracker = state.trackers[key] = MarketContextTracker(request.timeframe)
+    for candle in candles:
+        tracker.update(candle)
+    return buffer.candles(request.symbol)
+
+
+def detect_series_signals(
+    candles: Sequence[Candle],
+    timeframe: str,
+    tracker: MarketContextTracker,
+    *,
+    now_ms: int,
+    metric_filter_enabled: bool,
+) -> list[tuple[FilteredSignal, SignalMarketContext | None]]:
+    """Return the signals to send for the latest closed ``candles`` of a series."""
+
+    batch = latest_fresh_batch(
+        candles,
+        timeframe,
+        now_ms=now_ms,
+        freshness_ms=SCAN_INTERVAL_MS,
+    )
+    if batch is None:
+        return []
+
+    market_context = (
+        tracker.context()
+        if tracker.last_timestamp == batch.candles[-1].timestamp
+        else None
+    )
+    detector = PriceActionSignal()
+    signals = []
+    for match in latest_matches(detector, batch):
+        measured_signal = build_signal_metrics(match, batch)
+        if measured_signal is not None and should_send_signal(
+            measured_signal,
+            metric_filter_enabled=metric_filter_enabled,
+        ):
+            signals.append((measured_signal, market_context))
+    return signals
+
+
+async def scan_exchange(
+    exchange: str,
+    async_client,
+    client: TelegramClient,
+    symbols: Sequence[str],
+    timeframes: Sequence[str],
+    state: ScanState,
+    *,
+    metric_filter_enabled: bool,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+) -> None:
+    """Fetch every series concurrently and notify as each one arrives."""
+
+    now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+    requests = plan_scan_requests(exchange, symbols, timeframes, state, now_ms=now_ms)
+    seen: set[str] = set()
+    while requests:
+        refills: list[ScanRequest] = []
+        async for request, ohlcv in fetch_scan_series(
+            async_client,
+            requests,
+            concurrency=concurrency,
+        ):
+            now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+            candles = update_series_state(exchange, request, ohlcv, state, now_ms=now_ms)
+            if candles is None:
+                logger.info("Refilling %s %s after a gap", request.symbol, request.timeframe)
+                refills.append(
+                    full_scan_request(request.symbol, request.timeframe, now_ms=now_ms)
+                )
+                continue
+
+            signals: list[FilteredSignal] = []
+            market_contexts: dict[str, SignalMarketContext] = {}
+            for signal, market_context in detect_series_signals(
+                candles,
+                request.timeframe,
+                state.trackers[tracker_key(exchange, request.symbol, request.timeframe)],
+                now_ms=now_ms,
+                metric_filter_enabled=metric_filter_enabled,
+            ):
+                signal_key = match_key(signal)
+                if signal_key in seen:
+                    continue
+                seen.add(signal_key)
+                signals.append(signal)
+                if market_context is not None:
+                    market_contexts[signal_key] = market_context
+
+            if signals:
+                # the Telegram client blocks; keep the other fetches moving
+                await asyncio.to_thread(
+                    send_signal_notifications, client, signals, market_contexts
                 )
+        requests = refills
 
-                candles = [
-                    Candle(
-                        timestamp=ts,
-                        datetime=madrid_datetime_from_timestamp_ms(int(ts)),
-                        open=o,
-                        high=h,
-                        low=l,
-                        close=c,
-                        volume=v,
-                        symbol=symbol,
-                        timeframe=timeframe,
+
+async def scan_connector(
+    connector,
+    client: TelegramClient,
+    symbols: Sequence[str],
+    timeframes: Sequence[str],
+    state: ScanState,
+    *,
+    metric_filter_enabled: bool,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+) -> None:
+    async_client = create_async_client(connector)
+    try:
+        await scan_exchange(
+            connector.client.id,
+            async_client,
+            client,
+            symbols,
+            timeframes,
+            state,
+            metric_filter_enabled=metric_filter_enabled,
+            concurrency=concurrency,
+        )
+    finally:
+        await async_client.close()
+
+
+async def scan(
+    connectors: Sequence,
+    client: TelegramClient,
+    symbols: Sequence[str],
+    timeframes: Sequence[str],
+    state: ScanState,
+    *,
+    metric_filter_enabled: bool,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+) -> None:
+    await asyncio.gather(
+        *(
+            scan_connector(
+                connector,
+                client,
+                symbols,
+                timeframes,
+                state,
+                metric_filter_enabled=metric_filter_enabled,
+                concurrency=concurrency,
+            )
+            for connector in connectors
+        )
+    )
+
+
+def next_scan_close(now_ms: int, timeframes: Sequence[str]) -> tuple[int, list[str]]:
+    """Return the next candle close after ``now_ms`` and the timeframes closing then."""
+
+    closes = {}
+    for timeframe in timeframes:
+        timeframe_ms = timeframe_to_milliseconds(timeframe)
+        closes[timeframe] = (now_ms // timeframe_ms + 1) * timeframe_ms
+    close_ms = min(closes.values())
+    return close_ms, [timeframe for timeframe in timeframes if closes[timeframe] == close_ms]
+
+
+def in_scan_window(close_ms: int) -> bool:
+    """Whether a close falls in the Madrid trading window the timer covers."""
+
+    close = datetime.fromtimestamp(close_ms / 1000, tz=MADRID_TIMEZONE)
+    if SCAN_WINDOW_START_HOUR <= close.hour < SCAN_WINDOW_END_HOUR:
+        return True
+    return close.hour == SCAN_WINDOW_END_HOUR and close.minute == 0
+
+
+async def run_daemon(
+    connectors: Sequence,
+    client: TelegramClient,
+    symbols: Sequence[str],
+    timeframes: Sequence[str],
+    state: ScanState,
+    *,
+    metric_filter_enabled: bool,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    state_dir: Path | None = None,
+    stop: asyncio.Event | None = None,
+) -> None:
+    """Scan each timeframe right after its candles close until ``stop`` is set.
+
+    Exchange clients, their loaded markets and HTTP sessions, and the scan
+    state stay in memory between scans.
+    """
+
+    stop = stop or asyncio.Event()
+    async_clients = [
+        (connector.client.id, create_async_client(connector)) for connector in connectors
+    ]
+    try:
+        await asyncio.gather(*(async_client.load_markets() for _, async_client in async_clients))
+        while not stop.is_set():
+            now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+            close_ms, due_timeframes = next_scan_close(now_ms, timeframes)
+            delay_s = (close_ms + SCAN_CLOSE_DELAY_MS - now_ms) / 1000
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=delay_s)
+            except asyncio.TimeoutError:
+                pass
+            if stop.is_set() or not in_scan_window(close_ms):
+                continue
+            try:
+                await asyncio.gather(
+                    *(
+                        scan_exchange(
+                            exchange,
+                            async_client,
+                            client,
+                            symbols,
+                            due_timeframes,
+                            state,
+                            metric_filter_enabled=metric_filter_enabled,
+                            concurrency=concurrency,
+                        )
+                        for exchange, async_client in async_clients
                     )
-                    for ts, o, h, l, c, v in ohlcv
-                    if is_candle_closed(int(ts), timeframe, now_ms=now_ms)
-                ]
-
-                batch = latest_fresh_batch(
-                    candles,
-                    timeframe,
-                    now_ms=now_ms,
-                    freshness_ms=SCAN_INTERVAL_MS,
                 )
-                if batch is None:
-                    continue
+            except Exception:
+                # keep serving later closes; systemd restarts us only on a crash
+                logger.exception("Scan for %s closes failed", ", ".join(due_timeframes))
+            state.save(state_dir)
+    finally:
+        await asyncio.gather(*(async_client.close() for _, async_client in async_clients))
+        state.save(state_dir)
+
+
+async def _run_daemon_until_signalled(**kwargs) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (SIGINT, SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    await run_daemon(stop=stop, **kwargs)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="stay resident and scan right after each candle close",
+    )
+    return parser.parse_args(argv)
+
 
-                detector = PriceActionSignal()
-                for match in latest_matches(detector, batch):
-                    measured_signal = build_signal_metrics(match, batch)
-                    if measured_signal is not None and should_send_signal(
-                        measured_signal,
-                        metric_filter_enabled=metric_filter_enabled,
-                    ):
-                        signals.append(measured_signal)
-
-        seen = set()
-        unique_signals: list[FilteredSignal] = []
-
-        for signal in signals:
-            key = match_key(signal)
-            if key not in seen:
-                seen.add(key)
-                unique_signals.append(signal)
-
-        send_signal_notifications(client, unique_signals)
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    client = TelegramClient(TelegramConfig.from_env())
+    metric_filter_enabled = metric_filter_enabled_from_env()
+    concurrency = scan_concurrency_from_env()
+    connectors = [BingXConnector()]
+    symbols = symbols_from_env()
+    state_dir = state_dir_from_env()
+    state = ScanState.load(state_dir)
+
+    if args.daemon:
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+        asyncio.run(
+            _run_daemon_until_signalled(
+                connectors=connectors,
+                client=client,
+                symbols=symbols,
+                timeframes=TIMEFRAMES,
+                state=state,
+                metric_filter_enabled=metric_filter_enabled,
+                concurrency=concurrency,
+                state_dir=state_dir,
+            )
+        )
+        return
+
+    asyncio.run(
+        scan(
+            connectors,
+            client,
+            symbols,
+            TIMEFRAMES,
+            state,
+            metric_filter_enabled=metric_filter_enabled,
+            concurrency=concurrency,
+        )
+    )
+    state.save(state_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,8 @@
+#!/usr/bin/env python
+"""Sweep signals_bot backtest filters over one shared simulation."""
+
+from hermes_trading.signals_bot_sweep import main
+
+
+if __name__ == "__main__":
+    main()
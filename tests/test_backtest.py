@@ -137,3 +137,28 @@ def test_simulate_candles_logs_internal_same_and_opposite_signals() -> None:
     assert trade.opposite_direction_signal_count == 1
     assert trade.same_direction_signal_timestamps == [2]
     assert trade.opposite_direction_signal_timestamps == [3]
+
+
+def test_simulate_candles_skips_quiet_bars_to_far_take_profit() -> None:
+    candles = [_cndl(0, 95, 101, 90, 100, volume=200)]
+    candles.extend(_cndl(ts, 101, 102 + (ts % 3), 99 - (ts % 2), 101) for ts in range(1, 300))
+    candles.append(_cndl(300, 101, 125, 100, 124))
+    events = [
+        _signal_event(candles[0]),
+        _signal_event(candles[150], direction="short"),
+    ]
+
+    trades = simulate_candles(candles, events, StrategyConfig(take_profit_r=2.0))
+
+    assert len(trades) == 1
+    trade = trades[0]
+    assert trade.exit_reason == "take_profit"
+    assert trade.exit_timestamp == 300
+    assert trade.bars_in_trade == 300
+    assert trade.mfe_abs == 24
+    assert trade.mae_abs == 3
+    assert trade.best_price_reached == 125
+    assert trade.worst_price_reached == 98
+    assert trade.best_take_step_r == 2.0
+    assert trade.r_step_hit_times["0.25R"]["bars"] == 1
+    assert trade.opposite_direction_signal_timestamps == [150]
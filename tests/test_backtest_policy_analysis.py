@@ -1,10 +1,20 @@
+import random
+
+import pytest
+
 from hermes_trading.backtest.policy_analysis import (
     ExitPolicy,
     ExitLeg,
+    PolicyMatrix,
     TradeExitObservation,
+    enumerate_scale_out_policies,
+    evaluate_policy_matrix,
     evaluate_policy_pnl,
+    observation_arrays,
     parse_exit_policy,
+    summarize_exit_policies,
     summarize_exit_policy,
+    target_lattice,
 )
 
 
@@ -41,3 +51,57 @@ def test_summarize_exit_policy_handles_scale_out() -> None:
     assert summary.breakeven_trades == 1
     assert round(summary.total_pnl_r, 6) == 1.9
     assert round(summary.average_pnl_r, 6) == round(1.9 / 3, 6)
+
+
+def _random_observations(count: int) -> list[TradeExitObservation]:
+    rng = random.Random(3)
+    return [
+        TradeExitObservation(
+            pnl_r=rng.choice((-1.0, -0.5, 0.0, 0.75, 2.0)),
+            best_take_step_r=rng.choice((0.0, 0.25, 0.5, 1.0, 1.75, 2.0, 3.0)),
+        )
+        for _ in range(count)
+    ]
+
+
+def test_policy_matrix_matches_per_trade_evaluation() -> None:
+    trades = _random_observations(200)
+    policies = [
+        parse_exit_policy(spec)
+        for spec in ("hold", "fixed:1", "scale:0.5@1,0.5@2", "scale:0.25@0.5,0.25@1.75")
+    ]
+
+    pnls = evaluate_policy_matrix(*observation_arrays(trades), PolicyMatrix.from_policies(policies))
+
+    assert pnls.shape == (4, 200)
+    for row, policy in enumerate(policies):
+        assert pnls[row].tolist() == pytest.approx([evaluate_policy_pnl(trade, policy) for trade in trades])
+
+
+def test_summarize_exit_policies_is_independent_of_chunking() -> None:
+    trades = _random_observations(50)
+    policies = list(enumerate_scale_out_policies([1.0, 2.0], max_legs=2))
+
+    chunked = summarize_exit_policies(trades, policies, max_cells=70)
+    whole = summarize_exit_policies(trades, policies)
+
+    assert [summary.policy_name for summary in chunked] == [policy.name for policy in policies]
+    for left, right in zip(chunked, whole):
+        assert left.win_trades == right.win_trades
+        assert left.total_pnl_r == pytest.approx(right.total_pnl_r)
+    assert summarize_exit_policy(trades, policies[3]).total_pnl_r == pytest.approx(whole[3].total_pnl_r)
+
+
+def test_enumerate_scale_out_policies_covers_the_lattice() -> None:
+    targets = target_lattice(0.25, 1.0)
+    policies = list(enumerate_scale_out_policies(targets, fraction_step=0.25, max_legs=3))
+    names = [policy.name for policy in policies]
+
+    assert targets == [0.25, 0.5, 0.75, 1.0]
+    # 1 leg: 4 fractions x 4 targets; 2 legs: 6 splits x 6 pairs; 3 legs: 4 splits x 4 triples
+    assert len(policies) == 16 + 36 + 16
+    assert len(set(names)) == len(names)
+    assert "fixed:0.5" in names
+    assert "scale:0.25@0.25,0.5@1,0.25@actual" in names
+    for policy in policies:
+        assert parse_exit_policy(policy.name) == policy
@@ -0,0 +1,52 @@
+from hermes_trading.candle_buffer import (
+    CandleRingBuffer,
+    load_candle_buffers,
+    save_candle_buffers,
+)
+
+HOUR_MS = 3_600_000
+START_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+
+
+def _rows(start: int, stop: int) -> list[list[float]]:
+    return [
+        [START_MS + idx * HOUR_MS, 100 + idx, 101 + idx, 99 + idx, 100.5 + idx, 10 + idx]
+        for idx in range(start, stop)
+    ]
+
+
+def test_ring_buffer_keeps_latest_rows_and_skips_overlap() -> None:
+    buffer = CandleRingBuffer("1h", 4)
+
+    assert buffer.extend(_rows(0, 3))
+    assert buffer.extend(_rows(1, 6))
+
+    candles = buffer.candles("BTC/USDT")
+    assert [candle.timestamp for candle in candles] == [START_MS + idx * HOUR_MS for idx in range(2, 6)]
+    assert candles[-1].close == 105.5
+    assert candles[-1].symbol == "BTC/USDT"
+    assert candles[-1].timeframe == "1h"
+    assert buffer.covers(START_MS + 9 * HOUR_MS)
+    assert not buffer.covers(START_MS + 10 * HOUR_MS)
+
+
+def test_ring_buffer_restarts_on_gap() -> None:
+    buffer = CandleRingBuffer("1h", 4)
+    buffer.extend(_rows(0, 4))
+
+    assert not buffer.extend(_rows(5, 7))
+    assert buffer.last_timestamp == START_MS + 6 * HOUR_MS
+    assert len(buffer) == 2
+    assert not buffer.covers(START_MS + 7 * HOUR_MS)
+
+
+def test_ring_buffers_round_trip_through_state_file(tmp_path) -> None:
+    buffer = CandleRingBuffer("1h", 4)
+    buffer.extend(_rows(0, 6))
+    path = tmp_path / "candle_buffers.json"
+
+    save_candle_buffers(path, {"binance|BTC/USDT|1h": buffer})
+    loaded = load_candle_buffers(path)["binance|BTC/USDT|1h"]
+
+    assert loaded.to_dict() == buffer.to_dict()
+    assert load_candle_buffers(tmp_path / "missing.json") == {}
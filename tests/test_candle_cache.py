@@ -0,0 +1,217 @@
+import numpy as np
+import pytest
+
+from hermes_trading.backtest.candle_archive import HEADER_SIZE, open_archive, write_archive
+from hermes_trading.backtest.candle_cache import (
+    CandleCache,
+    SQLiteCandleCache,
+    merge_ranges,
+    missing_ranges,
+)
+from hermes_trading.backtest.data_loader import (
+    RateBudget,
+    _cached_ohlcv_series,
+    fetch_historical_series,
+    fetch_historical_series_batch,
+    plan_page_windows,
+)
+
+HOUR_MS = 3_600_000
+START_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+
+
+class _FakeClient:
+    id = "binance"
+
+    def __init__(self, rows: list[list[float]]) -> None:
+        self.rows = rows
+        self.calls: list[int] = []
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls.append(since)
+        return [row for row in self.rows if row[0] >= since][:limit]
+
+
+class _FakeConnector:
+    def __init__(self, rows: list[list[float]]) -> None:
+        self.client = _FakeClient(rows)
+
+
+def _rows(count: int) -> list[list[float]]:
+    return [
+        [START_MS + idx * HOUR_MS, 100 + idx, 101 + idx, 99 + idx, 100.5 + idx, 10 + idx]
+        for idx in range(count)
+    ]
+
+
+def _load(connector, cache, start_idx: int, end_idx: int, *, now_idx: int = 1_000):
+    return _cached_ohlcv_series(
+        connector,
+        "BTC/USDT",
+        "1h",
+        START_MS + start_idx * HOUR_MS,
+        START_MS + end_idx * HOUR_MS,
+        fetch_limit=24,
+        cache=cache,
+        now_ms=START_MS + now_idx * HOUR_MS,
+    )
+
+
+def test_cached_series_is_served_from_disk_on_repeat(tmp_path) -> None:
+    connector = _FakeConnector(_rows(100))
+    cache = CandleCache(tmp_path)
+
+    first = _load(connector, cache, 0, 72)
+    calls_after_first = len(connector.client.calls)
+    second = _load(connector, CandleCache(tmp_path), 10, 50)
+
+    assert calls_after_first > 0
+    assert len(connector.client.calls) == calls_after_first
+    assert first.timestamp[10:50].tolist() == second.timestamp.tolist()
+    assert second.close.tolist() == [100.5 + idx for idx in range(10, 50)]
+    assert second.symbol == "BTC/USDT"
+    assert second.timeframe == "1h"
+
+
+def test_cached_series_fetches_only_missing_gap(tmp_path) -> None:
+    connector = _FakeConnector(_rows(100))
+    cache = CandleCache(tmp_path)
+
+    _load(connector, cache, 24, 48)
+    connector.client.calls.clear()
+    series = _load(connector, cache, 0, 72)
+
+    assert connector.client.calls == [START_MS, START_MS + 48 * HOUR_MS]
+    assert series.timestamp.tolist() == [START_MS + idx * HOUR_MS for idx in range(72)]
+    assert cache.load("binance", "BTC/USDT", "1h").complete_ranges == (
+        (START_MS, START_MS + 72 * HOUR_MS),
+    )
+
+
+def test_cached_series_does_not_persist_unclosed_candles(tmp_path) -> None:
+    connector = _FakeConnector(_rows(10))
+    cache = CandleCache(tmp_path)
+
+    series = _load(connector, cache, 0, 10, now_idx=9)
+    cached = cache.load("binance", "BTC/USDT", "1h")
+
+    assert len(series) == 10
+    assert len(cached) == 9
+    assert cached.complete_ranges == ((START_MS, START_MS + 8 * HOUR_MS + 1),)
+
+
+def test_range_helpers_merge_and_report_gaps() -> None:
+    assert merge_ranges([(5, 7), (0, 2), (2, 4), (6, 9)]) == ((0, 4), (5, 9))
+    assert missing_ranges(0, 10, ((2, 4), (6, 8))) == [(0, 2), (4, 6), (8, 10)]
+    assert missing_ranges(3, 7, ((0, 10),)) == []
+
+
+def test_archive_round_trip_maps_fixed_records(tmp_path) -> None:
+    path = tmp_path / "btc.candles"
+    timestamp = np.array([10, 20, 30], dtype=np.int64)
+    columns = {
+        name: np.array([1.0, 2.0, 3.0]) + offset
+        for offset, name in enumerate(("open", "high", "low", "close", "volume"))
+    }
+    write_archive(path, timestamp, columns)
+
+    records = open_archive(path)
+    assert isinstance(records, np.memmap)
+    assert path.stat().st_size == HEADER_SIZE + 3 * records.dtype.itemsize
+    assert records["timestamp"].tolist() == [10, 20, 30]
+    assert records["close"].tolist() == [4.0, 5.0, 6.0]
+
+
+def test_cached_series_views_share_the_mapped_archive(tmp_path) -> None:
+    connector = _FakeConnector(_rows(48))
+    cache = CandleCache(tmp_path)
+    _load(connector, cache, 0, 48)
+
+    cached = cache.load("binance", "BTC/USDT", "1h")
+    series = cached.series_between(START_MS + 5 * HOUR_MS, START_MS + 20 * HOUR_MS)
+
+    assert len(series) == 15
+    assert np.shares_memory(series.close, cached.columns["close"])
+    assert np.shares_memory(series.timestamp, cached.timestamp)
+
+
+def test_archive_rejects_unsorted_timestamps_and_foreign_files(tmp_path) -> None:
+    columns = {name: np.zeros(2) for name in ("open", "high", "low", "close", "volume")}
+    with pytest.raises(ValueError, match="strictly increasing"):
+        write_archive(tmp_path / "bad.candles", np.array([20, 10]), columns)
+
+    foreign = tmp_path / "foreign.candles"
+    foreign.write_bytes(b"not an archive at all, definitely not")
+    with pytest.raises(ValueError, match="not a candle archive"):
+        open_archive(foreign)
+
+
+def test_plan_page_windows_covers_range_with_one_page_each() -> None:
+    assert plan_page_windows(0, 10 * HOUR_MS, "1h", 4) == [
+        (0, 4 * HOUR_MS),
+        (4 * HOUR_MS, 8 * HOUR_MS),
+        (8 * HOUR_MS, 10 * HOUR_MS),
+    ]
+
+
+def test_batch_fetch_matches_serial_fetch(tmp_path) -> None:
+    connector = _FakeConnector(_rows(200))
+    date_from = "2026-01-01T00:00:00Z"
+    date_to = "2026-01-07T00:00:00Z"
+
+    loaded = fetch_historical_series_batch(
+        connector,
+        [("BTC/USDT", "1h"), ("ETH/USDT", "1h"), ("BTC/USDT", "1h")],
+        date_from,
+        date_to,
+        fetch_limit=10,
+        workers=3,
+    )
+    serial = fetch_historical_series(connector, "BTC/USDT", "1h", date_from, date_to, fetch_limit=10)
+
+    assert list(loaded) == [("BTC/USDT", "1h"), ("ETH/USDT", "1h")]
+    assert loaded[("BTC/USDT", "1h")].timestamp.tolist() == serial.timestamp.tolist()
+    assert loaded[("BTC/USDT", "1h")].close.tolist() == serial.close.tolist()
+    assert loaded[("ETH/USDT", "1h")].symbol == "ETH/USDT"
+
+    cache = CandleCache(tmp_path)
+    connector.client.calls.clear()
+    fetch_historical_series_batch(
+        connector, [("BTC/USDT", "1h")], date_from, date_to, fetch_limit=10, cache=cache
+    )
+    calls_after_first = len(connector.client.calls)
+    cached = fetch_historical_series_batch(
+        connector, [("BTC/USDT", "1h")], date_from, date_to, fetch_limit=10, cache=cache
+    )
+
+    assert calls_after_first == 15
+    assert len(connector.client.calls) == calls_after_first
+    assert cached[("BTC/USDT", "1h")].timestamp.tolist() == serial.timestamp.tolist()
+
+
+def test_rate_budget_spaces_requests(monkeypatch) -> None:
+    moments = iter([0.0, 0.0, 0.0])
+    sleeps: list[float] = []
+    monkeypatch.setattr("hermes_trading.backtest.data_loader.time.monotonic", lambda: next(moments))
+    monkeypatch.setattr("hermes_trading.backtest.data_loader.time.sleep", sleeps.append)
+
+    budget = RateBudget(100)
+    for _ in range(3):
+        budget.acquire()
+
+    assert sleeps == pytest.approx([0.1, 0.2])
+
+
+def test_sqlite_cache_serves_repeat_loads_from_the_bot_database(tmp_path) -> None:
+    connector = _FakeConnector(_rows(100))
+    path = tmp_path / "trading.sqlite"
+
+    first = _load(connector, SQLiteCandleCache(path), 0, 72)
+    calls_after_first = len(connector.client.calls)
+    cache = SQLiteCandleCache(path)
+    second = _load(connector, cache, 10, 50)
+
+    assert len(connector.client.calls) == calls_after_first
+    assert second.timestamp.tolist() == first.timestamp[10:50].tolist()
+    assert second.volume.tolist() == [10 + idx for idx in range(10, 50)]
+    assert cache.storage.complete_ranges("BTC/USDT", "1h") == ((START_MS, START_MS + 72 * HOUR_MS),)
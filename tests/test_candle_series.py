@@ -0,0 +1,102 @@
+import numpy as np
+
+from hermes_trading.candles import Candle, CandleSeries
+from hermes_trading.liquidity import LiquidityLevels
+from hermes_trading.signals_bot_backtest import filter_closed_candles, find_entry_candle_index
+from hermes_trading.time_utils import madrid_datetime_from_timestamp_ms
+
+BASE_TIMESTAMP = 1_767_225_600_000
+STEP_MS = 15 * 60_000
+
+
+def _rows(count: int) -> list[list[float]]:
+    rows = []
+    price = 100.0
+    for index in range(count):
+        swing = 3.0 if index % 7 == 3 else -2.0 if index % 5 == 2 else 0.5
+        price += swing
+        rows.append(
+            [
+                BASE_TIMESTAMP + index * STEP_MS,
+                price,
+                price + 1.5 + (index % 3),
+                price - 1.0 - (index % 4),
+                price + 0.25,
+                100.0 + index,
+            ]
+        )
+    return rows
+
+
+def test_candle_series_from_ohlcv_builds_madrid_candle_views() -> None:
+    series = CandleSeries.from_ohlcv(_rows(3), symbol="BTC/USDT", timeframe="15m")
+
+    candle = series[1]
+
+    assert len(series) == 3
+    assert candle == Candle(
+        timestamp=BASE_TIMESTAMP + STEP_MS,
+        datetime=madrid_datetime_from_timestamp_ms(BASE_TIMESTAMP + STEP_MS),
+        open=101.0,
+        high=103.5,
+        low=99.0,
+        close=101.25,
+        volume=101.0,
+        symbol="BTC/USDT",
+        timeframe="15m",
+    )
+    assert series[-1].timestamp == BASE_TIMESTAMP + 2 * STEP_MS
+
+
+def test_candle_series_slices_share_buffers() -> None:
+    series = CandleSeries.from_ohlcv(_rows(10), symbol="BTC/USDT", timeframe="15m")
+
+    window = series[2:6]
+
+    assert isinstance(window, CandleSeries)
+    assert len(window) == 4
+    assert np.shares_memory(window.high, series.high)
+    assert window[0] == series[2]
+    assert [candle.timestamp for candle in window] == list(series.timestamp[2:6])
+
+
+def test_candle_series_round_trips_candle_objects() -> None:
+    candles = CandleSeries.from_ohlcv(_rows(5), symbol="ETH/USDT", timeframe="15m").to_candles()
+    candles[0].datetime = "custom"
+
+    series = CandleSeries.from_candles(candles)
+
+    assert series.symbol == "ETH/USDT"
+    assert series.timeframe == "15m"
+    assert series.to_candles() == candles
+
+
+def test_filter_closed_candles_returns_closed_series_prefix() -> None:
+    series = CandleSeries.from_ohlcv(_rows(4), symbol="BTC/USDT", timeframe="15m")
+
+    closed = filter_closed_candles(series, now_ms=BASE_TIMESTAMP + 3 * STEP_MS)
+
+    assert isinstance(closed, CandleSeries)
+    assert closed.to_candles() == filter_closed_candles(
+        series.to_candles(),
+        now_ms=BASE_TIMESTAMP + 3 * STEP_MS,
+    )
+
+
+def test_find_entry_candle_index_accepts_series() -> None:
+    series = CandleSeries.from_ohlcv(_rows(4), symbol="BTC/USDT", timeframe="15m")
+
+    assert find_entry_candle_index(series, BASE_TIMESTAMP + STEP_MS + 1) == 2
+    assert find_entry_candle_index(series, BASE_TIMESTAMP + 10 * STEP_MS) is None
+
+
+def test_liquidity_levels_build_accepts_series() -> None:
+    series = CandleSeries.from_ohlcv(_rows(120), symbol="BTC/USDT", timeframe="15m")
+    from_series = LiquidityLevels()
+    from_list = LiquidityLevels()
+
+    from_series.build(series)
+    from_list.build(series.to_candles())
+
+    assert from_series.levels
+    assert from_series.levels == from_list.levels
@@ -58,3 +58,19 @@ def test_server_update_script_enforces_safe_deployment_order() -> None:
     verify_position = script.index('"${SYSTEMD_ANALYZE}" verify')
 
     assert fetch_position < stop_position < verify_position < enable_position
+
+
+def test_signal_daemon_unit_runs_resident_scanner() -> None:
+    unit = (
+        REPOSITORY_ROOT / "deploy" / "systemd" / "hermes-signals-daemon.service"
+    ).read_text(encoding="utf-8")
+    lines = unit.splitlines()
+
+    assert "Type=simple" in lines
+    assert "Restart=on-failure" in lines
+    assert "Conflicts=hermes-signals-bot.timer hermes-signals-bot.service" in lines
+    assert any(
+        line.startswith("ExecStart=") and line.endswith("signals_bot.py --daemon")
+        for line in lines
+    )
+    assert "StateDirectory=hermes-signals-bot" in lines
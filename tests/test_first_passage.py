@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from hermes_trading.backtest.first_passage import FirstPassageIndex
+
+
+def test_first_passage_index_matches_linear_scans() -> None:
+    rng = random.Random(8)
+    for length in (1, 2, 7, 64, 129):
+        high = [rng.uniform(90, 110) for _ in range(length)]
+        low = [value - rng.uniform(0, 5) for value in high]
+        index = FirstPassageIndex(high, low)
+        assert len(index) == length
+
+        for _ in range(200):
+            start = rng.randrange(length + 1)
+            price = rng.uniform(80, 115)
+            assert index.first_high_at_least(start, price) == next(
+                (pos for pos in range(start, length) if high[pos] >= price),
+                length,
+            )
+            assert index.first_low_at_most(start, price) == next(
+                (pos for pos in range(start, length) if low[pos] <= price),
+                length,
+            )
+            stop = rng.randrange(start, length + 1)
+            assert index.max_high(start, stop) == max(high[start:stop], default=float("-inf"))
+            assert index.min_low(start, stop) == min(low[start:stop], default=float("inf"))
+
+
+def test_first_passage_index_rejects_mismatched_columns() -> None:
+    with pytest.raises(ValueError, match="equal length"):
+        FirstPassageIndex([1.0, 2.0], [1.0])
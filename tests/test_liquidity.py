@@ -0,0 +1,234 @@
+import random
+
+from hermes_trading.candles import Candle, CandleSeries
+from hermes_trading.liquidity import DAILY_EXTREME_WEIGHT, DEFAULT_LEVEL_WEIGHT, LiquidityLevels
+
+HOUR_MS = 3_600_000
+
+
+def _candle(idx: int, open_: float, high: float, low: float, close: float) -> Candle:
+    return Candle(
+        timestamp=1_700_000_000_000 + idx * HOUR_MS,
+        datetime="",
+        open=open_,
+        high=high,
+        low=low,
+        close=close,
+    )
+
+
+def _random_candles(count: int, seed: int) -> list[Candle]:
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for idx in range(count):
+        open_ = price + rng.choice((-2, -1, 0, 1, 2))
+        close = open_ + rng.choice((-3, -1, 0, 1, 3))
+        high = max(open_, close) + rng.choice((0, 0.5, 1, 3))
+        low = min(open_, close) - rng.choice((0, 0.5, 1, 3))
+        candles.append(_candle(idx, open_, high, low, close))
+        price = close
+    return candles
+
+
+def _snapshot(levels: LiquidityLevels) -> list[tuple]:
+    return [
+        (
+            lvl.price,
+            lvl.type,
+            lvl.timestamp,
+            lvl.datetime,
+            lvl.weight,
+            lvl.confirmed_timestamp,
+            lvl.confirmed_datetime,
+            lvl.active,
+        )
+        for lvl in levels.levels
+    ]
+
+
+# 4h candles over three UTC days as (high, low), 6 per day
+_BUILD_FIXTURE = [
+    (101.0, 99.0), (102.0, 100.0), (104.2, 101.0), (103.0, 100.5), (102.5, 99.4), (103.5, 100.0),
+    (104.1, 101.5), (103.0, 100.8), (102.0, 99.6), (103.8, 100.9), (106.0, 102.0), (104.0, 101.2),
+    (103.0, 100.1), (101.5, 98.0), (102.6, 99.2), (101.8, 97.8), (103.2, 99.9), (102.2, 97.5),
+    (101.0, 98.5),
+]
+
+
+def test_build_matches_pinned_levels() -> None:
+    # expected values come from the former pandas implementation of build()
+    offsets_ms = {2: 500, 9: 250}
+    candles = [
+        Candle(
+            timestamp=1_767_225_600_000 + idx * 4 * HOUR_MS + offsets_ms.get(idx, 0),
+            datetime="",
+            open=(high + low) / 2,
+            high=high,
+            low=low,
+            close=(high + low) / 2,
+        )
+        for idx, (high, low) in enumerate(_BUILD_FIXTURE)
+    ]
+    expected = [
+        # day high, later exceeded on the next day only
+        (104.0, "high", 1.0, 1767254400500, "2026-01-01T08:00:00.500000+00:00", 1767268800000, "2026-01-01T12:00:00+00:00"),
+        (99.5, "low", 0.5, 1767283200000, "2026-01-01T16:00:00+00:00", 1767297600000, "2026-01-01T20:00:00+00:00"),
+        # the day's high is exceeded later the same day
+        (104.0, "high", 0.5, 1767312000000, "2026-01-02T00:00:00+00:00", 1767326400000, "2026-01-02T04:00:00+00:00"),
+        (99.5, "low", 1.0, 1767340800000, "2026-01-02T08:00:00+00:00", 1767355200250, "2026-01-02T12:00:00.250000+00:00"),
+        (106.0, "high", 1.0, 1767369600000, "2026-01-02T16:00:00+00:00", 1767384000000, "2026-01-02T20:00:00+00:00"),
+        # the 97.8 low at 12:00 falls within two ticks and is clustered into this one
+        (98.0, "low", 0.5, 1767412800000, "2026-01-03T04:00:00+00:00", 1767427200000, "2026-01-03T08:00:00+00:00"),
+        (103.0, "high", 1.0, 1767456000000, "2026-01-03T16:00:00+00:00", 1767470400000, "2026-01-03T20:00:00+00:00"),
+        (97.5, "low", 1.0, 1767470400000, "2026-01-03T20:00:00+00:00", 1767484800000, "2026-01-04T00:00:00+00:00"),
+    ]
+
+    for source in (candles, CandleSeries.from_candles(candles, symbol="BTC/USDT")):
+        levels = LiquidityLevels(window=2, confirm_forward=1, tick_size=0.5)
+        levels.build(source)
+        assert [
+            (
+                lvl.price,
+                lvl.type,
+                lvl.weight,
+                lvl.timestamp,
+                lvl.datetime,
+                lvl.confirmed_timestamp,
+                lvl.confirmed_datetime,
+            )
+            for lvl in levels.levels
+        ] == expected
+
+    unclustered = LiquidityLevels(window=2, confirm_forward=1)
+    unclustered.build(candles)
+    assert [(lvl.price, lvl.type) for lvl in unclustered.levels][5:7] == [(98.0, "low"), (97.8, "low")]
+
+
+def test_update_matches_build_on_every_prefix() -> None:
+    candles = _random_candles(300, seed=3)
+    for tick_size in (None, 0.5):
+        incremental = LiquidityLevels(tick_size=tick_size)
+        reference = LiquidityLevels(tick_size=tick_size)
+        for idx, candle in enumerate(candles):
+            incremental.update(candle)
+            reference.build(candles[: idx + 1])
+            assert _snapshot(incremental) == _snapshot(reference)
+        assert reference.levels
+
+
+def test_update_continues_after_build() -> None:
+    candles = _random_candles(200, seed=5)
+    incremental = LiquidityLevels(window=3, confirm_forward=1)
+    incremental.build(candles[:120])
+    added = []
+    for candle in candles[120:]:
+        added.extend(incremental.update(candle))
+
+    reference = LiquidityLevels(window=3, confirm_forward=1)
+    reference.build(candles)
+
+    assert _snapshot(incremental) == _snapshot(reference)
+    assert added == reference.levels[len(reference.levels) - len(added):]
+
+
+def test_update_downgrades_daily_extreme_when_day_high_is_exceeded() -> None:
+    prices = [100, 101, 102, 103, 104, 105, 106, 110, 105, 104, 103]
+    candles = [_candle(idx, p, p + 0.5, p - 0.5, p) for idx, p in enumerate(prices)]
+    levels = LiquidityLevels()
+    for candle in candles:
+        levels.update(candle)
+
+    (peak,) = [lvl for lvl in levels.levels if lvl.type == "high"]
+    assert peak.weight == DAILY_EXTREME_WEIGHT
+
+    levels.update(_candle(len(prices), 111, 112, 110, 111))
+
+    assert peak.weight == DEFAULT_LEVEL_WEIGHT
+
+
+def test_prune_returns_deactivated_levels() -> None:
+    prices = [100, 101, 102, 103, 104, 105, 106, 110, 105, 104, 103]
+    candles = [_candle(idx, p, p + 0.5, p - 0.5, p) for idx, p in enumerate(prices)]
+    levels = LiquidityLevels()
+    levels.build(candles)
+
+    breakout = _candle(len(prices), 109, 111, 108, 110.8)
+
+    assert levels.prune(breakout) == [levels.levels[0]]
+    assert levels.prune(breakout) == []
+
+
+def test_touched_levels_and_prune_match_full_scans() -> None:
+    candles = _random_candles(400, seed=11)
+    for tick_size in (None, 0.5):
+        levels = LiquidityLevels(tick_size=tick_size)
+        levels.build(candles)
+        for candle in candles:
+            expected_active = [
+                lvl
+                for lvl in levels.levels
+                if lvl.active and lvl.confirmed_timestamp < candle.timestamp
+            ]
+            assert levels.active_levels(candle.timestamp) == expected_active
+            assert levels.touched_levels(candle, min_weight=DAILY_EXTREME_WEIGHT) == [
+                lvl
+                for lvl in expected_active
+                if lvl.timestamp < candle.timestamp
+                and lvl.weight >= DAILY_EXTREME_WEIGHT
+                and candle.low <= lvl.price <= candle.high
+            ]
+
+            tol = 0.5 if tick_size else 0.0
+            expected_pruned = [
+                lvl
+                for lvl in expected_active
+                if candle.high >= lvl.price - tol and candle.low <= lvl.price + tol
+            ]
+            assert levels.prune(candle) == expected_pruned
+            assert not any(lvl.active for lvl in expected_pruned)
+
+
+def test_level_store_follows_reassigned_levels() -> None:
+    candles = _random_candles(60, seed=2)
+    levels = LiquidityLevels()
+    levels.build(candles)
+    assert levels.active_levels(candles[-1].timestamp)
+
+    levels.levels = []
+
+    assert levels.active_levels(candles[-1].timestamp) == []
+    assert levels.prune(candles[-1]) == []
+
+
+def test_evict_before_drops_old_levels_and_keeps_queries_consistent() -> None:
+    candles = _random_candles(600, seed=13)
+    levels = LiquidityLevels(tick_size=0.5)
+    evicted = []
+    for idx, candle in enumerate(candles):
+        levels.update(candle)
+        if idx >= 50:
+            evicted.extend(levels.evict_before(candles[idx - 50].timestamp))
+        assert all(lvl.timestamp >= candles[max(idx - 50, 0)].timestamp for lvl in levels.levels)
+
+        expected_active = [
+            lvl
+            for lvl in levels.levels
+            if lvl.active and lvl.confirmed_timestamp < candle.timestamp
+        ]
+        assert levels.active_levels(candle.timestamp) == expected_active
+        assert levels.touched_levels(candle) == [
+            lvl
+            for lvl in expected_active
+            if lvl.timestamp < candle.timestamp and candle.low <= lvl.price <= candle.high
+        ]
+        tol = 0.5
+        assert levels.prune(candle) == [
+            lvl
+            for lvl in expected_active
+            if candle.high >= lvl.price - tol and candle.low <= lvl.price + tol
+        ]
+
+    assert evicted
+    assert len(levels.levels) <= 50
+    assert levels.evict_before(candles[0].timestamp) == []
@@ -1,7 +1,14 @@
+import random
 from datetime import datetime, timezone
 
-from hermes_trading.candles import Candle
-from hermes_trading.market_context import build_signal_market_context
+from hermes_trading.candles import Candle, CandleSeries
+from hermes_trading.market_context import (
+    MarketContextIndex,
+    MarketContextTracker,
+    build_signal_market_context,
+    load_context_trackers,
+    save_context_trackers,
+)
 from hermes_trading.time_utils import MADRID_TIMEZONE, madrid_datetime_from_timestamp_ms, timeframe_to_milliseconds
 
 BASE_TIMESTAMP = int(
@@ -86,3 +93,62 @@ def test_build_signal_market_context_computes_bias_range_and_volatility() -> Non
     assert context.atr_pct == (4.5 / 122) * 100
     assert context.signal_range_to_atr_ratio == 2.0
     assert context.volatility_regime == "expanded"
+
+
+def test_market_context_index_matches_per_signal_build() -> None:
+    rng = random.Random(6)
+    price = 100.0
+    candles = []
+    for index in range(160):
+        open_ = price + rng.choice((-1.0, 0.0, 1.0))
+        close = open_ + rng.choice((-2.0, -0.5, 0.0, 0.5, 2.0))
+        high = max(open_, close) + rng.choice((0.0, 0.5, 3.0))
+        low = min(open_, close) - rng.choice((0.0, 0.5, 3.0))
+        candles.append(_candle(index, open_, high, low, close))
+        price = close
+    # a gap leaves some higher-timeframe bars incomplete
+    del candles[70:75]
+
+    for series in (candles, CandleSeries.from_candles(candles)):
+        context_index = MarketContextIndex(series, range_lookback=6, atr_period=5, bias_slow_period=8)
+        assert [context_index.context_at(index) for index in range(len(series))] == [
+            build_signal_market_context(
+                series,
+                index,
+                range_lookback=6,
+                atr_period=5,
+                bias_slow_period=8,
+            )
+            for index in range(len(series))
+        ]
+
+
+def test_market_context_tracker_matches_build_across_restarts(tmp_path) -> None:
+    rng = random.Random(9)
+    price = 100.0
+    candles = []
+    for index in range(120):
+        open_ = price + rng.choice((-1.0, 0.0, 1.0))
+        close = open_ + rng.choice((-2.0, -0.5, 0.0, 0.5, 2.0))
+        high = max(open_, close) + rng.choice((0.0, 0.5, 3.0))
+        low = min(open_, close) - rng.choice((0.0, 0.5, 3.0))
+        candles.append(_candle(index, open_, high, low, close))
+        price = close
+
+    state_path = tmp_path / "market_context.json"
+    tracker = MarketContextTracker("15m", range_lookback=6, atr_period=5, bias_slow_period=8)
+    for index, candle in enumerate(candles):
+        assert tracker.update(candle)
+        assert not tracker.update(candle)
+        assert tracker.context() == build_signal_market_context(
+            candles,
+            index,
+            range_lookback=6,
+            atr_period=5,
+            bias_slow_period=8,
+        )
+        if index % 17 == 0:
+            save_context_trackers(state_path, {"binance|BTC/USDT|15m": tracker})
+            tracker = load_context_trackers(state_path)["binance|BTC/USDT|15m"]
+
+    assert load_context_trackers(tmp_path / "missing.json") == {}
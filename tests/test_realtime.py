@@ -0,0 +1,401 @@
+import random
+import sqlite3
+
+import pytest
+
+from hermes_trading.candles import Candle, CandleBatch
+from hermes_trading.liquidity import Level, LiquidityLevels
+from hermes_trading.realtime import (
+    CandleCloseScheduler,
+    LevelWriteBuffer,
+    PriceActionSignalAdapter,
+    RealtimeBotConfig,
+    RealtimeTradingBot,
+    SQLiteStorage,
+)
+
+MINUTE_MS = 60_000
+START_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+
+
+class _FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_scheduler_batches_simultaneous_closes_and_retries_until_candle_appears() -> None:
+    clock = _FakeClock((START_MS + 4 * MINUTE_MS + 30_000) / 1000)
+    scheduler = CandleCloseScheduler(
+        settle_delay=1.0, retry_delay=0.5, max_retry_delay=2.0, clock=clock, sleep=clock.sleep
+    )
+    calls: list[tuple[str, int]] = []
+    attempts = {"late": 0}
+
+    def on_time(close_ms: int) -> bool:
+        calls.append(("on_time", close_ms))
+        return True
+
+    def late(close_ms: int) -> bool:
+        calls.append(("late", close_ms))
+        attempts["late"] += 1
+        return attempts["late"] >= 3
+
+    scheduler.add("on_time", "1m", on_time)
+    scheduler.add("late", "5m", late)
+
+    assert scheduler.next_close(START_MS + 4 * MINUTE_MS) == (START_MS + 5 * MINUTE_MS, ["on_time", "late"])
+    assert scheduler.run_next() == ["on_time", "late"]
+    assert calls == [("on_time", START_MS + 5 * MINUTE_MS)] + [("late", START_MS + 5 * MINUTE_MS)] * 3
+    assert clock.sleeps == [31.0, 0.5, 1.0]
+
+    calls.clear()
+    assert scheduler.run_next() == ["on_time"]
+    assert calls == [("on_time", START_MS + 6 * MINUTE_MS)]
+
+
+def test_scheduler_stops_retrying_at_the_next_close() -> None:
+    clock = _FakeClock(START_MS / 1000)
+    scheduler = CandleCloseScheduler(
+        settle_delay=1.0, retry_delay=10.0, max_retry_delay=40.0, clock=clock, sleep=clock.sleep
+    )
+    scheduler.add("never", "1m", lambda close_ms: False)
+
+    assert scheduler.run_next() == []
+    assert clock.now * 1000 < START_MS + 2 * MINUTE_MS
+    assert clock.sleeps == [61.0, 10.0, 20.0]
+
+    # a slow series keeps its own deadline when a faster one closes first
+    four_hours_ms = 240 * MINUTE_MS
+    clock = _FakeClock((START_MS + four_hours_ms - 30_000) / 1000)
+    scheduler = CandleCloseScheduler(
+        settle_delay=1.0, retry_delay=10.0, max_retry_delay=40.0, clock=clock, sleep=clock.sleep
+    )
+    calls: list[tuple[str, int]] = []
+
+    def fast(close_ms: int) -> bool:
+        calls.append(("fast", close_ms))
+        return True
+
+    def slow(close_ms: int) -> bool:
+        calls.append(("slow", close_ms))
+        # the 4h candle reaches the exchange 90 seconds late
+        return clock.now * 1000 >= START_MS + four_hours_ms + 90_000
+
+    scheduler.add("fast", "1m", fast)
+    scheduler.add("slow", "4h", slow)
+
+    assert scheduler.run_next() == ["fast"]
+    assert clock.now * 1000 < START_MS + four_hours_ms + MINUTE_MS
+    assert scheduler.run_next() == ["fast", "slow"]
+    assert {close_ms for name, close_ms in calls if name == "slow"} == {START_MS + four_hours_ms}
+    assert calls[-1] == ("slow", START_MS + four_hours_ms)
+    assert ("fast", START_MS + four_hours_ms + MINUTE_MS) in calls
+
+    calls.clear()
+    assert scheduler.run_next() == ["fast"]
+    assert calls == [("fast", START_MS + four_hours_ms + 2 * MINUTE_MS)]
+
+
+class _FakeConnector:
+    def __init__(self, candles: list[Candle]) -> None:
+        self.candles = candles
+
+    def get_klines(self, symbol: str, interval: str, limit: int = 10) -> CandleBatch:
+        return CandleBatch(self.candles[-limit:])
+
+
+def _candle(idx: int) -> Candle:
+    return Candle(
+        timestamp=START_MS + idx * MINUTE_MS,
+        datetime="",
+        open=100.0,
+        high=101.0,
+        low=99.0,
+        close=100.5,
+    )
+
+
+def test_process_close_waits_for_the_closing_candle(tmp_path, monkeypatch) -> None:
+    connector = _FakeConnector([_candle(idx) for idx in range(3)])
+    storage = SQLiteStorage(tmp_path / "bot.sqlite")
+    bot = RealtimeTradingBot(connector, storage, RealtimeBotConfig("BTC/USDT", "1m"))
+    monkeypatch.setattr("hermes_trading.realtime.time.time", lambda: (START_MS + 3 * MINUTE_MS + 500) / 1000)
+
+    assert bot.process_close(START_MS + 3 * MINUTE_MS)
+    assert storage.last_candle_timestamp("BTC/USDT", "1m") == START_MS + 2 * MINUTE_MS
+    assert not bot.process_close(START_MS + 4 * MINUTE_MS)
+    storage.close()
+
+
+def test_store_candles_bulk_imports_in_one_commit(tmp_path) -> None:
+    storage = SQLiteStorage(tmp_path / "bot.sqlite")
+    statements: list[str] = []
+    storage._conn.set_trace_callback(statements.append)
+
+    assert storage.store_candles("BTC/USDT", "1m", [_candle(idx) for idx in range(5)]) == 5
+    assert storage.store_candles("BTC/USDT", "1m", [_candle(idx) for idx in range(3, 7)]) == 2
+
+    assert statements.count("COMMIT") == 2
+    assert storage.last_candle_timestamp("BTC/USDT", "1m") == START_MS + 6 * MINUTE_MS
+    storage.close()
+
+
+def test_level_write_buffer_persists_latest_state_once(tmp_path) -> None:
+    storage = SQLiteStorage(tmp_path / "bot.sqlite")
+    buffer = LevelWriteBuffer()
+    kept = Level(price=101.0, type="high", timestamp=START_MS, datetime="")
+    broken = Level(price=99.0, type="low", timestamp=START_MS, datetime="")
+
+    buffer.add(kept)
+    buffer.add(broken)
+    broken.active = False
+    buffer.mark_changed(broken)
+    assert buffer.flush(storage, "BTC/USDT", "1m") == [kept, broken]
+    assert len(buffer) == 0
+
+    kept.active = False
+    buffer.mark_changed(kept)
+    statements: list[str] = []
+    storage._conn.set_trace_callback(statements.append)
+    assert buffer.flush(storage, "BTC/USDT", "1m") == []
+
+    assert not any(statement.startswith("INSERT") for statement in statements)
+    assert statements.count("COMMIT") == 1
+    rows = storage._conn.execute("SELECT type, active FROM levels ORDER BY type").fetchall()
+    assert rows == [("high", 0), ("low", 0)]
+    storage.close()
+
+
+def test_processing_a_candle_commits_once(tmp_path, monkeypatch) -> None:
+    candles = [
+        Candle(
+            timestamp=START_MS + idx * MINUTE_MS,
+            datetime="",
+            open=100.0 + price,
+            high=100.5 + price,
+            low=99.5 + price,
+            close=100.0 + price,
+        )
+        for idx, price in enumerate([0, 1, 2, 3, 4, 5, 4, 3, 2, 1, 0, 1, 2, 3, 6, 2])
+    ]
+    storage = SQLiteStorage(tmp_path / "bot.sqlite")
+    bot = RealtimeTradingBot(_FakeConnector(candles), storage, RealtimeBotConfig("BTC/USDT", "1m"))
+    statements: list[str] = []
+    storage._conn.set_trace_callback(statements.append)
+
+    for candle in candles:
+        statements.clear()
+        bot._process_candle(candle)
+        assert statements.count("COMMIT") == 1
+
+    assert storage._conn.execute("SELECT COUNT(*) FROM levels").fetchone()[0] > 0
+    storage.close()
+
+
+class _FailOnceSignal(PriceActionSignalAdapter):
+    def __init__(self, fail_at: int) -> None:
+        super().__init__()
+        self.fail_at = fail_at
+
+    def evaluate(self, candles: CandleBatch, levels: list[Level]):
+        if candles.candles[-1].timestamp == self.fail_at:
+            self.fail_at = None
+            raise RuntimeError("signal failed")
+        return super().evaluate(candles, levels)
+
+
+class _CountingLevels(LiquidityLevels):
+    def __init__(self) -> None:
+        super().__init__()
+        self.updated: list[int] = []
+
+    def update(self, candle: Candle) -> list[Level]:
+        self.updated.append(candle.timestamp)
+        return super().update(candle)
+
+
+class _RecordingNotifier:
+    def __init__(self) -> None:
+        self.sent: list[tuple] = []
+
+    def send_signal(self, match, symbol: str, interval: str) -> None:
+        self.sent.append((match.pattern, match.direction, match.candle.timestamp, match.level.price))
+
+
+def test_pattern_on_a_level_stores_and_notifies_a_signal(tmp_path) -> None:
+    # (open, high, low, close): a swing low at 103 confirmed two candles later,
+    # a rally, and a buy pin bar whose wick comes back through the level
+    rows = [
+        (110.0, 110.5, 109.0, 109.5), (109.5, 110.0, 108.0, 108.5), (108.5, 109.0, 107.0, 107.5),
+        (107.5, 108.0, 106.0, 106.5), (106.5, 107.0, 105.0, 105.5), (105.5, 106.0, 104.0, 104.5),
+        (104.5, 105.0, 103.0, 104.8), (104.8, 106.5, 104.5, 106.0), (106.0, 108.5, 105.8, 108.0),
+        (108.0, 109.5, 107.8, 109.0), (109.0, 110.5, 108.8, 110.0), (110.0, 110.2, 108.5, 109.0),
+        (109.0, 109.2, 107.5, 108.0), (108.0, 108.2, 105.8, 106.0), (105.8, 106.2, 102.8, 106.0),
+    ]
+    candles = [
+        Candle(
+            timestamp=START_MS + idx * MINUTE_MS,
+            datetime="",
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+        )
+        for idx, (open_, high, low, close) in enumerate(rows)
+    ]
+    storage = SQLiteStorage(tmp_path / "bot.sqlite")
+    bot = RealtimeTradingBot(_FakeConnector(candles), storage, RealtimeBotConfig("BTC/USDT", "1m"))
+    notifier = _RecordingNotifier()
+    bot._notifier = notifier
+
+    for candle in candles:
+        bot._process_candle(candle)
+
+    pin_bar = ("pin_bar", "long", candles[-1].timestamp, 103.0)
+    assert pin_bar in notifier.sent
+    rows = storage._conn.execute(
+        "SELECT pattern, direction, candle_timestamp FROM signals"
+    ).fetchall()
+    assert ("pin_bar", "long", candles[-1].timestamp) in rows
+    assert len(rows) == len(notifier.sent)
+    # the pin bar broke the level, so it no longer takes part in later signals
+    assert [
+        lvl.price for lvl in bot._levels.active_levels(candles[-1].timestamp + MINUTE_MS) if lvl.type == "low"
+    ] == []
+    storage.close()
+
+
+def test_retry_after_a_rolled_back_candle_processes_it_once(tmp_path) -> None:
+    candles = [
+        Candle(
+            timestamp=START_MS + idx * MINUTE_MS,
+            datetime="",
+            open=100.0 + price,
+            high=100.5 + price,
+            low=99.5 + price,
+            close=100.0 + price,
+        )
+        for idx, price in enumerate([0, 1, 2, 3, 4, 5, 4, 3, 2, 1, 0, 1, 2, 3, 6, 2])
+    ]
+    failing = candles[12]
+    levels = _CountingLevels()
+    storage = SQLiteStorage(tmp_path / "bot.sqlite")
+    bot = RealtimeTradingBot(
+        _FakeConnector(candles),
+        storage,
+        RealtimeBotConfig("BTC/USDT", "1m"),
+        levels=levels,
+        signals=[_FailOnceSignal(failing.timestamp)],
+    )
+    reference_storage = SQLiteStorage(tmp_path / "reference.sqlite")
+    reference = RealtimeTradingBot(
+        _FakeConnector(candles), reference_storage, RealtimeBotConfig("BTC/USDT", "1m")
+    )
+
+    for candle in candles:
+        reference._process_candle(candle)
+        if candle is failing:
+            with pytest.raises(RuntimeError, match="signal failed"):
+                bot._process_candle(candle)
+            assert storage.last_candle_timestamp("BTC/USDT", "1m") == candles[11].timestamp
+        bot._process_candle(candle)
+
+    assert [item.timestamp for item in bot._recent] == [candle.timestamp for candle in candles]
+    assert levels.updated == [candle.timestamp for candle in candles]
+    assert len(bot._level_writes) == 0
+    # the rolled back candle confirmed a level, so its write had to be redone
+    assert [lvl.confirmed_timestamp for lvl in levels.levels] == [failing.timestamp]
+    for table in ("candles", "levels", "signals"):
+        query = f"SELECT * FROM {table} ORDER BY 1, 2, 3, 4, 5"
+        rows = storage._conn.execute(query).fetchall()
+        assert rows == reference_storage._conn.execute(query).fetchall()
+    storage.close()
+    reference_storage.close()
+
+
+def test_long_stream_keeps_only_levels_of_the_history_window(tmp_path) -> None:
+    rng = random.Random(3)
+    candles = []
+    price = 100.0
+    for idx in range(1500):
+        open_ = price + rng.choice((-1.0, 0.0, 1.0))
+        close = open_ + rng.choice((-2.0, -0.5, 0.5, 2.0))
+        candles.append(
+            Candle(
+                timestamp=START_MS + idx * MINUTE_MS,
+                datetime="",
+                open=open_,
+                high=max(open_, close) + rng.choice((0.0, 0.5, 3.0)),
+                low=min(open_, close) - rng.choice((0.0, 0.5, 3.0)),
+                close=close,
+            )
+        )
+        price = close
+    storage = SQLiteStorage(tmp_path / "bot.sqlite")
+    levels = LiquidityLevels()
+    config = RealtimeBotConfig("BTC/USDT", "1m", history_limit=100)
+    bot = RealtimeTradingBot(_FakeConnector(candles), storage, config, levels=levels)
+
+    sizes = []
+    for candle in candles:
+        bot._process_candle(candle)
+        sizes.append(len(levels.levels))
+
+    rebuilt = LiquidityLevels()
+    rebuilt.build(candles[-100:])
+    assert max(sizes) <= 100
+    assert [(lvl.type, lvl.timestamp, lvl.price) for lvl in levels.levels] == [
+        (lvl.type, lvl.timestamp, lvl.price) for lvl in rebuilt.levels
+    ]
+    assert storage._conn.execute("SELECT COUNT(*) FROM levels").fetchone()[0] > len(levels.levels)
+    storage.close()
+
+
+def test_storage_migrates_volume_and_reads_ranges(tmp_path) -> None:
+    path = tmp_path / "bot.sqlite"
+    legacy = sqlite3.connect(path)
+    legacy.execute(
+        "CREATE TABLE candles (symbol TEXT NOT NULL, interval TEXT NOT NULL,"
+        " timestamp INTEGER NOT NULL, datetime TEXT NOT NULL, open REAL NOT NULL,"
+        " high REAL NOT NULL, low REAL NOT NULL, close REAL NOT NULL,"
+        " PRIMARY KEY (symbol, interval, timestamp))"
+    )
+    legacy.execute(
+        "INSERT INTO candles VALUES ('BTC/USDT', '1m', ?, '', 1, 2, 0.5, 1.5)", (START_MS,)
+    )
+    legacy.commit()
+    legacy.close()
+
+    storage = SQLiteStorage(path)
+    storage.store_candles(
+        "BTC/USDT",
+        "1m",
+        [
+            Candle(
+                timestamp=START_MS + idx * MINUTE_MS,
+                datetime="",
+                open=100.0,
+                high=101.0,
+                low=99.0,
+                close=100.5,
+                volume=float(idx),
+            )
+            for idx in range(1, 6)
+        ],
+    )
+
+    series = storage.fetch_series_between("BTC/USDT", "1m", START_MS, START_MS + 4 * MINUTE_MS)
+    assert series.timestamp.tolist() == [START_MS + idx * MINUTE_MS for idx in range(4)]
+    assert series.volume.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert series.close.tolist() == [1.5, 100.5, 100.5, 100.5]
+    assert storage.fetch_recent_series("BTC/USDT", "1m", 2).volume.tolist() == [4.0, 5.0]
+    assert len(storage.fetch_series_between("ETH/USDT", "1m", START_MS, START_MS + MINUTE_MS)) == 0
+    storage.close()
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from hermes_trading.scan_engine import AsyncRateBudget, ScanRequest, fetch_scan_series
+
+
+class _FakeAsyncClient:
+    rateLimit = 0
+
+    def __init__(self, delays: dict[str, float], failing: set[str] = frozenset()) -> None:
+        self.delays = delays
+        self.failing = failing
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_ohlcv(self, symbol, timeframe, since, limit, params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays[symbol])
+            if symbol in self.failing:
+                raise RuntimeError("exchange unavailable")
+            return [[since, 1.0, 2.0, 0.5, 1.5, 10.0]] * limit
+        finally:
+            self.in_flight -= 1
+
+
+async def _collect(client, requests, **kwargs):
+    return [(request.symbol, ohlcv) async for request, ohlcv in fetch_scan_series(client, requests, **kwargs)]
+
+
+def test_fetch_scan_series_yields_in_completion_order_and_skips_failures() -> None:
+    client = _FakeAsyncClient({"A": 0.1, "B": 0.02, "C": 0.02, "D": 0.0}, failing={"C"})
+    requests = [ScanRequest(symbol, "15m", since=idx, limit=2) for idx, symbol in enumerate("ABCD")]
+
+    results = asyncio.run(_collect(client, requests, concurrency=2))
+
+    assert [symbol for symbol, _ in results] == ["B", "D", "A"]
+    assert results[0][1] == [[1, 1.0, 2.0, 0.5, 1.5, 10.0]] * 2
+    assert client.max_in_flight == 2
+
+
+def test_fetch_scan_series_rejects_non_positive_concurrency() -> None:
+    with pytest.raises(ValueError, match="concurrency"):
+        asyncio.run(_collect(_FakeAsyncClient({}), [], concurrency=0))
+
+
+def test_async_rate_budget_spaces_requests(monkeypatch) -> None:
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr("hermes_trading.scan_engine.time.monotonic", lambda: 0.0)
+    monkeypatch.setattr("hermes_trading.scan_engine.asyncio.sleep", fake_sleep)
+
+    async def acquire_three() -> None:
+        budget = AsyncRateBudget(100)
+        await asyncio.gather(*(budget.acquire() for _ in range(3)))
+
+    asyncio.run(acquire_three())
+
+    assert sleeps == pytest.approx([0.1, 0.2])
@@ -1,3 +1,5 @@
+import math
+
 from hermes_trading.candles import Candle, CandleBatch
 from hermes_trading.liquidity import Level
 from hermes_trading.signal_filters import (
@@ -8,6 +10,8 @@ from hermes_trading.signal_filters import (
     metric_increase_passes,
     metric_candle,
     reference_candles,
+    series_metrics_pass,
+    series_signal_metrics,
 )
 from hermes_trading.signals import PriceActionSignal, SignalMatch
 
@@ -190,3 +194,30 @@ def test_signal_metrics_are_available_when_filter_threshold_fails() -> None:
 def test_metric_increase_threshold_must_pass_against_both_references() -> None:
     assert metric_increase_passes((10.0, 10.0))
     assert not metric_increase_passes((10.0, 9.9))
+
+
+def test_series_signal_metrics_match_per_batch_metrics() -> None:
+    candles = [
+        _cndl(0, 100, 104, 98, 101, volume=0),
+        _cndl(1, 101, 103, 99, 100, volume=80),
+        _cndl(2, 100, 106, 97, 102, volume=120),
+        _cndl(3, 102, 110, 95, 96, volume=150),
+        _cndl(4, 96, 101, 94, 99, volume=0),
+    ]
+    patterns = ["pin_bar", "railway_tracks", "inside_bar", "sell_engulfing", "unknown"]
+    indices = [3, 4, 4, 2, 4]
+
+    volatility, volume = series_signal_metrics(candles, indices, patterns)
+
+    for row, (idx, pattern) in enumerate(zip(indices, patterns)):
+        batch = CandleBatch(candles[max(0, idx - 3): idx + 1])
+        match = SignalMatch(pattern=pattern, direction="long", candle=candles[idx], level=None)
+        expected = build_signal_metrics(match, batch)
+        if expected is None:
+            assert all(value != value for value in volatility[row])
+            continue
+        assert tuple(volatility[row]) == expected.volatility_increase_pct
+        assert tuple(volume[row]) == expected.volume_increase_pct
+
+    assert tuple(volume[3]) == (math.inf, 50.0)
+    assert series_metrics_pass(volatility, volume).tolist() == [True, False, True, True, False]
@@ -1,3 +1,5 @@
+import random
+
 from hermes_trading.candles import Candle, CandleBatch
 from hermes_trading.liquidity import Level
 from hermes_trading.signals import PriceActionSignal, SignalMatch
@@ -278,3 +280,59 @@ def test_price_action_signal_ignores_level_with_same_timestamp() -> None:
     results = signal.evaluate(batch, levels)
 
     assert results == []
+
+
+def test_price_action_signal_detect_series_matches_sliding_batches() -> None:
+    rng = random.Random(1)
+    candles = []
+    price = 100.0
+    for idx in range(600):
+        open_ = price + rng.choice((-2, -1, 0, 1, 2))
+        close = open_ + rng.choice((-3, -2, -1, 0, 1, 2, 3))
+        high = max(open_, close) + rng.choice((0, 0.5, 1, 3))
+        low = min(open_, close) - rng.choice((0, 0.5, 1, 3))
+        candles.append(_cndl(idx, open_, high, low, close))
+        price = close
+
+    signal = PriceActionSignal()
+    indices, patterns, directions = signal.detect_series(candles)
+    detected = list(zip(indices.tolist(), patterns.tolist(), directions.tolist()))
+
+    expected = [
+        (idx, match.pattern, match.direction)
+        for idx in range(len(candles))
+        for match in signal.evaluate_without_levels(
+            CandleBatch(candles[max(0, idx - 3): idx + 1])
+        )
+        if match.candle.timestamp == idx
+    ]
+
+    assert detected == expected
+    assert {pattern for _, pattern, _ in detected} == {
+        "pin_bar",
+        "buy_engulfing",
+        "sell_engulfing",
+        "inside_bar",
+        "railway_tracks",
+    }
+
+
+def test_price_action_signal_detect_series_filters_patterns_and_directions() -> None:
+    candles = [
+        _cndl(0, 100, 101, 99, 100),
+        _cndl(1, 100, 101, 99, 100),
+        _cndl(2, 100, 101, 99, 100),
+        _cndl(3, 100.8, 102, 95, 101),
+    ]
+
+    indices, patterns, directions = PriceActionSignal().detect_series(
+        candles,
+        patterns=["pin_bar"],
+        directions=["short"],
+    )
+    assert indices.tolist() == []
+
+    indices, patterns, directions = PriceActionSignal().detect_series(candles, patterns=["pin_bar"])
+    assert list(zip(indices.tolist(), patterns.tolist(), directions.tolist())) == [
+        (3, "pin_bar", "long")
+    ]
@@ -4,13 +4,23 @@ from unittest.mock import Mock
 import pytest
 
 from hermes_trading.candles import Candle
+from hermes_trading.market_context import MarketContextTracker, SignalMarketContext
 from hermes_trading.signal_filters import FilteredSignal
 from hermes_trading.signals import SignalMatch
+from hermes_trading.time_utils import MADRID_TIMEZONE
 from signals_bot import (
     format_signal_message,
+    in_scan_window,
     metric_filter_enabled_from_env,
+    ScanState,
+    next_scan_close,
+    plan_scan_request,
+    plan_scan_requests,
     send_signal_notifications,
     should_send_signal,
+    state_dir_from_env,
+    symbols_from_env,
+    update_series_state,
 )
 
 
@@ -202,3 +212,142 @@ def test_send_signal_notifications_sends_one_message_per_signal() -> None:
         assert message.startswith("<b>Symbol:</b>")
         assert "Signals found" not in message
         assert call.kwargs == {"parse_mode": "HTML"}
+
+
+def test_signal_message_appends_market_context() -> None:
+    candle = Candle(
+        timestamp=0,
+        datetime="1970-01-01T01:00:00+01:00",
+        open=100,
+        high=105,
+        low=99,
+        close=104,
+        volume=100,
+        symbol="BTC/USDT",
+        timeframe="15m",
+    )
+    signal = FilteredSignal(
+        match=SignalMatch(pattern="pin_bar", direction="long", candle=candle, level=None),
+        volatility_increase_pct=(5.0, 5.0),
+        volume_increase_pct=(5.0, 5.0),
+    )
+    context = SignalMarketContext(
+        higher_timeframe="1h",
+        higher_timeframe_bias="bullish",
+        higher_timeframe_close=104.0,
+        higher_timeframe_fast_sma=102.0,
+        higher_timeframe_slow_sma=100.0,
+        range_lookback=20,
+        range_high=110.0,
+        range_low=90.0,
+        range_position_pct=70.0,
+        recent_lookback=10,
+        recent_high=108.0,
+        recent_low=95.0,
+        distance_to_recent_high_abs=4.0,
+        distance_to_recent_high_pct=4 / 104 * 100,
+        distance_to_recent_low_abs=9.0,
+        distance_to_recent_low_pct=9 / 104 * 100,
+        atr_period=14,
+        atr_abs=2.0,
+        atr_pct=2 / 104 * 100,
+        signal_range_to_atr_ratio=3.0,
+        volatility_regime="expanded",
+    )
+
+    message = format_signal_message(signal, context)
+
+    assert message.startswith(format_signal_message(signal) + "\n")
+    assert "<b>1h bias:</b> <code>Bullish</code>" in message
+    assert "<b>Range position (20 bars):</b> <code>70.0%</code>" in message
+    assert (
+        "<b>Distance to recent high / low (10 bars):</b> "
+        "<code>3.85%</code> / <code>8.65%</code>"
+    ) in message
+    assert message.endswith("<b>ATR (14):</b> <code>1.92%</code> <code>expanded</code>")
+
+
+def test_state_dir_prefers_explicit_setting_over_systemd(monkeypatch) -> None:
+    monkeypatch.delenv("SIGNAL_STATE_DIR", raising=False)
+    monkeypatch.delenv("STATE_DIRECTORY", raising=False)
+    assert state_dir_from_env() is None
+
+    monkeypatch.setenv("STATE_DIRECTORY", "/var/lib/hermes-signals-bot:/var/lib/other")
+    assert str(state_dir_from_env()) == "/var/lib/hermes-signals-bot"
+
+    monkeypatch.setenv("SIGNAL_STATE_DIR", "/tmp/hermes-state")
+    assert str(state_dir_from_env()) == "/tmp/hermes-state"
+
+
+def test_scan_plan_warms_up_only_stale_trackers(monkeypatch) -> None:
+    monkeypatch.setenv("SIGNAL_SYMBOLS", " BTC/USDT, ,ETH/USDT ")
+    assert symbols_from_env() == ["BTC/USDT", "ETH/USDT"]
+
+    now_ms = 1_767_225_600_000
+    fresh = MarketContextTracker("15m")
+    stale = MarketContextTracker("15m")
+    for tracker, offset in ((fresh, 2), (stale, 100)):
+        ts = now_ms - offset * 900_000
+        tracker.update(
+            Candle(timestamp=ts, datetime="", open=1, high=2, low=0.5, close=1.5, volume=1)
+        )
+    state = ScanState(trackers={"bingx|BTC/USDT|15m": fresh, "bingx|ETH/USDT|15m": stale})
+
+    requests = plan_scan_requests(
+        "bingx", symbols_from_env(), ["15m"], state, now_ms=now_ms
+    )
+
+    assert [(request.symbol, request.limit) for request in requests] == [
+        ("BTC/USDT", 24),
+        ("ETH/USDT", fresh.warmup_candles),
+    ]
+    assert state.trackers == {"bingx|BTC/USDT|15m": fresh}
+
+
+def test_warm_series_fetches_only_new_candles_and_refills_after_gap() -> None:
+    step = 900_000
+    now_ms = 1_767_225_600_000 + 30 * step + 60_000
+    rows = [
+        [1_767_225_600_000 + idx * step, 100.0 + idx, 101.0 + idx, 99.0 + idx, 100.5 + idx, 10.0]
+        for idx in range(33)
+    ]
+    state = ScanState()
+    key = "bingx|BTC/USDT|15m"
+
+    full = plan_scan_requests("bingx", ["BTC/USDT"], ["15m"], state, now_ms=now_ms - 2 * step)[0]
+    candles = update_series_state("bingx", full, rows[:29], state, now_ms=now_ms - 2 * step)
+    assert candles[-1].timestamp == rows[27][0]
+    assert len(state.buffers[key]) == 24
+
+    request = plan_scan_request("bingx", "BTC/USDT", "15m", state, now_ms=now_ms)
+    assert (request.since, request.limit, request.params) == (rows[28][0], 3, {})
+    candles = update_series_state("bingx", request, rows[28:31], state, now_ms=now_ms)
+    assert [candle.timestamp for candle in candles[-3:]] == [row[0] for row in rows[27:30]]
+    assert state.trackers[key].last_timestamp == rows[29][0]
+
+    # the exchange skips the candle at rows[30]
+    request = plan_scan_request("bingx", "BTC/USDT", "15m", state, now_ms=now_ms + 2 * step)
+    assert request.since == rows[30][0]
+    assert update_series_state("bingx", request, rows[31:], state, now_ms=now_ms + 2 * step) is None
+    assert key not in state.buffers
+
+
+def test_next_scan_close_batches_timeframes_closing_together() -> None:
+    # 2026-01-01 11:50 UTC: the 15m candle closes at 12:00 together with 30m, 1h and 4h
+    now_ms = int(datetime(2026, 1, 1, 11, 50, tzinfo=timezone.utc).timestamp() * 1000)
+    close_ms, due = next_scan_close(now_ms, ["15m", "30m", "1h", "4h"])
+    assert close_ms == int(datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc).timestamp() * 1000)
+    assert due == ["15m", "30m", "1h", "4h"]
+
+    close_ms, due = next_scan_close(close_ms, ["15m", "30m", "1h", "4h"])
+    assert close_ms == int(datetime(2026, 1, 1, 12, 15, tzinfo=timezone.utc).timestamp() * 1000)
+    assert due == ["15m"]
+
+
+@pytest.mark.parametrize(
+    ("hour", "minute", "expected"),
+    [(7, 45, False), (8, 0, True), (22, 45, True), (23, 0, True), (23, 15, False)],
+)
+def test_scan_window_matches_timer_hours(hour: int, minute: int, expected: bool) -> None:
+    close = datetime(2026, 1, 1, hour, minute, tzinfo=MADRID_TIMEZONE)
+    assert in_scan_window(int(close.timestamp() * 1000)) is expected
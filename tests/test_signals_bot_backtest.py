@@ -1,9 +1,14 @@
 import argparse
+import json
+import random
+from dataclasses import asdict, replace
 from datetime import datetime, timezone
 
-from hermes_trading.candles import Candle
+from hermes_trading import signals_bot_backtest
+from hermes_trading.candles import Candle, CandleSeries
 from hermes_trading.liquidity import Level, LiquidityLevels
 from hermes_trading.signal_filters import FilteredSignal
+from hermes_trading.signals_bot_backtest_analysis import analyze_backtest_result, load_analysis_input
 from hermes_trading.signals import SignalMatch
 from hermes_trading.signals_bot_backtest import (
     DetectedSignal,
@@ -21,6 +26,7 @@ from hermes_trading.signals_bot_backtest import (
     signal_available_timestamp,
     signal_passes_context_filters,
     simulate_trade,
+    simulate_trade_grid,
 )
 from hermes_trading.time_utils import MADRID_TIMEZONE, madrid_datetime_from_timestamp_ms, timeframe_to_milliseconds
 
@@ -688,6 +694,49 @@ def test_simulate_trade_skips_invalid_risk() -> None:
     assert trade is None
 
 
+def test_simulate_trade_grid_resolves_each_variant_on_its_own_exit_bar() -> None:
+    signal_candle = _candle(0, 95, 103, 90, 100)
+    candles = [
+        signal_candle,
+        _candle(1, 100, 106, 98, 105),
+        _candle(2, 105, 112, 96, 111),
+        _candle(3, 111, 131, 85, 120),
+        _candle(4, 120, 122, 118, 121),
+    ]
+    variant_keys = [(1.0, 1.0), (0.5, 1.0), (3.0, 1.0), (3.0, 0.2), (5.0, 2.0)]
+
+    trades = simulate_trade_grid(
+        _detected_signal(signal_candle, candle_index=0, direction="long"),
+        candles,
+        variant_keys=variant_keys,
+    )
+
+    assert [(trade.exit_reason, trade.bars_in_trade) for trade in trades] == [
+        ("take_profit", 2),
+        ("take_profit", 1),
+        ("stop_loss", 3),
+        ("stop_loss", 1),
+        ("end_of_data", 4),
+    ]
+    assert trades[2].intrabar_conflict is True
+    assert trades[3].intrabar_conflict is False
+    assert [(trade.max_drawdown_abs, trade.max_profit_abs) for trade in trades] == [
+        (4, 12),
+        (2, 6),
+        (15, 31),
+        (2, 6),
+        (15, 31),
+    ]
+    assert trades[4].exit_price == 121
+    for (take_multiple, stop_multiple), trade in zip(variant_keys, trades):
+        assert trade == simulate_trade(
+            _detected_signal(signal_candle, candle_index=0, direction="long"),
+            candles,
+            take_multiple=take_multiple,
+            stop_multiple=stop_multiple,
+        )
+
+
 def test_build_summary_aggregates_trade_counts() -> None:
     signal_candle = _candle(0, 95, 103, 90, 100)
     winning_trade = simulate_trade(
@@ -728,3 +777,121 @@ def test_build_summary_aggregates_trade_counts() -> None:
     assert summary.counts_by_timeframe == {"15m": 2}
     assert summary.counts_by_level_weight == {"none": 2}
     assert summary.counts_by_level_type == {"none": 2}
+
+
+def _patch_random_history(monkeypatch) -> None:
+    rng = random.Random(4)
+    loaded = {}
+    for symbol in ("BTC/USDT", "ETH/USDT"):
+        for timeframe in ("15m", "1h"):
+            price = 100.0
+            candles = []
+            for idx in range(200):
+                open_ = price + rng.choice((-1.0, 0.0, 1.0))
+                close = open_ + rng.choice((-2.0, -0.5, 0.5, 2.0))
+                high = max(open_, close) + rng.choice((0.0, 0.5, 3.0))
+                low = min(open_, close) - rng.choice((0.0, 0.5, 3.0))
+                candles.append(
+                    _candle(idx, open_, high, low, close, timeframe=timeframe, volume=rng.uniform(50, 150))
+                )
+                price = close
+            loaded[(symbol, timeframe)] = CandleSeries.from_candles(candles, symbol=symbol)
+    monkeypatch.setattr(signals_bot_backtest, "create_connector", lambda exchange: None)
+    monkeypatch.setattr(
+        signals_bot_backtest,
+        "fetch_historical_series_batch",
+        lambda *args, **kwargs: loaded,
+    )
+
+
+def _grid_config(**overrides) -> SignalBotBacktestConfig:
+    values = dict(
+        symbols=("BTC/USDT", "ETH/USDT"),
+        timeframes=("15m", "1h"),
+        patterns=tuple(signals_bot_backtest.DEFAULT_PATTERNS),
+        min_metric_increase_pct=None,
+        take_multiples=(1.0, 2.0),
+        stop_multiples=(1.0, 0.5),
+        save_all_variant_trades=True,
+    )
+    values.update(overrides)
+    return _config(**values)
+
+
+def test_run_backtest_workers_match_sequential_output(monkeypatch) -> None:
+    _patch_random_history(monkeypatch)
+    config = _grid_config()
+    sequential = signals_bot_backtest.run_backtest(config)
+    parallel = signals_bot_backtest.run_backtest(replace(config, workers=2))
+
+    assert sequential.summary.total_trades_opened > 0
+    assert signals_bot_backtest.result_to_json(parallel) == signals_bot_backtest.result_to_json(sequential)
+
+
+def test_stream_backtest_writes_ndjson_trades_and_manifest(monkeypatch, tmp_path) -> None:
+    _patch_random_history(monkeypatch)
+    config = _grid_config(workers=2)
+    in_memory = signals_bot_backtest.run_backtest(config)
+
+    streamed, path = signals_bot_backtest.stream_backtest(config, tmp_path / "result.json")
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+
+    assert manifest["trades"] == []
+    assert manifest["variant_trades"] is None
+    assert manifest["summary"] == asdict(in_memory.summary)
+    assert manifest["variant_summaries"] == [asdict(item) for item in in_memory.variant_summaries]
+    assert set(manifest["trade_files"]) == set(in_memory.variant_trades)
+    for key, trades in in_memory.variant_trades.items():
+        lines = (tmp_path / manifest["trade_files"][key]).read_text(encoding="utf-8").splitlines()
+        streamed_trades = [json.loads(line) for line in lines]
+        order = lambda item: (
+            item["entry_timestamp"],
+            item["signal_timestamp"],
+            item["symbol"],
+            item["timeframe"],
+            item["pattern"],
+        )
+        assert sorted(streamed_trades, key=order) == sorted(
+            (json.loads(json.dumps(asdict(trade))) for trade in trades),
+            key=order,
+        )
+    assert streamed.summary == in_memory.summary
+    assert "trade_files" not in json.loads(signals_bot_backtest.result_to_json(in_memory))
+
+
+def test_stream_backtest_analysis_matches_json_export(monkeypatch, tmp_path) -> None:
+    _patch_random_history(monkeypatch)
+    config = _grid_config(workers=2)
+    json_path = signals_bot_backtest.save_result(
+        signals_bot_backtest.run_backtest(config), tmp_path / "json" / "result.json"
+    )
+    _, ndjson_path = signals_bot_backtest.stream_backtest(config, tmp_path / "ndjson" / "result.json")
+
+    for take_multiple, stop_multiple in signals_bot_backtest.build_variant_keys(config):
+        analyses = []
+        for path in (json_path, ndjson_path):
+            header, trades = load_analysis_input(
+                path, take_multiple=take_multiple, stop_multiple=stop_multiple
+            )
+            analyses.append(
+                analyze_backtest_result(
+                    header,
+                    trades=trades,
+                    selected_take_multiple=take_multiple,
+                    selected_stop_multiple=stop_multiple,
+                )
+            )
+        assert analyses[0]["grouped_stats"]
+        assert analyses[1] == analyses[0]
+
+
+def test_stream_backtest_writes_only_primary_variant_by_default(monkeypatch, tmp_path) -> None:
+    _patch_random_history(monkeypatch)
+    config = _grid_config(save_all_variant_trades=False)
+
+    streamed, _ = signals_bot_backtest.stream_backtest(config, tmp_path / "result.json")
+
+    assert list(streamed.trade_files) == [format_variant_key(config.take_multiple, config.stop_multiple)]
+    assert streamed.trade_files[format_variant_key(config.take_multiple, config.stop_multiple)] == (
+        "result_trades/take_1_stop_1.ndjson"
+    )
@@ -1,7 +1,17 @@
+import json
+import random
+
+import pytest
+
+from hermes_trading import signals_bot_backtest_analysis
 from hermes_trading.signals_bot_backtest_analysis import (
+    TradeColumns,
     analyze_backtest_result,
+    extract_filter_candidates,
     extract_variant_summaries,
+    load_analysis_input,
     select_variant_trades,
+    summarize_trade_group,
 )
 
 
@@ -224,3 +234,173 @@ def test_select_variant_trades_reads_variant_trades_from_grid_export() -> None:
     )
 
     assert trades == [{"id": "variant"}]
+
+
+def _grid_payload() -> dict:
+    def trade(idx: int) -> dict:
+        return {
+            "symbol": "BTC/USDT",
+            "timeframe": "1h",
+            "pattern": ("pin_bar", "inside_bar")[idx % 2],
+            "signal_timestamp": idx * 3_600_000,
+            "entry_timestamp": (idx + 1) * 3_600_000,
+            "signal_timeframe": "1h",
+            "direction": "long",
+            "signal_hour": idx % 24,
+            "signal_range_pct": 1.0 + idx / 10,
+            "entry_price": 12345.678901 + idx,
+            "pnl_r": (1.5, -1.0, 0.0)[idx % 3],
+        }
+
+    return {
+        "config": {"take_multiple": 1.0, "stop_multiple": 1.0},
+        "summary": {"total_trades_opened": 30, "losses": 10},
+        "variant_summaries": [],
+        "trades": [trade(idx) for idx in range(30)],
+        "variant_trades": {
+            "take=1|stop=1": [trade(idx) for idx in range(30)],
+            "take=2|stop=1": [trade(idx + 1) for idx in range(20)],
+        },
+    }
+
+
+def test_load_analysis_input_projects_selected_variant_trades(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(signals_bot_backtest_analysis, "_READ_CHUNK_SIZE", 7)
+    payload = _grid_payload()
+    path = tmp_path / "result.json"
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    header, trades = load_analysis_input(path, take_multiple=2.0, stop_multiple=1.0)
+    _, primary_trades = load_analysis_input(path)
+
+    assert header["config"] == payload["config"]
+    assert "trades" not in header
+    assert trades[0] == {
+        "pattern": "inside_bar",
+        "timeframe": "1h",
+        "signal_timeframe": "1h",
+        "direction": "long",
+        "signal_hour": 1,
+        "signal_range_pct": 1.1,
+        "pnl_r": -1.0,
+    }
+    assert len(trades) == 20
+    assert len(primary_trades) == 30
+    assert analyze_backtest_result(
+        header,
+        trades=trades,
+        bucket_count=3,
+        selected_take_multiple=2.0,
+        selected_stop_multiple=1.0,
+    ) == analyze_backtest_result(
+        payload,
+        bucket_count=3,
+        selected_take_multiple=2.0,
+        selected_stop_multiple=1.0,
+    )
+    with pytest.raises(ValueError, match="take=3"):
+        load_analysis_input(path, take_multiple=3.0, stop_multiple=1.0)
+
+
+def test_load_analysis_input_reads_ndjson_trade_files(tmp_path) -> None:
+    payload = _grid_payload()
+    trades_dir = tmp_path / "result_trades"
+    trades_dir.mkdir()
+    (trades_dir / "take_2_stop_1.ndjson").write_text(
+        "".join(
+            json.dumps(trade) + "\n" for trade in reversed(payload["variant_trades"]["take=2|stop=1"])
+        ),
+        encoding="utf-8",
+    )
+    manifest = {
+        **payload,
+        "trades": [],
+        "variant_trades": None,
+        "trade_files": {"take=2|stop=1": "result_trades/take_2_stop_1.ndjson"},
+    }
+    path = tmp_path / "result.json"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    _, trades = load_analysis_input(path, take_multiple=2.0, stop_multiple=1.0)
+
+    assert [trade["pnl_r"] for trade in trades] == [
+        trade["pnl_r"] for trade in payload["variant_trades"]["take=2|stop=1"]
+    ]
+    assert "entry_price" not in trades[0]
+    assert "entry_timestamp" not in trades[0]
+    with pytest.raises(ValueError, match="trade file not found"):
+        load_analysis_input(path)
+
+
+def _random_trades(count: int) -> list[dict]:
+    rng = random.Random(7)
+    return [
+        {
+            "pattern": rng.choice(("pin_bar", "inside_bar", "engulfing")),
+            "level_weight": rng.choice((None, 1, 2, 10)),
+            "signal_hour": rng.randrange(24),
+            "signal_range_pct": rng.choice((None, 0.5, 1.0, rng.uniform(0, 5))),
+            "context_atr_pct": rng.choice((None, rng.uniform(0, 2))),
+            "pnl_r": rng.choice((1.5, -1.0, 0.0, -0.5)),
+        }
+        for _ in range(count)
+    ]
+
+
+def _assert_rows_close(actual: list[dict], expected: list[dict]) -> None:
+    assert [row["group"] for row in actual] == [row["group"] for row in expected]
+    for actual_row, expected_row in zip(actual, expected):
+        assert actual_row.keys() == expected_row.keys()
+        for key, value in expected_row.items():
+            if isinstance(value, float):
+                assert actual_row[key] == pytest.approx(value)
+            else:
+                assert actual_row[key] == value
+
+
+def test_trade_columns_match_per_group_summaries() -> None:
+    trades = _random_trades(500)
+    columns = TradeColumns(trades)
+
+    by_weight = columns.group_by_field("level_weight")
+    grouped: dict[str, list[dict]] = {}
+    for trade in trades:
+        label = "none" if trade["level_weight"] is None else str(trade["level_weight"])
+        grouped.setdefault(label, []).append(trade)
+    expected = [summarize_trade_group(label, grouped[label]) for label in ("1", "2", "10", "none")]
+    assert by_weight.labels == ("1", "2", "10", "none")
+    _assert_rows_close(by_weight.rows(), expected)
+    _assert_rows_close(
+        columns.group_by(lambda trade: trade["pattern"]).rows(),
+        columns.group_by_field("pattern").rows(),
+    )
+
+    present = sorted(
+        (trade for trade in trades if trade["signal_range_pct"] is not None),
+        key=lambda trade: trade["signal_range_pct"],
+    )
+    buckets = columns.quantile_groups("signal_range_pct", bucket_count=4)
+    assert buckets.total_trades.tolist() == [len(present) // 4 + (idx < len(present) % 4) for idx in range(4)]
+    assert buckets.labels[0] == (
+        f"q1:{present[0]['signal_range_pct']:.4f}.."
+        f"{present[int(buckets.total_trades[0]) - 1]['signal_range_pct']:.4f}"
+    )
+    _assert_rows_close(
+        buckets.rows()[:1],
+        [summarize_trade_group(buckets.labels[0], present[: int(buckets.total_trades[0])])],
+    )
+
+    by_hour = columns.group_by_field("signal_hour", label=lambda hour: str(int(hour)))
+    candidates = by_hour.filter_candidates(overall_loss_rate=30.0, min_group_trades=5, top_n=4)
+    assert len(candidates) == 4
+    _assert_rows_close(
+        candidates,
+        extract_filter_candidates(by_hour.rows(), overall_loss_rate=30.0, min_group_trades=5, top_n=4),
+    )
+
+
+def test_trade_columns_handle_no_trades() -> None:
+    columns = TradeColumns([])
+
+    assert columns.group_by_field("pattern").rows() == []
+    assert columns.quantile_groups("signal_range_pct", bucket_count=5).rows() == []
@@ -0,0 +1,152 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from hermes_trading import signals_bot_backtest
+from hermes_trading.candles import Candle, CandleSeries
+from hermes_trading.signals_bot_backtest import SignalBotBacktestConfig, run_backtest
+from hermes_trading.signals_bot_sweep import (
+    SweepFilters,
+    build_sweep_filters,
+    run_sweep,
+    sweep_result_to_json,
+)
+from hermes_trading.time_utils import MADRID_TIMEZONE, madrid_datetime_from_timestamp_ms, timeframe_to_milliseconds
+
+BASE_TIMESTAMP = int(
+    datetime(2026, 4, 10, 0, 0, tzinfo=MADRID_TIMEZONE)
+    .astimezone(timezone.utc)
+    .timestamp()
+    * 1000
+)
+
+
+def _patch_random_history(monkeypatch) -> None:
+    rng = random.Random(11)
+    loaded = {}
+    for symbol in ("BTC/USDT", "ETH/USDT"):
+        for timeframe in ("15m", "1h"):
+            price = 100.0
+            candles = []
+            for idx in range(400):
+                open_ = price + rng.choice((-1.0, 0.0, 1.0))
+                close = open_ + rng.choice((-2.0, -0.5, 0.5, 2.0))
+                high = max(open_, close) + rng.choice((0.0, 0.5, 3.0))
+                low = min(open_, close) - rng.choice((0.0, 0.5, 3.0))
+                timestamp = BASE_TIMESTAMP + idx * timeframe_to_milliseconds(timeframe)
+                candles.append(
+                    Candle(
+                        timestamp=timestamp,
+                        datetime=madrid_datetime_from_timestamp_ms(timestamp),
+                        open=open_,
+                        high=high,
+                        low=low,
+                        close=close,
+                        volume=rng.uniform(50, 150),
+                        symbol=symbol,
+                        timeframe=timeframe,
+                    )
+                )
+                price = close
+            loaded[(symbol, timeframe)] = CandleSeries.from_candles(candles, symbol=symbol)
+    monkeypatch.setattr(signals_bot_backtest, "create_connector", lambda exchange: None)
+    monkeypatch.setattr(
+        signals_bot_backtest,
+        "fetch_historical_series_batch",
+        lambda *args, **kwargs: loaded,
+    )
+
+
+def _config(**overrides: object) -> SignalBotBacktestConfig:
+    base = dict(
+        exchange="binance",
+        symbols=("BTC/USDT", "ETH/USDT"),
+        timeframes=("15m", "1h"),
+        date_from="2026-04-06",
+        date_to="2026-04-30",
+        fetch_limit=1000,
+        patterns=tuple(signals_bot_backtest.DEFAULT_PATTERNS),
+        min_metric_increase_pct=10.0,
+        use_levels=False,
+        min_level_weight=0.0,
+        exclude_hours=(),
+        allowed_higher_timeframe_biases=(),
+        allowed_volatility_regimes=(),
+        min_distance_to_recent_low_pct=None,
+        min_distance_to_recent_high_pct=None,
+        execution_timeframe=None,
+        take_multiple=1.0,
+        take_multiples=(1.0, 2.0),
+        stop_multiple=1.0,
+        stop_multiples=(1.0,),
+        save_all_variant_trades=False,
+        output_file="out.json",
+        normalized_date_from_madrid="2026-04-06T00:00:00+02:00",
+        normalized_date_to_madrid="2026-04-30T23:59:59.999999+02:00",
+        normalized_date_from_utc="2026-04-05T22:00:00+00:00",
+        normalized_date_to_utc="2026-04-30T21:59:59.999999+00:00",
+    )
+    base.update(overrides)
+    return SignalBotBacktestConfig(**base)
+
+
+def _assert_rows_match_backtests(config: SignalBotBacktestConfig, filters: list[SweepFilters]) -> list:
+    result = run_sweep(config, filters, max_cells=500)
+
+    assert len(result.rows) == len(filters) * 2
+    for row in result.rows:
+        backtest = run_backtest(row.filters.apply(config))
+        (variant,) = [
+            item
+            for item in backtest.variant_summaries
+            if (item.take_multiple, item.stop_multiple) == (row.take_multiple, row.stop_multiple)
+        ]
+        summary = variant.summary
+        assert row.total_signals == summary.total_signals
+        assert row.total_trades_opened == summary.total_trades_opened
+        assert row.skipped_invalid_risk == summary.skipped_invalid_risk
+        assert row.skipped_missing_entry_candle == summary.skipped_missing_entry_candle
+        assert (row.wins, row.losses, row.breakevens) == (summary.wins, summary.losses, summary.breakevens)
+        assert row.total_pnl_r == pytest.approx(summary.total_pnl_r)
+        assert row.max_equity_drawdown_r == pytest.approx(summary.max_equity_drawdown_r)
+        assert row.profit_factor == pytest.approx(summary.profit_factor)
+    return result.rows
+
+
+def test_sweep_rows_match_individual_backtests(monkeypatch) -> None:
+    _patch_random_history(monkeypatch)
+    config = _config()
+    filters = build_sweep_filters(
+        config,
+        min_metric_increase_pcts=(0.0, 10.0, 40.0),
+        exclude_hours=((), tuple(range(0, 12))),
+        higher_timeframe_biases=((), ("bullish", "neutral")),
+        volatility_regimes=((), ("normal",)),
+    )
+
+    assert len(filters) == 24
+    assert filters[0] == SweepFilters(0.0, 0.0, (), (), ())
+    rows = _assert_rows_match_backtests(config, filters)
+    assert len({row.total_trades_opened for row in rows}) > 5
+
+
+def test_sweep_masks_level_weights(monkeypatch) -> None:
+    _patch_random_history(monkeypatch)
+    config = _config(use_levels=True, min_metric_increase_pct=0.0)
+    filters = build_sweep_filters(config, min_level_weights=(0.0, 0.5, 1.0))
+
+    rows = _assert_rows_match_backtests(config, filters)
+    assert [row.total_signals for row in rows[::2]] == [8, 8, 0]
+
+
+def test_sweep_result_json_drops_runtime_settings(monkeypatch) -> None:
+    _patch_random_history(monkeypatch)
+    config = _config(workers=2)
+
+    result = run_sweep(config, build_sweep_filters(config))
+
+    assert len(result.rows) == 2
+    assert '"workers"' not in sweep_result_to_json(result)
+    with pytest.raises(ValueError, match="at least one"):
+        run_sweep(config, [])